@@ -1,57 +1,46 @@
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.interpolate import CubicSpline
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from programas_utiles.almacen import almacen_actualizado
+from programas_utiles.diezmado import puntos_visibles
+from programas_utiles.medidas import leer_medidas, rutas_medidas
+from programas_utiles.splines import EvaluadorTramos, extremos_spline
+from programas_utiles.superposicion import dibujar_curvas
+
 
 # Lectura de datos para el informe de Cuántica P4
 def calculo_extremos(cs):
-    inflexion = []
-    maximos = []
-    minimos = []
-    xs = cs.x  # nodos
-    coef = cs.c  # coeficientes (4, n-1): [a3, a2, a1, a0]
-    for i in range(len(xs) - 1):
-        d, c, b, a = coef[:, i]
-        extremo_pos = (
-            -((2 * c) / (3 * d)) + np.sqrt(((2 * c) / (3 * d)) ** 2 - (4 * b / (3 * d)))
-        ) / 2
-        extremo_neg = (
-            -((2 * c) / (3 * d)) - np.sqrt(((2 * c) / (3 * d)) ** 2 - (4 * b / (3 * d)))
-        ) / 2
-        signo_pos = 2 * c + 6 * d * extremo_pos
-        signo_neg = 2 * c + 6 * d * extremo_neg
-        if signo_pos == 0:
-            inflexion.append(extremo_pos)
-        elif signo_pos > 0:
-            minimos.append(extremo_pos)
-        else:
-            maximos.append(extremo_pos)
-        if signo_neg == 0:
-            inflexion.append(extremo_neg)
-        elif signo_neg > 0:
-            minimos.append(extremo_neg)
-        else:
-            maximos.append(extremo_neg)
-    print("Inflexiones:", inflexion)
-    print("Minimos:", minimos)
-    print("Maximos:", maximos)
+    # Extremos e inflexiones de todos los tramos a la vez (solo los que caen
+    # dentro de su tramo); devuelve los arrays además de imprimirlos
+    extremos = extremos_spline(cs)
+    print("Inflexiones:", extremos["inflexiones"])
+    print("Minimos:", extremos["minimos"])
+    print("Maximos:", extremos["maximos"])
+    return extremos
 
 
 def calcular_funcion_analitica(datos):
     for conjunto in datos:
-        eje_x = np.array([fila[0] for fila in conjunto])
-        eje_y = np.array([fila[1] for fila in conjunto])
+        eje_x = conjunto[:, 0]
+        eje_y = conjunto[:, 1]
 
         cs = CubicSpline(eje_x, eje_y, bc_type="natural")
-        funcion_analitica = lambda x: cs(x)
-        V0_1 = lambda nu: cs(nu)
+        # Evaluador con el índice de tramos precalculado, para evaluar muchas veces
+        V0_1 = EvaluadorTramos.desde_spline(cs)
 
         # ======================================================
         # 4. Graficar datos originales + spline suave
         # ======================================================
-        x_fino = np.linspace(eje_x.min(), eje_x.max(), 1000)
-
         plt.figure(figsize=(8, 4))
+        ax = plt.gca()
+        # Tantos puntos como se ven a lo ancho de la gráfica, no más
+        x_fino = np.linspace(eje_x.min(), eje_x.max(), puntos_visibles(ax))
         plt.plot(eje_x, eje_y, "o", label="Datos 1")
         plt.plot(x_fino, V0_1(x_fino), "-", label="Spline Datos 1")
 
@@ -72,58 +61,33 @@ def calcular_funcion_analitica(datos):
 
 
 def leer_datos(rutas_archivos):
-    # Lee los datos de multilples archivos de texto y los devuelve como una lista de listas.
-    datos = [[] for _ in range(len(rutas_archivos))]
-    valores_constantes = [[] for _ in range(len(rutas_archivos))]
-    for i, ruta_archivo in enumerate(rutas_archivos):
-        with open(ruta_archivo, "r") as archivo:
-            conta = 0
-            for linea in archivo:
-                linea = linea.strip("\n")
-
-                # Dividir la línea en valores separados por espacios y convertirlos a float
-                # Nos saltamos las 3 primeras lineas de cada archivo
-                if conta < 3:
-                    conta += 1
-                    continue
-                else:
-                    valores = [
-                        float(valor.replace(",", "."))
-                        for valor in linea.split("\t")[0:2]
-                    ]
-                    datos[i].append(valores)
-                    valores_constantes[i].append(
-                        [
-                            float(valor.replace(",", "."))
-                            for valor in linea.split("\t")[2:]
-                        ]
-                    )
-    return datos, valores_constantes
+    # Lee los archivos de medidas: para cada uno, la curva (U1, IA) y las
+    # columnas constantes (U2, U3, UH) como arrays (n, 2) y (n, 3)
+    return leer_medidas(rutas_archivos)
 
 
 def extraer_rutas(ruta_carpeta):
     """Extrae las rutas de los archivos de datos en una carpeta dada."""
-    import os
-
-    rutas_archivos = []
-    for nombre_archivo in os.listdir(ruta_carpeta):
-        if nombre_archivo.endswith(".txt"):
-            rutas_archivos.append(os.path.join(ruta_carpeta, nombre_archivo))
-    return rutas_archivos
+    # En orden alfabético, para que Datos 1, 2, ... sean siempre los mismos archivos
+    return rutas_medidas(ruta_carpeta)
 
 
-contador = 1
 ruta = "Datos/Medidas_B_5/"
-rutas_archivos = extraer_rutas(ruta)
-datos, valores_constantes = leer_datos(rutas_archivos)
+# True para guardar las curvas como imagen dentro de un PDF (archivos pequeños con muchas curvas)
+rasterizar = False
+# Si está al día el almacén de las medidas (python -m programas_utiles.almacen
+# P4/Datos) las curvas salen de ahí sin leer el texto; si no, de los .txt
+almacen = almacen_actualizado(os.path.dirname(os.path.normpath(ruta)))
+if almacen is not None:
+    datos, valores_constantes = almacen.medidas(os.path.basename(os.path.normpath(ruta)))
+else:
+    rutas_archivos = extraer_rutas(ruta)
+    datos, valores_constantes = leer_datos(rutas_archivos)
 fig = plt.figure(figsize=[18, 12])
 ax = fig.gca()
-for i in datos:
-    eje_x = [fila[0] for fila in i]
-    eje_y = [fila[1] for fila in i]
-    plt.plot(eje_x, eje_y, linewidth=2, label=f"Datos {datos.index(i) + 1}")
-
-    contador += 1
+# Todas las curvas en un solo artista (una llamada de dibujo)
+dibujar_curvas(ax, datos, etiquetas=[f"Datos {n + 1}" for n in range(len(datos))],
+               rasterizar=rasterizar, linewidth=2)
 plt.ylabel(r"$I\ nA$", fontsize=25)
 plt.xlabel(r"$V_0\ V$", fontsize=25)
 plt.legend(loc="best", fontsize=25)
@@ -1,7 +1,15 @@
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.interpolate import CubicSpline
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from programas_utiles.diezmado import puntos_visibles
+from programas_utiles.splines import EvaluadorTramos
+
 # ======================================================
 # 1. Datos (Rellena aquí con tus valores reales)
 # ======================================================
@@ -24,10 +32,13 @@ cs1 = CubicSpline(x, y1, bc_type="natural")
 cs2 = CubicSpline(x, y2, bc_type="natural")
 cs3 = CubicSpline(x, y3, bc_type="natural")
 
-# Definimos funciones "bonitas" para usarlas como V0(ν)
-V0_1 = lambda nu: cs1(nu)
-V0_2 = lambda nu: cs2(nu)
-V0_3 = lambda nu: cs3(nu)
+# Definimos funciones "bonitas" para usarlas como V0(ν); el evaluador guarda
+# el índice de tramos, así que evaluar muchas veces no repite la búsqueda
+V0_1 = EvaluadorTramos.desde_spline(cs1)
+V0_2 = EvaluadorTramos.desde_spline(cs2)
+V0_3 = EvaluadorTramos.desde_spline(cs3)
+# Las tres curvas comparten nodos: se pueden evaluar todas en una sola llamada
+V0 = EvaluadorTramos.desde_splines([cs1, cs2, cs3])
 
 # ======================================================
 # 3. Ejemplo de uso numérico
@@ -40,16 +51,18 @@ print("V0_3(62.9 Hz) =", float(V0_3(nu_test)))
 # ======================================================
 # 4. Graficar datos originales + spline suave
 # ======================================================
-x_fino = np.linspace(x.min(), x.max(), 1000)
-
 plt.figure(figsize=(8, 4))
+# Tantos puntos como se ven a lo ancho de la gráfica, no más
+x_fino = np.linspace(x.min(), x.max(), puntos_visibles(plt.gca()))
+V0_fino = V0(x_fino)   # (n, 3)
+
 plt.plot(x, y1, "o", label="Datos 1")
 plt.plot(x, y2, "o", label="Datos 2")
 plt.plot(x, y3, "o", label="Datos 3")
 
-plt.plot(x_fino, V0_1(x_fino), "-", label="Spline Datos 1")
-plt.plot(x_fino, V0_2(x_fino), "-", label="Spline Datos 2")
-plt.plot(x_fino, V0_3(x_fino), "-", label="Spline Datos 3")
+plt.plot(x_fino, V0_fino[:, 0], "-", label="Spline Datos 1")
+plt.plot(x_fino, V0_fino[:, 1], "-", label="Spline Datos 2")
+plt.plot(x_fino, V0_fino[:, 2], "-", label="Spline Datos 3")
 
 plt.xlabel("ν (Hz)")
 plt.ylabel("V0 (V)")
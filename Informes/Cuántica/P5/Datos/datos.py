@@ -1,6 +1,13 @@
+import os
+import sys
+
 import matplotlib.pyplot as plt
 from scipy.signal import find_peaks
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from programas_utiles.espectros import leer_espectros, rutas_espectros
+
 def encuentraPicos(datos):
     # ==== 1. Preparar datos ====
     x = [fila[0] for fila in datos]
@@ -29,39 +36,21 @@ def encuentraPicos(datos):
     plt.show()
 
 
-# Lectura de datos para el informe de Cuántica P4
+# Lectura de datos para el informe de Cuántica P5
 
 def leer_datos(rutas_archivos):
-    # Lee los datos de multilples archivos de texto y los devuelve como una lista de listas.
-    datos = [[] for _ in range(len(rutas_archivos))]
-    for i, ruta_archivo in enumerate(rutas_archivos):
-        with open(ruta_archivo, "r") as archivo:
-            conta = 0
-            for linea in archivo:
-                linea = linea.strip("\n")
-
-                # Dividir la línea en valores separados por espacios y convertirlos a float
-                # Nos saltamos las 21 primeras lineas de cada archivo
-                if conta < 21:
-                    conta += 1
-                    continue
-                else:
-                    valores = [float(valor) for valor in linea.split(",")]
-                    datos[i].append(valores)
-    return datos
+    # Lee los espectros (con su cabecera) y devuelve para cada uno un array (n, 2)
+    # con lambda y cuentas. La cabecera de cada archivo está en leer_espectros(...)[i].cabecera
+    return [espectro.datos.T for espectro in leer_espectros(rutas_archivos)]
 
 
 def extraer_rutas(ruta_carpeta):
     """Extrae las rutas de los archivos de datos en una carpeta dada."""
-    import os
-
-    rutas_archivos = []
-    for nombre_archivo in os.listdir(ruta_carpeta):
-        if nombre_archivo.endswith(".csv"):
-            rutas_archivos.append(os.path.join(ruta_carpeta, nombre_archivo))
-    return rutas_archivos
+    return rutas_espectros(ruta_carpeta)
 
 
+# Para ver un espectro; los picos de todas las lámparas a la vez, en una tabla:
+#   python -m programas_utiles.picos P5/Datos --salida P5/picos.csv   (desde Informes/Cuántica)
 contador = 1
 ruta = "Datos/Krypton/"
 rutas_archivos = extraer_rutas(ruta)
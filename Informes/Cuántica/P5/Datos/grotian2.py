@@ -1,7 +1,14 @@
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.patches import FancyArrowPatch
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from programas_utiles.identificacion import leer_referencias
+
 # ============================================================================
 # DATOS EXPERIMENTALES DE LONGITUDES DE ONDA (TUS VALORES)
 # ============================================================================
@@ -22,6 +29,8 @@ niveles = {
     '4s': {'E': 23.674, 'x': 6.0, 'S': 1},
     '4p': {'E': 23.742, 'x': 7.0, 'S': 1},
     '4d': {'E': 23.736, 'x': 8.0, 'S': 1},
+    '5s': {'E': 24.011, 'x': 9.0, 'S': 1},
+    '5d': {'E': 24.044, 'x': 10.0, 'S': 1},
     
     # Sistema S=3 (Triplete, multiplicidad = 3)
     '2s_t': {'E': 19.820, 'x': 1.0, 'S': 3},
@@ -32,25 +41,30 @@ niveles = {
     '4s_t': {'E': 23.597, 'x': 6.0, 'S': 3},
     '4p_t': {'E': 23.672, 'x': 7.0, 'S': 3},
     '4d_t': {'E': 23.706, 'x': 8.0, 'S': 3},
+    '5s_t': {'E': 23.973, 'x': 9.0, 'S': 3},
+    '5d_t': {'E': 24.044, 'x': 10.0, 'S': 3},
 }
 
-# Transiciones observadas (superior, inferior, lambda experimental)
-transiciones = [
-    ('3p_t', '2s_t', 388.90),   # S=3
-    ('4p', '2s', 396.90),        # S=1
-    ('4d_t', '2p_t', 403.10),    # S=3 (aprox)
-    ('4s_t', '2p_t', 411.90),    # S=3 (aprox)
-    ('4d', '2p', 439.20),        # S=1
-    ('4d_t', '2p_t', 447.20),    # S=3
-    ('4s_t', '2p_t', 471.10),    # S=3
-    ('4d', '2p', 492.40),        # S=1
-    ('3p', '2s', 501.30),        # S=1
-    ('4s', '2p', 504.80),        # S=1
-    ('3d_t', '2p_t', 587.40),    # S=3
-    ('3d', '2p', 667.50),        # S=1
-    ('3s_t', '2p_t', 706.60),    # S=3
-    ('3s', '2p', 728.00),        # S=1
-]
+# Transiciones observadas (superior, inferior, lambda experimental): cada
+# lambda se asigna a la línea más probable de la lista del helio
+# (P5/Referencias/Helio.csv, con los nombres de niveles de arriba)
+referencias = leer_referencias(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Referencias',
+                                            'Helio.csv'))
+identificadas = referencias.identificar(lambdas_observadas)
+transiciones = []
+for lam, linea, ambiguo in zip(lambdas_observadas, identificadas['linea'], identificadas['ambiguo']):
+    if linea < 0:
+        print(f"Sin identificar: {lam:.2f} nm")
+        continue
+    if ambiguo:
+        print(f"Asignación ambigua: {lam:.2f} nm -> {referencias.lambdas[linea]:.3f} nm")
+    transiciones.append((referencias.etiquetas['superior'][linea], referencias.etiquetas['inferior'][linea], lam))
+
+# Solo se pueden dibujar las transiciones entre niveles del diagrama
+dibujadas = [t for t in transiciones if t[0] in niveles and t[1] in niveles]
+for superior, inferior, lam in transiciones:
+    if (superior, inferior, lam) not in dibujadas:
+        print(f"Sin nivel en el diagrama: {lam:.2f} nm ({superior} -> {inferior})")
 
 # ============================================================================
 # CREAR DIAGRAMA DE GROTRIAN (ESTILO DE LA IMAGEN)
@@ -63,7 +77,7 @@ for ax, S_val, color, title in [(ax1, 1, 'blue', 'S = 1'),
                                   (ax2, 3, 'red', 'S = 3')]:
     
     # Título del sistema
-    ax.text(4.5, 24.2, title, fontsize=16, ha='center', 
+    ax.text(5.5, 24.2, title, fontsize=16, ha='center', 
            fontweight='bold', color=color,
            bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.3))
     
@@ -87,30 +101,29 @@ for ax, S_val, color, title in [(ax1, 1, 'blue', 'S = 1'),
             ax.text(x+0.5, E, label, fontsize=10, ha='left', va='center', fontweight='bold')
     
     # Dibujar transiciones para este sistema
-    for superior, inferior, wavelength in transiciones:
-        if superior in niveles and inferior in niveles:
-            if niveles[superior]['S'] == S_val:
-                x_sup = niveles[superior]['x']
-                x_inf = niveles[inferior]['x']
-                E_sup = niveles[superior]['E']
-                E_inf = niveles[inferior]['E']
-                
-                # Flecha de transición
-                ax.annotate('', xy=(x_inf, E_inf), xytext=(x_sup, E_sup),
-                           arrowprops=dict(arrowstyle='->', color=color, 
-                                         alpha=0.6, lw=1.5))
-                
-                # Etiqueta de longitud de onda
-                mid_x = (x_sup + x_inf) / 2
-                mid_y = (E_sup + E_inf) / 2
-                
-                ax.text(mid_x, mid_y, f'{wavelength:.1f}nm', 
-                       fontsize=7, ha='center', rotation=0,
-                       bbox=dict(boxstyle='round,pad=0.2', 
-                               facecolor='white', alpha=0.8, edgecolor='none'))
+    for superior, inferior, wavelength in dibujadas:
+        if niveles[superior]['S'] == S_val:
+            x_sup = niveles[superior]['x']
+            x_inf = niveles[inferior]['x']
+            E_sup = niveles[superior]['E']
+            E_inf = niveles[inferior]['E']
+            
+            # Flecha de transición
+            ax.annotate('', xy=(x_inf, E_inf), xytext=(x_sup, E_sup),
+                       arrowprops=dict(arrowstyle='->', color=color, 
+                                     alpha=0.6, lw=1.5))
+            
+            # Etiqueta de longitud de onda
+            mid_x = (x_sup + x_inf) / 2
+            mid_y = (E_sup + E_inf) / 2
+            
+            ax.text(mid_x, mid_y, f'{wavelength:.1f}nm', 
+                   fontsize=7, ha='center', rotation=0,
+                   bbox=dict(boxstyle='round,pad=0.2', 
+                           facecolor='white', alpha=0.8, edgecolor='none'))
     
     # Configuración de ejes
-    ax.set_xlim(0, 9)
+    ax.set_xlim(0, 11)
     ax.set_ylim(-1, 24.5)
     ax.set_xlabel('', fontsize=12)
     ax.grid(True, alpha=0.2, axis='y')
@@ -126,12 +139,12 @@ fig.suptitle('Diagrama de Grotrian - Helio (He I)\nPráctica 5: Espectrometría
 # Línea de ionización
 for ax in [ax1, ax2]:
     ax.axhline(y=24.587, color='black', linestyle='--', linewidth=1, alpha=0.5)
-    ax.text(8.5, 24.587, 'Ionización', fontsize=8, va='bottom', ha='right', style='italic')
+    ax.text(10.5, 24.587, 'Ionización', fontsize=8, va='bottom', ha='right', style='italic')
 
 plt.tight_layout(rect=[0, 0, 1, 0.96])
 plt.savefig('grotrian_helio_practica5.png', dpi=300, bbox_inches='tight')
 plt.savefig('grotrian_helio_practica5.pdf', bbox_inches='tight')
 print("\n✓ Diagrama de Grotrian guardado exitosamente")
-print(f"✓ Transiciones graficadas: {len(transiciones)}")
+print(f"✓ Transiciones graficadas: {len(dibujadas)} de {len(lambdas_observadas)} longitudes de onda")
 print(f"✓ Longitudes de onda: {lambdas_observadas}")
 plt.show()
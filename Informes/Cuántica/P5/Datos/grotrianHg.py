@@ -1,6 +1,13 @@
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from programas_utiles.identificacion import leer_referencias
+
 # ============================================================================
 # DATOS DEL MERCURIO - Práctica 5
 # ============================================================================
@@ -30,18 +37,12 @@ niveles = {
     '6s6d ³D₃': {'E': 8.856, 'x': 10.0, 'config': '6s6d'},
 }
 
-# Transiciones del visible (de la Tabla del manual)
-transiciones = [
-    ('6s6d ³D₃', '6s6p ³P₂', 365.016, 9000, 'violeta'),
-    ('6s6d ³D₂', '6s6p ³P₂', 365.484, 3000, 'violeta'),
-    ('6s6d ³D₁', '6s6p ³P₂', 366.289, 500, 'violeta'),
-    ('6s7s ³S₁', '6s6p ³P₀', 404.656, 12000, 'violeta'),
-    ('6s7s ¹S₀', '6s6p ³P₁', 407.783, 1000, 'violeta'),
-    ('6s7s ³S₁', '6s6p ³P₁', 435.834, 12000, 'azul'),
-    ('6s7s ³S₁', '6s6p ³P₂', 546.075, 6000, 'verde'),
-    ('6s6d ³D₂', '6s6p ¹P₁', 576.961, 1000, 'amarillo'),
-    ('6s6d ¹D₂', '6s6p ¹P₁', 579.067, 900, 'amarillo'),
-]
+# Transiciones del visible (de la Tabla del manual), en P5/Referencias/Mercurio.csv:
+# (superior, inferior, lambda, intensidad, color)
+referencias = leer_referencias(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Referencias',
+                                            'Mercurio.csv'))
+transiciones = list(zip(referencias.etiquetas['superior'], referencias.etiquetas['inferior'],
+                        referencias.lambdas, referencias.intensidades, referencias.etiquetas['color']))
 
 # Colores para las transiciones
 color_map = {
@@ -0,0 +1,229 @@
+# Mide cómo escala cada parte de programas_utiles con el número de puntos:
+# lectura del CSV (pandas, caché en frío y caché memory-mapped), cada opción de
+# ajuste (curve_fit, forma cerrada, ODR, CubicSpline, no lineal), los
+# estadísticos y el dibujo/guardado de la gráfica. Los datos x, y, dx, dy son
+# sintéticos, de 10² a 10⁷ filas, generados con una semilla fija.
+#
+# Para cada caso se guarda el mejor tiempo y la mediana de varias repeticiones
+# y, en una ejecución aparte con tracemalloc (que ralentiza), el pico de
+# memoria reservada. Los resultados van a un JSON con la versión de Python y
+# de las librerías; con --comparar se enfrentan a los de una ejecución anterior.
+#
+# Uso (desde Informes/Cuántica):
+#   python benchmarks/bench_escalado.py --salida bench.json
+#   python benchmarks/bench_escalado.py --tamanos 100 10000 --casos opcion2_cerrada opcion4_odr
+#   python benchmarks/bench_escalado.py --salida nuevo.json --comparar bench.json
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from programas_utiles.lectura import leer_csv, cargar_datos
+from programas_utiles.lineal import ajustar, ajuste_polinomico
+from programas_utiles.estadisticos import estadisticos
+from programas_utiles.opciones import (func_ax, func_axb, func_cuadratica, interseccion_rectas,
+                                       minimos_cuadrados_axb, minimos_cuadrados_ax, construir_spline)
+from programas_utiles.interseccion import intersecciones_lote
+from programas_utiles.no_lineal import ajuste_no_lineal
+
+TAMANOS = [10**2, 10**3, 10**4, 10**5, 10**6, 10**7]
+
+# Casos muy lentos (iterativos o que dibujan cada punto) solo hasta este
+# tamaño por defecto; se cambia con --max-lentos
+MAX_LENTOS = 10**6
+LENTOS = {'opcion1_curve_fit', 'opcion2_curve_fit', 'opcion3_curve_fit', 'opcion4_odr',
+          'opcion8_no_lineal', 'grafica'}
+
+
+def generar_datos(n, semilla):
+    """DataFrame con x creciente, y = 2.5x - 1 con ruido, y sus incertidumbres."""
+    import pandas as pd
+
+    rng = np.random.default_rng(semilla)
+    x = np.linspace(0, 10, n)
+    dx = np.full(n, 0.01)
+    dy = rng.uniform(0.5, 1.5, n)
+    y = 2.5 * x - 1 + rng.normal(0, dy)
+    return pd.DataFrame({'x': x, 'y': y, 'dx': dx, 'dy': dy})
+
+
+def _con_codo(data):
+    # Dos rectas que se cortan en x = 5, para la opción 4
+    datos = data.copy()
+    datos['y'] = np.where(data.x < 5, data.y, data.y - 4 * (data.x - 5))
+    return datos
+
+
+def _con_exponencial(data, semilla):
+    # y = 3 exp(-0.4 x) + 1 con ruido, para la opción 8
+    datos = data.copy()
+    datos['dy'] = 0.05
+    datos['y'] = 3 * np.exp(-0.4 * data.x) + 1 + np.random.default_rng(semilla).normal(0, 0.05, len(data))
+    return datos
+
+
+def _grafica(data, carpeta):
+    from programas_utiles.graficas import grafica_ajuste
+    from programas_utiles.render import guardar_figura
+    import matplotlib.pyplot as plt
+
+    # Igual que grafica_ajuste pero midiendo dibujo y guardado con guardar_figura
+    class Escritor:
+        def guardar(self, fig, nombre_graf):
+            plt.close(fig)
+            self.tiempos = guardar_figura(fig, nombre_graf)
+
+    escritor = Escritor()
+    grafica_ajuste(data, func_axb(data.x, 2.5, -1), os.path.join(carpeta, 'bench.png'), escritor=escritor)
+    return escritor.tiempos
+
+
+def casos(data, archivo, carpeta, semilla):
+    """Caso -> (etapa, función sin argumentos que lo ejecuta)."""
+    x, y, dy = data.x.to_numpy(), data.y.to_numpy(), data.dy.to_numpy()
+    codo = _con_codo(data)
+    exponencial = _con_exponencial(data, semilla)
+    cache = os.path.join(carpeta, 'cache')
+    n = len(data)
+    return {
+        'lectura_pandas': ('lectura', lambda: leer_csv(archivo)),
+        'lectura_cache_frio': ('lectura', lambda: cargar_datos(archivo, carpeta_cache=cache, max_archivos=0)),
+        'lectura_cache_caliente': ('lectura', lambda: cargar_datos(archivo, carpeta_cache=cache)),
+        'opcion1_curve_fit': ('ajuste', lambda: ajustar(func_ax, x, y, dy)),
+        'opcion1_cerrada': ('ajuste', lambda: ajuste_polinomico(x, y, dy, (1,))),
+        'opcion2_curve_fit': ('ajuste', lambda: ajustar(func_axb, x, y, dy)),
+        'opcion2_cerrada': ('ajuste', lambda: ajuste_polinomico(x, y, dy, (1, 0))),
+        'opcion3_curve_fit': ('ajuste', lambda: ajustar(func_cuadratica, x, y, dy)),
+        'opcion3_cerrada': ('ajuste', lambda: ajuste_polinomico(x, y, dy, (2, 1, 0))),
+        'opcion4_odr': ('ajuste', lambda: interseccion_rectas(codo, n // 2)),
+        'opcion4_lote': ('ajuste', lambda: intersecciones_lote(codo.x, codo.y, codo.dx, codo.dy, corte=n // 2)),
+        'opcion4_corte_automatico': ('ajuste', lambda: intersecciones_lote(codo.x, codo.y, codo.dx, codo.dy)),
+        'opcion5_cerrada': ('ajuste', lambda: minimos_cuadrados_axb(data)),
+        'opcion6_cerrada': ('ajuste', lambda: minimos_cuadrados_ax(data)),
+        'opcion7_spline': ('ajuste', lambda: construir_spline(data)),
+        'opcion8_no_lineal': ('ajuste', lambda: ajuste_no_lineal(exponencial, 'A*exp(-k*x) + c', p0=[1, 0.1, 0])),
+        'estadisticos': ('estadisticos', lambda: estadisticos(x, y)),
+        'grafica': ('grafica', lambda: _grafica(data, carpeta)),
+    }
+
+
+def medir(funcion, repeticiones):
+    """Tiempos de cada repetición y pico de memoria (bytes) de una ejecución más con tracemalloc."""
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - t0)
+    del resultado
+
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return tiempos, pico
+
+
+def entorno():
+    import pandas, scipy
+
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'pandas': pandas.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+
+def comparar(resultados, anteriores):
+    """Imprime el cociente de tiempos (mejor tiempo) con una ejecución anterior."""
+    previos = {(r['caso'], r['n']): r for r in anteriores['resultados'] if 't_min' in r}
+    print(f"\n{'caso':<26} {'N':>9} {'antes (s)':>11} {'ahora (s)':>11} {'cociente':>9} {'memoria':>9}")
+    for r in resultados:
+        previo = previos.get((r['caso'], r['n']))
+        if previo is None or 't_min' not in r:
+            continue
+        cociente = r['t_min'] / previo['t_min'] if previo['t_min'] else float('nan')
+        memoria = r['memoria_pico'] / previo['memoria_pico'] if previo['memoria_pico'] else float('nan')
+        print(f"{r['caso']:<26} {r['n']:>9} {previo['t_min']:>11.4g} {r['t_min']:>11.4g} {cociente:>8.2f}x {memoria:>8.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Escalado de lectura, ajustes, estadísticos y gráficas de programas_utiles.')
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS)
+    parser.add_argument('--casos', nargs='+', default=None, help='Casos a medir (por defecto todos)')
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--max-lentos', type=int, default=MAX_LENTOS,
+                        help=f'Tamaño máximo para los casos lentos: {", ".join(sorted(LENTOS))}')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', default='bench_escalado.json', help='Archivo JSON de resultados')
+    parser.add_argument('--comparar', default=None, help='JSON de una ejecución anterior con el que comparar')
+    args = parser.parse_args(argv)
+
+    resultados = []
+    print(f"{'caso':<26} {'N':>9} {'mínimo (s)':>11} {'mediana (s)':>12} {'memoria (MB)':>13}")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for n in args.tamanos:
+            data = generar_datos(n, args.semilla)
+            archivo = os.path.join(carpeta, f'datos_{n}.csv')
+            data.to_csv(archivo, index=False)
+            todos = casos(data, archivo, carpeta, args.semilla)
+            desconocidos = set(args.casos or []) - set(todos)
+            if desconocidos:
+                parser.error(f"casos desconocidos: {', '.join(sorted(desconocidos))} (hay {', '.join(todos)})")
+            for caso in args.casos or todos:
+                etapa, funcion = todos[caso]
+                registro = {'caso': caso, 'etapa': etapa, 'n': n}
+                if caso in LENTOS and n > args.max_lentos:
+                    registro['omitido'] = f'n > --max-lentos ({args.max_lentos})'
+                    resultados.append(registro)
+                    continue
+                try:
+                    tiempos, pico = medir(funcion, args.repeticiones)
+                except Exception as e:
+                    registro['error'] = f"{type(e).__name__}: {e}"
+                    print(f"{caso:<26} {n:>9} error: {registro['error']}")
+                    resultados.append(registro)
+                    continue
+                registro.update({
+                    't_min': min(tiempos),
+                    't_mediana': statistics.median(tiempos),
+                    'tiempos': tiempos,
+                    'memoria_pico': pico,
+                })
+                resultados.append(registro)
+                print(f"{caso:<26} {n:>9} {registro['t_min']:>11.4g} {registro['t_mediana']:>12.4g} {pico / 2**20:>13.1f}")
+            os.remove(archivo)
+
+    salida = {'entorno': entorno(), 'semilla': args.semilla, 'repeticiones': args.repeticiones,
+              'resultados': resultados}
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(salida, f, indent=1, ensure_ascii=False)
+    print(f"\nResultados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            comparar(resultados, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# Compara curve_fit con el ajuste analítico de programas_utiles.lineal para los
+# modelos de las opciones 1, 2 y 3, con datos sintéticos de 10³ a 10⁷ puntos.
+# La aceleración es la de las ecuaciones normales (el método por defecto) y la
+# última columna es la mayor diferencia con curve_fit en unidades de σ.
+#
+# Uso (desde Informes/Cuántica):
+#   python benchmarks/bench_lineal.py
+#   python benchmarks/bench_lineal.py --tamanos 1000 100000 --repeticiones 5
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.optimize import curve_fit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from programas_utiles.lineal import ajuste_polinomico
+from programas_utiles.opciones import func_ax, func_axb, func_cuadratica
+
+MODELOS = {
+    'y = ax': (func_ax, (1,), [2.5]),
+    'y = ax + b': (func_axb, (1, 0), [2.5, -1.]),
+    'y = ax² + bx + c': (func_cuadratica, (2, 1, 0), [0.3, 2.5, -1.]),
+}
+
+
+def cronometrar(funcion, repeticiones):
+    # Mejor tiempo de varias repeticiones, para quitar ruido
+    mejor = np.inf
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor, resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='curve_fit frente al ajuste analítico de las opciones 1-3.')
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[10**3, 10**4, 10**5, 10**6, 10**7])
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.semilla)
+    print(f"{'modelo':<18} {'N':>9} {'curve_fit (s)':>14} {'QR (s)':>10} {'normales (s)':>13} {'aceleración':>12} {'máx |Δp|/σ':>11}")
+    for n in args.tamanos:
+        x = rng.uniform(0, 10, n)
+        dy = rng.uniform(0.5, 1.5, n)
+        for nombre, (func, potencias, p_real) in MODELOS.items():
+            y = func(x, *p_real) + rng.normal(0, dy)
+
+            t_cf, (popt_cf, pcov_cf) = cronometrar(
+                lambda: curve_fit(func, x, y, sigma=dy, absolute_sigma=True, maxfev=10000), args.repeticiones)
+            t_qr, (popt_qr, pcov_qr) = cronometrar(
+                lambda: ajuste_polinomico(x, y, dy, potencias, 'qr'), args.repeticiones)
+            t_ne, (popt_ne, pcov_ne) = cronometrar(
+                lambda: ajuste_polinomico(x, y, dy, potencias, 'normales'), args.repeticiones)
+
+            # Diferencia entre ambos métodos en unidades de la incertidumbre del parámetro
+            diferencia = max(np.max(np.abs(popt_cf - popt) / np.sqrt(np.diag(pcov)))
+                             for popt, pcov in ((popt_qr, pcov_qr), (popt_ne, pcov_ne)))
+            print(f"{nombre:<18} {n:>9} {t_cf:>14.4f} {t_qr:>10.4f} {t_ne:>13.4f} {t_cf / t_ne:>11.1f}x {diferencia:>11.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Paquete con las opciones de ProgramasUtiles.py separadas del menú interactivo,
+# para poder ejecutarlas sin preguntas (por ejemplo en lote sobre muchos archivos).
+#
+# Importar el paquete no importa nada más: cada nombre de abajo se carga de su
+# módulo la primera vez que se usa, y los módulos solo importan scipy, pandas o
+# matplotlib dentro de las funciones que los necesitan. Así el menú arranca al
+# momento y cada opción paga solo las librerías que usa (ver importacion.py).
+
+import importlib
+
+# Nombre público -> módulo del paquete donde está
+_NOMBRES = {
+    'leer_csv': 'lectura',
+    'leer_medida': 'medidas',
+    'leer_medidas': 'medidas',
+    'AlmacenMedidas': 'almacen',
+    'leer_espectro': 'espectros',
+    'leer_espectros': 'espectros',
+    'analizar_espectros': 'picos',
+    'ajustar_perfiles': 'perfiles',
+    'IndiceLineas': 'identificacion',
+    'leer_referencias': 'identificacion',
+    'AcumuladorEspectros': 'apilado',
+    'apilar': 'apilado',
+    'analizar_todo': 'franck_hertz',
+    'cargar_datos': 'lectura',
+    'OPCIONES': 'opciones',
+    'interseccion_rectas': 'opciones',
+    'spline_cubico': 'opciones',
+    'EvaluadorTramos': 'splines',
+    'extremos_tramos': 'splines',
+    'extremos_splines': 'splines',
+    'ajustar': 'lineal',
+    'ajuste_polinomico': 'lineal',
+    'ajuste_polinomico_lote': 'lineal',
+    'minimos_cuadrados_lote': 'minimos_cuadrados',
+    'minimos_cuadrados_origen_lote': 'minimos_cuadrados',
+    'estadisticos': 'estadisticos',
+    'Momentos': 'estadisticos',
+    'detectar_corte': 'interseccion',
+    'intersecciones_lote': 'interseccion',
+    'compilar_modelo': 'no_lineal',
+    'ajuste_no_lineal': 'no_lineal',
+    'remuestrear': 'remuestreo',
+    'grafica_opcion': 'graficas',
+    'dibujar_curvas': 'superposicion',
+    'reducir': 'diezmado',
+    'EscritorGraficas': 'render',
+    'ejecutar_lote': 'lote',
+    'ejecutar_menu': 'menu',
+}
+
+__all__ = sorted(_NOMBRES)
+
+
+def __getattr__(nombre):
+    if nombre not in _NOMBRES:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(f'.{_NOMBRES[nombre]}', __name__), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_NOMBRES))
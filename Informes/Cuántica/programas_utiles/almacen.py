@@ -0,0 +1,219 @@
+# Todas las medidas de P4 en un solo archivo, para no volver a recorrer las
+# carpetas y leer el texto en cada análisis. Se genera una vez:
+#   python -m programas_utiles.almacen P4/Datos --salida P4/Datos/medidas.npz
+# y después AlmacenMedidas('P4/Datos/medidas.npz') da cualquier medida o
+# selección (por ejemplo todas las de UH = 5 V) en milisegundos. El análisis
+# de franck_hertz y P4/Calculo.py leen del almacén si está al día
+# (almacen_actualizado) y si no, de los .txt.
+#
+# El archivo es un .npz por columnas:
+#   U1, IA      todas las curvas una detrás de otra (float64)
+#   carpeta, archivo, U2, U3, UH, n_puntos, inicio
+#               índice con una fila por medida; la curva i es
+#               U1[inicio[i]:inicio[i] + n_puntos[i]]
+# U2, U3 y UH son constantes en cada medida y se guardan una vez, no por fila.
+# Si dos archivos tienen el mismo contenido (Todos repite las demás carpetas)
+# la curva se guarda una vez y las dos filas del índice apuntan a ella.
+#
+# Sin comprimir, U1 e IA se abren como memmap directamente dentro del .npz
+# (los miembros de un zip sin comprimir están tal cual en el archivo), así que
+# abrir el almacén no lee las curvas. Con --comprimir el archivo ocupa menos,
+# pero las columnas se leen enteras al abrirlo.
+
+import argparse
+import hashlib
+import os
+import zipfile
+
+import numpy as np
+
+from .medidas import leer_tabla, rutas_medidas
+
+VERSION = 1
+
+# Nombre del almacén dentro de la carpeta de datos
+NOMBRE_ALMACEN = 'medidas.npz'
+
+INDICE = ('carpeta', 'archivo', 'U2', 'U3', 'UH', 'n_puntos', 'inicio')
+
+
+def carpetas_medidas(carpeta_datos):
+    """Subcarpetas de carpeta_datos que tienen archivos .txt, en orden alfabético."""
+    return [nombre for nombre in sorted(os.listdir(carpeta_datos))
+            if os.path.isdir(os.path.join(carpeta_datos, nombre))
+            and rutas_medidas(os.path.join(carpeta_datos, nombre))]
+
+
+def huella_archivo(ruta):
+    """Hash (sha256) del contenido de un archivo: dos medidas repetidas tienen la misma huella."""
+    with open(ruta, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def ingerir(carpeta_datos, ruta_almacen, carpetas=None, comprimir=False):
+    """Lee todas las medidas de las carpetas y las guarda en ruta_almacen (.npz).
+
+    carpetas son los nombres de las subcarpetas de carpeta_datos (por defecto,
+    todas las que tienen .txt). Devuelve el número de medidas guardadas.
+    """
+    indice = {nombre: [] for nombre in INDICE}
+    U1, IA = [], []
+    vistos = {}     # Hash del contenido -> inicio de su curva
+    n_total = 0
+    for carpeta in carpetas or carpetas_medidas(carpeta_datos):
+        for ruta in rutas_medidas(os.path.join(carpeta_datos, carpeta)):
+            huella = huella_archivo(ruta)
+            tabla = leer_tabla(ruta)
+            if huella not in vistos:
+                vistos[huella] = n_total
+                U1.append(tabla[:, 0])
+                IA.append(tabla[:, 1])
+                n_total += len(tabla)
+            fila = tabla[0, 2:] if len(tabla) else np.full(3, np.nan)
+            for nombre, valor in zip(INDICE, (carpeta, os.path.basename(ruta), *fila,
+                                              len(tabla), vistos[huella])):
+                indice[nombre].append(valor)
+
+    columnas = {
+        'version': np.array(VERSION),
+        'U1': np.concatenate(U1) if U1 else np.empty(0),
+        'IA': np.concatenate(IA) if IA else np.empty(0),
+        'carpeta': np.array(indice['carpeta'], dtype=str),
+        'archivo': np.array(indice['archivo'], dtype=str),
+        'U2': np.array(indice['U2'], dtype=float),
+        'U3': np.array(indice['U3'], dtype=float),
+        'UH': np.array(indice['UH'], dtype=float),
+        'n_puntos': np.array(indice['n_puntos'], dtype=np.int64),
+        'inicio': np.array(indice['inicio'], dtype=np.int64),
+    }
+    # Temporal y renombrado, para que nadie abra un almacén a medio escribir
+    temporal = f"{ruta_almacen}.{os.getpid()}.tmp"
+    with open(temporal, 'wb') as f:
+        (np.savez_compressed if comprimir else np.savez)(f, **columnas)
+    os.replace(temporal, ruta_almacen)
+    return len(columnas['carpeta'])
+
+
+def _memmap_miembro(ruta, nombre):
+    # memmap del array nombre.npy dentro del .npz, o None si está comprimido
+    with zipfile.ZipFile(ruta) as z:
+        info = z.getinfo(f'{nombre}.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(ruta, 'rb') as f:
+        # Cabecera local del zip: 30 bytes fijos, el nombre y el campo extra
+        f.seek(info.header_offset + 26)
+        largo_nombre, largo_extra = np.frombuffer(f.read(4), dtype='<u2')
+        f.seek(info.header_offset + 30 + int(largo_nombre) + int(largo_extra))
+        if np.lib.format.read_magic(f) == (1, 0):
+            forma, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            forma, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        desplazamiento = f.tell()
+    return np.memmap(ruta, dtype=dtype, mode='r', offset=desplazamiento, shape=forma,
+                     order='F' if fortran else 'C')
+
+
+class AlmacenMedidas:
+    """Medidas de P4 guardadas con ingerir.
+
+    indice es un diccionario de arrays con una posición por medida (carpeta,
+    archivo, U2, U3, UH, n_puntos, inicio); U1 e IA son las columnas con
+    todas las curvas seguidas.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with np.load(ruta) as npz:
+            if int(npz['version']) != VERSION:
+                raise ValueError(f"{ruta} es de otra versión del almacén; hay que volver a generarlo")
+            self.indice = {nombre: npz[nombre] for nombre in INDICE}
+            memmaps = {nombre: _memmap_miembro(ruta, nombre) for nombre in ('U1', 'IA')}
+            self.U1 = memmaps['U1'] if memmaps['U1'] is not None else npz['U1']
+            self.IA = memmaps['IA'] if memmaps['IA'] is not None else npz['IA']
+
+    def __len__(self):
+        return len(self.indice['archivo'])
+
+    def buscar(self, carpeta=None, archivo=None, U2=None, U3=None, UH=None, atol=1e-9):
+        """Posiciones de las medidas que cumplen todas las condiciones dadas."""
+        seleccion = np.ones(len(self), dtype=bool)
+        for nombre, valor in (('carpeta', carpeta), ('archivo', archivo)):
+            if valor is not None:
+                seleccion &= self.indice[nombre] == valor
+        for nombre, valor in (('U2', U2), ('U3', U3), ('UH', UH)):
+            if valor is not None:
+                seleccion &= np.isclose(self.indice[nombre], valor, rtol=0, atol=atol)
+        return np.flatnonzero(seleccion)
+
+    def curva(self, i):
+        """U1 e IA de la medida i (vistas del memmap, sin copiar)."""
+        inicio = self.indice['inicio'][i]
+        fin = inicio + self.indice['n_puntos'][i]
+        return self.U1[inicio:fin], self.IA[inicio:fin]
+
+    def curvas(self, posiciones):
+        """Lista de curvas (n, 2) con U1 e IA de las medidas dadas."""
+        return [np.column_stack(self.curva(i)) for i in posiciones]
+
+    def medidas(self, carpeta):
+        """Como medidas.leer_medidas de los archivos de una carpeta, en orden alfabético.
+
+        Devuelve la lista de curvas (n, 2) y la de columnas constantes (n, 3)
+        con U2, U3 y UH en cada fila.
+        """
+        posiciones = self.buscar(carpeta=carpeta)
+        posiciones = posiciones[np.argsort(self.indice['archivo'][posiciones], kind='stable')]
+        curvas = self.curvas(posiciones)
+        constantes = [np.broadcast_to([self.indice[nombre][i] for nombre in ('U2', 'U3', 'UH')], (len(curva), 3))
+                      for i, curva in zip(posiciones, curvas)]
+        return curvas, constantes
+
+    def medida(self, carpeta, archivo):
+        """U1 e IA de la medida carpeta/archivo."""
+        posiciones = self.buscar(carpeta=carpeta, archivo=archivo)
+        if len(posiciones) == 0:
+            raise KeyError(f"No está la medida {carpeta}/{archivo}")
+        return self.curva(posiciones[0])
+
+
+def almacen_actualizado(carpeta_datos, ruta_almacen=None):
+    """AlmacenMedidas de carpeta_datos si existe y está al día, o None.
+
+    Por defecto el almacén es NOMBRE_ALMACEN dentro de carpeta_datos. Está al
+    día si tiene las mismas medidas (carpeta y archivo) que las subcarpetas
+    y es más reciente que todas ellas; si no, hay que leer los .txt.
+    """
+    ruta_almacen = ruta_almacen or os.path.join(carpeta_datos, NOMBRE_ALMACEN)
+    if not os.path.exists(ruta_almacen):
+        return None
+    rutas = [ruta for carpeta in carpetas_medidas(carpeta_datos)
+             for ruta in rutas_medidas(os.path.join(carpeta_datos, carpeta))]
+    if rutas and max(os.path.getmtime(ruta) for ruta in rutas) > os.path.getmtime(ruta_almacen):
+        return None
+    try:
+        almacen = AlmacenMedidas(ruta_almacen)
+    except ValueError:
+        # De otra versión
+        return None
+    guardadas = set(zip(almacen.indice['carpeta'].tolist(), almacen.indice['archivo'].tolist()))
+    actuales = {(os.path.basename(os.path.dirname(ruta)), os.path.basename(ruta)) for ruta in rutas}
+    return almacen if guardadas == actuales else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Guarda todas las medidas de P4 en un solo archivo por columnas.')
+    parser.add_argument('carpeta_datos', help='Carpeta con las subcarpetas de medidas (P4/Datos)')
+    parser.add_argument('--salida', default=None, help='Archivo .npz (por defecto, medidas.npz en carpeta_datos)')
+    parser.add_argument('--carpetas', nargs='*', default=None, help='Subcarpetas que se guardan (por defecto, todas)')
+    parser.add_argument('--comprimir', action='store_true',
+                        help='Comprime el archivo; ocupa menos pero las curvas ya no se abren como memmap')
+    args = parser.parse_args(argv)
+
+    salida = args.salida or os.path.join(args.carpeta_datos, NOMBRE_ALMACEN)
+    n = ingerir(args.carpeta_datos, salida, args.carpetas, args.comprimir)
+    print(f"{n} medidas guardadas en {salida} ({os.path.getsize(salida) / 2**20:.1f} MiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+# Suma (apilado) de todas las adquisiciones de una lámpara en un solo
+# espectro: cada archivo se interpola a una rejilla común de longitudes de
+# onda y se acumula, y de la pila salen la media, la mediana y la desviación
+# típica en cada punto de la rejilla. Los picos se buscan una sola vez, sobre
+# la media, que tiene menos ruido que cada adquisición por separado; el umbral
+# de ruido de cada pico es el de la media en su longitud de onda, que depende
+# de cuántas adquisiciones la cubren.
+#
+# Uso (desde Informes/Cuántica):
+#   python -m programas_utiles.apilado P5/Datos --salida P5/apilados --picos P5/picos_apilados.csv
+#
+# Escala de cada adquisición: las de una misma lámpara no son comparables tal
+# cual (unas están normalizadas a máximo 1, otras en cuentas con distinto
+# tiempo de exposición, ganancia y fondo, y cubren rangos distintos), así que
+# por defecto a cada una se le resta su mediana (el fondo) y se divide por su
+# ruido (ruido_espectro, sacado de la dispersión entre puntos vecinos). Las
+# dos cosas salen de cada archivo solo, sin necesitar un rango común a todos,
+# y el apilado queda en unidades de ruido de una adquisición; todas pesan lo
+# mismo, porque ya tienen el mismo ruido. Con --sin-normalizar se acumula v/t
+# con peso t (ExposureTime de la cabecera; sin él, t = 1), como si todas
+# tuvieran la misma ganancia, y el resultado se da en la exposición media.
+#
+# AcumuladorEspectros guarda solo unos pocos arrays del tamaño de la rejilla
+# (suma de pesos, media y suma de cuadrados, actualizadas con el algoritmo
+# ponderado de West), así que se pueden sumar tantos archivos como se quiera
+# leyendo uno cada vez (apilar recorre la lista de rutas dos veces: una para
+# la rejilla y otra para acumular). La mediana es la excepción: necesita todas las
+# adquisiciones a la vez y solo se calcula si se pide con --mediana.
+
+import argparse
+import csv
+import os
+
+import numpy as np
+
+from .espectros import carpetas_lamparas, leer_espectro, rutas_espectros
+
+COLUMNAS_APILADO = ('lambda_nm', 'media', 'mediana', 'desviacion', 'error_media', 'n')
+# Prominencia mínima de un pico en el apilado, en unidades del ruido de la media
+SIGMAS_RUIDO = 5
+# Criterios relativos al máximo del apilado, más bajos que los de un espectro
+# suelto (picos.py): de los picos pequeños ya se encarga SIGMAS_RUIDO
+PROMINENCIA_REL = 0.01
+ALTURA_REL = 0.
+
+
+def _extremos(espectros):
+    # Primera y última longitud de onda y paso mediano de cada espectro
+    inicios, fines, pasos = [], [], []
+    for espectro in espectros:
+        longitud = espectro.longitud if hasattr(espectro, 'longitud') else np.asarray(espectro[0])
+        inicios.append(longitud[0])
+        fines.append(longitud[-1])
+        if len(longitud) > 1:
+            pasos.append(np.median(np.diff(longitud)))
+    return inicios, fines, pasos
+
+
+def _rejilla(inicio, fin, paso):
+    return inicio + paso * np.arange(int(np.floor((fin - inicio) / paso + 1e-9)) + 1)
+
+
+def ruido_espectro(valor):
+    """Desviación típica del ruido de un espectro, estimada de las diferencias entre puntos vecinos.
+
+    Se usa la desviación absoluta mediana, así que los picos (pocos puntos
+    con diferencias grandes) no cuentan.
+    """
+    diferencias = np.diff(np.asarray(valor, dtype=float))
+    if len(diferencias) == 0:
+        return np.nan
+    return 1.4826 * np.median(np.abs(diferencias - np.median(diferencias))) / np.sqrt(2)
+
+
+def rejilla_comun(espectros, paso=None):
+    """Rejilla que cubre todos los espectros (iterable de Espectro o de pares (longitud, valor)).
+
+    El paso por defecto es la mediana de los pasos de los espectros. De cada
+    espectro solo se guardan sus extremos y su paso, así que espectros puede
+    ser un generador que los lea de uno en uno.
+    """
+    inicios, fines, pasos = _extremos(espectros)
+    return _rejilla(min(inicios), max(fines), np.median(pasos) if paso is None else paso)
+
+
+class AcumuladorEspectros:
+    """Media y desviación típica ponderadas, punto a punto, de espectros sobre una rejilla.
+
+    Cada espectro se interpola a la rejilla con anadir(); fuera de su rango
+    de longitudes de onda no cuenta. Solo guarda arrays del tamaño de la rejilla.
+    Si se acumulan espectros normalizados (anadir con escala) el resultado
+    queda en esa escala; si no, en la exposición media.
+    """
+
+    def __init__(self, rejilla):
+        self.rejilla = np.asarray(rejilla, dtype=float)
+        self.peso = np.zeros(len(self.rejilla))        # Σw
+        self.peso2 = np.zeros(len(self.rejilla))       # Σw² (para el número efectivo)
+        self.media = np.zeros(len(self.rejilla))
+        self.m2 = np.zeros(len(self.rejilla))          # Σw (x - media)²
+        self.ruido2 = np.zeros(len(self.rejilla))      # Σw² σ² (ruido de cada espectro)
+        self.n = np.zeros(len(self.rejilla), dtype=np.int64)
+        self.n_espectros = 0
+        self.suma_exposicion = 0.
+        self.normalizado = False
+
+    def remuestrear(self, longitud, valor):
+        """Valor interpolado en la rejilla (NaN fuera del rango de longitud)."""
+        return np.interp(self.rejilla, longitud, valor, left=np.nan, right=np.nan)
+
+    def anadir(self, longitud, valor, exposicion=None, escala=None, ruido=None):
+        """Acumula un espectro con peso exposicion (1 si no se da).
+
+        Se acumula valor/escala si se da escala (espectro normalizado), y si
+        no valor/exposicion. No se deben mezclar espectros con y sin escala.
+        ruido es la desviación típica del ruido de valor (NaN si no se da).
+        """
+        t = exposicion or 1.
+        if escala is not None:
+            self.normalizado = True
+        x = self.remuestrear(np.asarray(longitud, dtype=float), np.asarray(valor, dtype=float)) / (escala or t)
+        dentro = np.isfinite(x)
+        w = np.where(dentro, t, 0.)
+        x = np.where(dentro, x, 0.)
+        # Actualización ponderada de West: los puntos fuera del espectro tienen w = 0
+        peso = self.peso + w
+        delta = x - self.media
+        self.media += np.divide(w, peso, out=np.zeros_like(w), where=peso > 0) * delta
+        self.m2 += w * delta * (x - self.media)
+        self.peso = peso
+        self.peso2 += w**2
+        self.ruido2 += w**2 * (np.nan if ruido is None else ruido / (escala or t))**2
+        self.n += dentro
+        self.n_espectros += 1
+        self.suma_exposicion += t
+
+    def anadir_espectro(self, espectro, por_exposicion=True, escala=None):
+        """anadir de un Espectro, con su ExposureTime como peso si por_exposicion."""
+        self.anadir(espectro.longitud, espectro.valor,
+                    espectro.cabecera.tiempo_exposicion if por_exposicion else None, escala)
+
+    def exposicion_media(self):
+        return self.suma_exposicion / self.n_espectros if self.n_espectros else 1.
+
+    def resultado(self):
+        """Diccionario de arrays: lambda, media, desviacion, error_media, ruido y n, y n_espectros.
+
+        media y desviacion están en la escala de los espectros normalizados o,
+        si no se normalizaron, en su exposición media; error_media es
+        desviacion/√n_efectivo y ruido el ruido de la media propagado del de
+        cada espectro, √(Σw²σ²)/Σw. Donde no hay ningún espectro valen NaN.
+        """
+        escala = 1. if self.normalizado else self.exposicion_media()
+        hay = self.peso > 0
+        media = np.where(hay, self.media * escala, np.nan)
+        varianza = np.divide(self.m2, self.peso, out=np.full(len(self.peso), np.nan), where=hay)
+        desviacion = np.sqrt(np.maximum(varianza, 0)) * escala
+        # Número efectivo de adquisiciones (Σw)²/Σw²; con una sola no hay dispersión
+        n_efectivo = np.divide(self.peso**2, self.peso2, out=np.zeros(len(self.peso)), where=hay)
+        error = np.divide(desviacion, np.sqrt(n_efectivo), out=np.full(len(self.peso), np.nan),
+                          where=n_efectivo > 1)
+        return {'lambda': self.rejilla, 'media': media, 'desviacion': np.where(self.n > 1, desviacion, np.nan),
+                'error_media': error, 'ruido': np.sqrt(np.divide(self.ruido2, self.peso**2, out=np.full(
+                    len(self.peso), np.nan), where=hay)) * escala,
+                'n': self.n, 'n_espectros': self.n_espectros}
+
+
+def apilar(rutas, rejilla=None, paso=None, por_exposicion=True, normalizar=True, mediana=False):
+    """Apila los espectros de rutas y devuelve el resultado de AcumuladorEspectros.
+
+    Sin rejilla, se hace una primera pasada por los archivos para calcular
+    rejilla_comun; después se leen de uno en uno. Con normalizar, a cada
+    espectro se le resta su mediana y se divide por su ruido (ruido_espectro),
+    y todos pesan lo mismo; ValueError si alguno no tiene ruido medible. Sin
+    normalizar, por_exposicion decide si pesan su tiempo de exposición. Con
+    mediana=True se añade también 'mediana', que necesita tener todas las
+    adquisiciones remuestreadas a la vez.
+    """
+    # Se recorren dos veces: un generador se quedaría vacío en la segunda
+    rutas = list(rutas)
+    if rejilla is None:
+        rejilla = rejilla_comun((leer_espectro(ruta) for ruta in rutas), paso)
+    acumulador = AcumuladorEspectros(rejilla)
+    pila = []
+    for ruta in rutas:
+        espectro = leer_espectro(ruta)
+        valor, escala, t = espectro.valor, None, None
+        ruido = ruido_espectro(valor)
+        if normalizar:
+            if not ruido > 0:
+                raise ValueError(f"{ruta}: no se puede medir el ruido del espectro para normalizarlo")
+            valor, escala = valor - np.median(valor), ruido
+        elif por_exposicion:
+            t = espectro.cabecera.tiempo_exposicion
+        acumulador.anadir(espectro.longitud, valor, t, escala, ruido)
+        if mediana:
+            pila.append(acumulador.remuestrear(espectro.longitud, valor) / (escala or t or 1.))
+    resultado = acumulador.resultado()
+    if mediana:
+        valores = np.array(pila)
+        resultado['mediana'] = np.full(len(rejilla), np.nan)
+        hay = np.isfinite(valores).any(axis=0)
+        resultado['mediana'][hay] = np.nanmedian(valores[:, hay], axis=0) * (
+            1. if normalizar else acumulador.exposicion_media())
+    return resultado
+
+
+def picos_apilado(resultado, sigmas_ruido=SIGMAS_RUIDO, **criterios):
+    """picos_espectro sobre la media apilada, en toda la rejilla.
+
+    Además de los criterios relativos al máximo, un pico tiene que sobresalir
+    sigmas_ruido veces el ruido de la media en su longitud de onda ('ruido',
+    o error_media si no se conoce el de los espectros), que es menor donde se
+    solapan más adquisiciones; así se pueden bajar los umbrales relativos sin
+    que salgan picos del ruido.
+    """
+    from .picos import picos_espectro
+
+    hay = np.isfinite(resultado['media'])
+    if not hay.any():
+        vacio = np.empty(0)
+        return {'indice': np.empty(0, dtype=np.intp), 'lambda': vacio, 'altura': vacio,
+                'prominencia': vacio, 'anchura': vacio}
+    longitud, media = resultado['lambda'][hay], resultado['media'][hay]
+    picos = picos_espectro(longitud, media, **criterios)
+    ruido = resultado.get('ruido', resultado['error_media'])[hay]
+    ruido = np.where(np.isfinite(ruido), ruido, resultado['error_media'][hay])
+    if sigmas_ruido:
+        local = ruido[picos['indice']]
+        # Sin ninguna estimación del ruido en ese punto el pico no se descarta
+        significativo = ~(picos['prominencia'] < sigmas_ruido * local)
+        picos = {clave: valores[significativo] for clave, valores in picos.items()}
+    return picos
+
+
+def escribir_apilado(resultado, salida):
+    """Guarda el apilado como .csv con las columnas de COLUMNAS_APILADO."""
+    columnas = [resultado['lambda'], resultado['media'], resultado.get('mediana', np.full(len(resultado['lambda']), np.nan)),
+                resultado['desviacion'], resultado['error_media'], resultado['n']]
+    with open(salida, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(COLUMNAS_APILADO)
+        escritor.writerows(zip(*(c.tolist() for c in columnas)))
+
+
+def main(argv=None):
+    from .picos import DISTANCIA, escribir_tabla
+
+    parser = argparse.ArgumentParser(description='Apila todas las adquisiciones de cada lámpara de P5 en un espectro.')
+    parser.add_argument('carpeta_datos', help='Carpeta con una subcarpeta de espectros por elemento (P5/Datos)')
+    parser.add_argument('--carpetas', nargs='*', default=None, help='Subcarpetas que se apilan (por defecto, todas)')
+    parser.add_argument('--salida', default='apilados', help='Carpeta donde guardar <Elemento>_apilado.csv')
+    parser.add_argument('--paso', type=float, default=None,
+                        help='Paso de la rejilla (nm); por defecto la mediana de los pasos de los espectros')
+    parser.add_argument('--sin-exposicion', dest='por_exposicion', action='store_false',
+                        help='Con --sin-normalizar, no pesar las adquisiciones por su tiempo de exposición')
+    parser.add_argument('--sin-normalizar', dest='normalizar', action='store_false',
+                        help='No normalizar cada adquisición con su fondo y su ruido')
+    parser.add_argument('--mediana', action='store_true',
+                        help='Calcular también la mediana (guarda todas las adquisiciones en memoria)')
+    parser.add_argument('--picos', default=None, help='Tabla de picos de los apilados (.csv o .parquet)')
+    parser.add_argument('--prominencia-rel', type=float, default=PROMINENCIA_REL,
+                        help='Prominencia mínima relativa al máximo del apilado')
+    parser.add_argument('--altura-rel', type=float, default=ALTURA_REL, help='Altura mínima relativa al máximo del apilado')
+    parser.add_argument('--distancia', type=int, default=DISTANCIA, help='Separación mínima entre picos (puntos)')
+    parser.add_argument('--sigmas-ruido', type=float, default=SIGMAS_RUIDO,
+                        help='Prominencia mínima en unidades del ruido de la media (0: no se usa)')
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.salida, exist_ok=True)
+    carpetas = args.carpetas or carpetas_lamparas(args.carpeta_datos)
+    filas = []
+    errores = 0
+    for carpeta in carpetas:
+        rutas = rutas_espectros(os.path.join(args.carpeta_datos, carpeta))
+        if not rutas:
+            continue
+        try:
+            resultado = apilar(rutas, paso=args.paso, por_exposicion=args.por_exposicion,
+                               normalizar=args.normalizar, mediana=args.mediana)
+        except ValueError as e:
+            # Una lámpara que no se puede apilar no debe parar las demás
+            print(f"{carpeta}: no se apila: {e}")
+            errores += 1
+            continue
+        salida = os.path.join(args.salida, f'{carpeta}_apilado.csv')
+        escribir_apilado(resultado, salida)
+        picos = picos_apilado(resultado, args.sigmas_ruido, prominencia_rel=args.prominencia_rel,
+                              altura_rel=args.altura_rel, distancia=args.distancia)
+        print(f"{carpeta}: {len(rutas)} adquisiciones, {len(resultado['lambda'])} puntos, "
+              f"{len(picos['lambda'])} picos -> {salida}")
+        filas += [{'elemento': carpeta, 'archivo': os.path.basename(salida), 'pico': k + 1,
+                   'lambda_nm': picos['lambda'][k], 'altura': picos['altura'][k],
+                   'prominencia': picos['prominencia'][k], 'anchura_nm': picos['anchura'][k]}
+                  for k in range(len(picos['lambda']))]
+    if args.picos:
+        escribir_tabla(filas, args.picos)
+        print(f"{len(filas)} picos en {args.picos}")
+    return 0 if not errores else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+# Reducción de curvas y espectros a los puntos que se llegan a ver antes de
+# dibujarlos. Una gráfica de 1000 píxeles de ancho no muestra más de unos
+# pocos puntos por columna de píxeles; dibujar 10⁶ puntos solo hace más lento
+# el dibujo y más grande el PDF.
+#
+# Dos métodos:
+#   - minmax: se parte el eje x en tantos intervalos como píxeles y en cada
+#     uno se quedan el primer y el último punto, el mínimo y el máximo. Todos
+#     los extremos locales que se verían siguen ahí (los picos no se pierden).
+#   - lttb (Largest-Triangle-Three-Buckets): n puntos en total, en cada
+#     intervalo el que forma el triángulo más grande con el elegido en el
+#     intervalo anterior y la media del siguiente. Da curvas más suaves con
+#     menos puntos, pero no garantiza conservar todos los extremos.
+#
+# Los datos tienen que estar ordenados en x (curvas I-V, espectros).
+# Es solo para curvas densas dibujadas como línea (superposición de muchas
+# curvas, funciones evaluadas): los puntos medidos que se dibujan con
+# marcadores se dibujan todos, o desaparecerían medidas de la gráfica.
+
+import numpy as np
+
+# Puntos por píxel de ancho para lttb y para muestrear splines; minmax usa un
+# intervalo por píxel y deja hasta 4 puntos en cada uno
+PUNTOS_POR_PIXEL = 2
+
+
+def pixeles_ancho(ax):
+    """Ancho en píxeles de los ejes (con el dpi de su figura)."""
+    return max(1, int(round(ax.get_window_extent().width)))
+
+
+def puntos_visibles(ax, por_pixel=PUNTOS_POR_PIXEL):
+    """Número de puntos que vale la pena dibujar a lo ancho de los ejes."""
+    return por_pixel * pixeles_ancho(ax)
+
+
+def indices_minmax(x, y, n_intervalos):
+    """Índices (ordenados) del primero, último, mínimo y máximo de cada intervalo de x."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) <= 4 * n_intervalos:
+        return np.arange(len(x))
+    # Como x está ordenado, cada intervalo es un trozo seguido del array
+    bordes = np.linspace(x[0], x[-1], n_intervalos + 1)[1:-1]
+    inicios = np.unique(np.concatenate([[0], np.searchsorted(x, bordes)]))
+    inicios = inicios[inicios < len(x)]
+    fines = np.append(inicios[1:], len(x)) - 1
+    grupo = np.repeat(np.arange(len(inicios)), np.diff(np.append(inicios, len(x))))
+
+    elegidos = [inicios, fines]
+    for reduccion in (np.minimum, np.maximum):
+        extremo = reduccion.reduceat(y, inicios)
+        # Primera posición de cada intervalo donde se alcanza su mínimo (máximo)
+        posiciones = np.flatnonzero(y == extremo[grupo])
+        _, primera = np.unique(grupo[posiciones], return_index=True)
+        elegidos.append(posiciones[primera])
+    return np.unique(np.concatenate(elegidos))
+
+
+def indices_lttb(x, y, n_puntos):
+    """Índices de los n_puntos elegidos con Largest-Triangle-Three-Buckets."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_puntos >= n or n_puntos < 3:
+        return np.arange(n)
+    # Primer y último punto fijos; el resto en n_puntos - 2 intervalos
+    bordes = np.linspace(1, n - 1, n_puntos - 1).astype(np.intp)
+    # Media de cada intervalo (la del "siguiente" del último es el último punto)
+    suma_x = np.add.reduceat(x[:-1], bordes[:-1])
+    suma_y = np.add.reduceat(y[:-1], bordes[:-1])
+    tamanos = np.diff(bordes)
+    media_x = np.append(suma_x / tamanos, x[-1])
+    media_y = np.append(suma_y / tamanos, y[-1])
+
+    elegidos = np.empty(n_puntos, dtype=np.intp)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    anterior = 0
+    for k in range(n_puntos - 2):
+        ix, iy = x[bordes[k]:bordes[k + 1]], y[bordes[k]:bordes[k + 1]]
+        ax_, ay_ = x[anterior], y[anterior]
+        # Doble del área del triángulo (anterior, candidato, media del siguiente)
+        area = np.abs((ax_ - media_x[k + 1]) * (iy - ay_) - (ax_ - ix) * (media_y[k + 1] - ay_))
+        anterior = bordes[k] + int(np.argmax(area))
+        elegidos[k + 1] = anterior
+    return elegidos
+
+
+def reducir(x, y, n_puntos, metodo='minmax'):
+    """x e y reducidos a como mucho n_puntos (si tienen más) con 'minmax' o 'lttb'."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= n_puntos:
+        return x, y
+    if metodo == 'minmax':
+        indices = indices_minmax(x, y, max(1, n_puntos // 4))
+    elif metodo == 'lttb':
+        indices = indices_lttb(x, y, n_puntos)
+    else:
+        raise ValueError(f"Método de reducción desconocido: {metodo} (minmax o lttb)")
+    return x[indices], y[indices]
+
+
+def reducir_para(ax, x, y, metodo='minmax'):
+    """reducir con los puntos que se ven a lo ancho de los ejes."""
+    por_pixel = 4 if metodo == 'minmax' else PUNTOS_POR_PIXEL
+    return reducir(x, y, puntos_visibles(ax, por_pixel), metodo)
@@ -0,0 +1,192 @@
+# Lectura de los espectros de P5 (archivos .csv del espectrómetro). Cada
+# archivo empieza con una cabecera de adquisición:
+#   Begin Header
+#   Date,01/04/2002 17:59:00
+#   NumPoints,508
+#   ...
+#   CoolerTemp,293,2        <- este valor lleva coma decimal
+#   End Header
+#   nm,Value
+#   350.1,0.006238
+# La cabecera se convierte a un registro con tipos (enteros, floats, bools y
+# la fecha) y el bloque de datos se convierte entero de una vez con numpy a un
+# array contiguo (2, n) de longitudes de onda y valores. No se supone un número
+# fijo de líneas de cabecera, y los archivos sin cabecera (solo
+# "lambda,cuentas" y los datos) también valen.
+
+import os
+from datetime import datetime
+
+import numpy as np
+
+# Clave del archivo -> (atributo de CabeceraEspectro, tipo)
+CAMPOS = {
+    'Date': ('fecha', 'fecha'),
+    'X-Label': ('etiqueta_x', str),
+    'Y-Label': ('etiqueta_y', str),
+    'NumPoints': ('n_puntos', int),
+    'StartValue': ('inicio', float),
+    'EndValue': ('fin', float),
+    'Steps': ('pasos', int),
+    'GaussFilter': ('filtro_gauss', int),
+    'NoiseFilter': ('filtro_ruido', bool),
+    'AmplCorrection': ('correccion_amplitud', bool),
+    'DarkCorrection': ('correccion_oscuridad', bool),
+    'AddCycles': ('ciclos', int),
+    'Iterations': ('iteraciones', int),
+    'AutoExposure': ('exposicion_automatica', bool),
+    'MaxCycleTime': ('tiempo_ciclo_max', float),
+    'ExposureTime': ('tiempo_exposicion', float),
+    'CoolerFilter': ('filtro_refrigerador', bool),
+    'CoolerTemp': ('temperatura_refrigerador', float),
+}
+
+FORMATO_FECHA = '%d/%m/%Y %H:%M:%S'
+
+_COMA_A_ESPACIO = bytes.maketrans(b',', b' ')
+
+# Subcarpetas de P5/Datos que no son adquisiciones de una lámpara
+# (Lambda guarda las longitudes de onda de referencia)
+CARPETAS_EXCLUIDAS = ('Lambda',)
+
+
+def _convertir(texto, tipo):
+    texto = texto.strip()
+    if tipo is bool:
+        return texto.lower() == 'true'
+    if tipo == 'fecha':
+        try:
+            return datetime.strptime(texto, FORMATO_FECHA)
+        except ValueError:
+            return texto
+    if tipo in (int, float):
+        # Algunos valores (CoolerTemp) vienen con coma decimal
+        return tipo(float(texto.replace(',', '.')))
+    return texto
+
+
+class CabeceraEspectro:
+    """Datos de adquisición de un espectro, con su tipo.
+
+    Los atributos son los de CAMPOS (n_puntos, inicio, fin, tiempo_exposicion,
+    filtro_ruido, ...); los que no están en el archivo valen None. Las claves
+    desconocidas se guardan como texto en 'otros'.
+    """
+
+    def __init__(self, claves=None):
+        for atributo, _ in CAMPOS.values():
+            setattr(self, atributo, None)
+        self.otros = {}
+        for clave, texto in (claves or {}).items():
+            if clave in CAMPOS:
+                atributo, tipo = CAMPOS[clave]
+                try:
+                    setattr(self, atributo, _convertir(texto, tipo))
+                except ValueError:
+                    self.otros[clave] = texto
+            else:
+                self.otros[clave] = texto
+
+    def como_diccionario(self):
+        """Atributo -> valor de todos los campos."""
+        return {atributo: getattr(self, atributo) for atributo, _ in CAMPOS.values()}
+
+    def __repr__(self):
+        campos = ', '.join(f'{clave}={valor!r}' for clave, valor in self.como_diccionario().items()
+                           if valor is not None)
+        return f'CabeceraEspectro({campos})'
+
+
+class Espectro:
+    """Espectro leído de un archivo: longitud de onda (nm) y valor, con su cabecera.
+
+    datos es un array contiguo (2, n); longitud y valor son sus dos filas.
+    """
+
+    def __init__(self, ruta, cabecera, datos, columnas=('nm', 'Value')):
+        self.ruta = ruta
+        self.cabecera = cabecera
+        self.datos = datos
+        self.columnas = columnas
+
+    @property
+    def longitud(self):
+        return self.datos[0]
+
+    @property
+    def valor(self):
+        return self.datos[1]
+
+    def __len__(self):
+        return self.datos.shape[1]
+
+    def __repr__(self):
+        return f'Espectro({self.ruta!r}, {len(self)} puntos)'
+
+
+def _partir_cabecera(contenido):
+    # Devuelve (claves de la cabecera, nombres de columnas, posición donde empiezan los datos)
+    claves = {}
+    lineas = iter(contenido.split(b'\n'))
+    posicion = 0
+    primera = contenido[:contenido.find(b'\n')].strip() if b'\n' in contenido else contenido.strip()
+    if primera.lower() == b'begin header':
+        for linea in lineas:
+            posicion += len(linea) + 1
+            texto = linea.decode('latin-1').strip()
+            if texto.lower() == 'end header':
+                break
+            if ',' in texto and texto.lower() != 'begin header':
+                clave, valor = texto.split(',', 1)
+                claves[clave.strip()] = valor
+    # Línea con los nombres de las columnas (si la hay): no empieza por un número
+    columnas = None
+    for linea in lineas:
+        texto = linea.decode('latin-1').strip()
+        if not texto:
+            posicion += len(linea) + 1
+            continue
+        if not (texto[0].isdigit() or texto[0] in '+-.'):
+            columnas = tuple(nombre.strip() for nombre in texto.split(','))
+            posicion += len(linea) + 1
+        break
+    return claves, columnas, posicion
+
+
+def leer_espectro(ruta):
+    """Lee un archivo del espectrómetro y devuelve un Espectro."""
+    with open(ruta, 'rb') as f:
+        contenido = f.read()
+    claves, columnas, posicion = _partir_cabecera(contenido)
+    cabecera = CabeceraEspectro(claves)
+
+    # Todo el bloque de datos de una vez: la coma separa columnas
+    try:
+        valores = np.array(contenido[posicion:].translate(_COMA_A_ESPACIO).split(), dtype=float)
+    except ValueError as error:
+        raise ValueError(f"{ruta}: {error}") from None
+    if len(valores) % 2:
+        raise ValueError(f"{ruta}: {len(valores)} valores no forman pares (longitud, valor)")
+    # Longitudes y valores en un array contiguo (2, n). Si NumPoints no coincide
+    # con los puntos que hay (archivo cortado o editado) valen los que hay
+    datos = np.empty((2, len(valores) // 2))
+    datos[0] = valores[0::2]
+    datos[1] = valores[1::2]
+    return Espectro(ruta, cabecera, datos, columnas or ('nm', 'Value'))
+
+
+def rutas_espectros(carpeta):
+    """Rutas de los .csv de una carpeta, en orden alfabético."""
+    return [os.path.join(carpeta, nombre) for nombre in sorted(os.listdir(carpeta))
+            if nombre.endswith('.csv')]
+
+
+def carpetas_lamparas(carpeta_datos):
+    """Subcarpetas de la carpeta de datos con espectros de lámparas, en orden alfabético."""
+    return [nombre for nombre in sorted(os.listdir(carpeta_datos))
+            if os.path.isdir(os.path.join(carpeta_datos, nombre)) and nombre not in CARPETAS_EXCLUIDAS]
+
+
+def leer_espectros(rutas):
+    """leer_espectro de varios archivos."""
+    return [leer_espectro(ruta) for ruta in rutas]
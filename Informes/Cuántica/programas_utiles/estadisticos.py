@@ -0,0 +1,100 @@
+# Estadísticos descriptivos de las opciones 1-3 (medias, desviaciones típicas,
+# covarianza y coeficiente de Pearson) calculados con NumPy en una sola pasada
+# por bloque, en lugar de statistics.mean/stdev (aritmética exacta en Python
+# puro y una pasada por cada estadístico).
+#
+# Momentos acumula bloque a bloque con la fórmula de combinación de Chan et al.,
+# así que se pueden procesar archivos enormes por trozos (por ejemplo con
+# pd.read_csv(..., chunksize=...)) y el resultado es el mismo que con todo junto.
+
+import numpy as np
+
+
+class Momentos:
+    """Acumulador de n, medias y sumas de productos centrados de x e y."""
+
+    def __init__(self):
+        self.n = 0
+        self.media_x = 0.
+        self.media_y = 0.
+        self.m2_x = 0.   # sum((x - media_x)**2)
+        self.m2_y = 0.   # sum((y - media_y)**2)
+        self.c_xy = 0.   # sum((x - media_x) * (y - media_y))
+
+    def actualizar(self, x, y):
+        """Añade un bloque de datos y devuelve el propio acumulador."""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n_b = len(x)
+        if n_b == 0:
+            return self
+        media_x_b = x.mean()
+        media_y_b = y.mean()
+        dx = x - media_x_b
+        dy = y - media_y_b
+        bloque = Momentos()
+        bloque.n = n_b
+        bloque.media_x = media_x_b
+        bloque.media_y = media_y_b
+        bloque.m2_x = dx @ dx
+        bloque.m2_y = dy @ dy
+        bloque.c_xy = dx @ dy
+        return self.combinar(bloque)
+
+    def combinar(self, otro):
+        """Junta los momentos de otro acumulador con los de este (en el sitio)."""
+        if otro.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(otro.__dict__)
+            return self
+        n = self.n + otro.n
+        delta_x = otro.media_x - self.media_x
+        delta_y = otro.media_y - self.media_y
+        factor = self.n * otro.n / n
+        self.m2_x += otro.m2_x + delta_x**2 * factor
+        self.m2_y += otro.m2_y + delta_y**2 * factor
+        self.c_xy += otro.c_xy + delta_x * delta_y * factor
+        self.media_x += delta_x * otro.n / n
+        self.media_y += delta_y * otro.n / n
+        self.n = n
+        return self
+
+    @property
+    def media_xy(self):
+        return self.c_xy / self.n + self.media_x * self.media_y
+
+    @property
+    def sigma_x(self):
+        # Desviación típica muestral (n - 1), como statistics.stdev
+        return np.sqrt(self.m2_x / (self.n - 1))
+
+    @property
+    def sigma_y(self):
+        return np.sqrt(self.m2_y / (self.n - 1))
+
+    @property
+    def covarianza(self):
+        return self.c_xy / (self.n - 1)
+
+    @property
+    def pearson(self):
+        # Igual que n*(mediaxy - mediax*mediay)/((n-1)*sigmax*sigmay) del menú
+        return self.c_xy / np.sqrt(self.m2_x * self.m2_y)
+
+    def resultados(self):
+        """Diccionario con los mismos estadísticos que imprimen las opciones 1-3."""
+        return {
+            'media_x': float(self.media_x),
+            'media_y': float(self.media_y),
+            'media_xy': float(self.media_xy),
+            'sigma_x': float(self.sigma_x),
+            'sigma_y': float(self.sigma_y),
+            'covarianza': float(self.covarianza),
+            'pearson': float(self.pearson),
+        }
+
+
+def estadisticos(x, y):
+    """Estadísticos de x e y de una sola vez."""
+    return Momentos().actualizar(x, y).resultados()
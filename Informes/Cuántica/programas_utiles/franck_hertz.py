@@ -0,0 +1,259 @@
+# Análisis completo de P4 (Franck-Hertz con neón) en una sola orden: para cada
+# medida de P4/Datos se lee la curva I(U1), se suaviza con un spline, se
+# buscan sus máximos y con la separación entre máximos consecutivos se estima
+# la energía del primer nivel excitado (E = e·ΔV). Las medidas se reparten
+# entre todos los núcleos y los resultados van a una sola tabla .csv.
+#
+# Uso (desde Informes/Cuántica):
+#   python -m programas_utiles.franck_hertz P4/Datos --salida P4/franck_hertz.csv
+#
+# Si P4/Datos/medidas.npz (programas_utiles.almacen) está al día, las curvas
+# se leen de ahí en lugar de los .txt; cada proceso abre el almacén una vez
+# por bloque de medidas y lee solo las curvas que analiza.
+#
+# Suavizado: la curva tiene miles de puntos con ruido, y un spline que pase
+# por todos tiene cientos de extremos. Se promedian los puntos en intervalos
+# de 'paso' voltios y el spline natural pasa por esos promedios. De sus
+# máximos se quedan los que sobresalen lo suficiente (prominencia) y los que
+# no están en la zona saturada del amperímetro (I = máximo repetido).
+#
+# Incertidumbres: cada máximo se sitúa con la resolución del promedio,
+# σ_x = paso/√12. La separación media de N máximos es (x_N - x_1)/(N - 1), así
+# que por resolución σ = √2 σ_x / (N - 1); a eso se suma en cuadratura el
+# error estándar de las separaciones (que cambian con el orden del máximo).
+
+import argparse
+import csv
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .almacen import AlmacenMedidas, almacen_actualizado, carpetas_medidas, huella_archivo
+from .medidas import leer_tabla, rutas_medidas
+from .splines import extremos_tramos, MAXIMO, MINIMO
+
+# Ancho (V) de los intervalos en los que se promedia la curva
+PASO = 0.5
+# Prominencia mínima de un máximo: absoluta (nA) y relativa al rango de I
+PROMINENCIA_MIN = 0.5
+PROMINENCIA_REL = 0.05
+
+COLUMNAS_TABLA = ('carpeta', 'archivo', 'U2', 'U3', 'UH', 'n_puntos', 'n_maximos', 'maximos_V',
+                  'minimos_V', 'separaciones_V', 'E_eV', 'sigma_E_eV', 'sigma_E_estadistica_eV',
+                  'sigma_E_resolucion_eV', 'error')
+
+
+def suavizar(x, y, paso=PASO):
+    """Promedios de x e y en intervalos de ancho paso (solo los que tienen puntos)."""
+    intervalo = np.floor((x - x.min()) / paso).astype(np.intp)
+    n = np.bincount(intervalo)
+    lleno = n > 0
+    return (np.bincount(intervalo, x)[lleno] / n[lleno],
+            np.bincount(intervalo, y)[lleno] / n[lleno])
+
+
+def maximos_curva(x, y, paso=PASO, prominencia_min=PROMINENCIA_MIN, prominencia_rel=PROMINENCIA_REL):
+    """Posiciones de los máximos y mínimos significativos de la curva I(U1).
+
+    Devuelve (maximos, minimos), arrays de U1 ordenados.
+    """
+    from scipy.interpolate import CubicSpline
+    from scipy.signal import peak_prominences
+
+    xs, ys = suavizar(x, y, paso)
+    if len(xs) < 3:
+        return np.empty(0), np.empty(0)
+    cs = CubicSpline(xs, ys, bc_type='natural')
+    puntos = extremos_tramos(cs.x, cs.c)
+    extremo = puntos['tipo'] != 0
+    xe, ye, tipo = puntos['x'][extremo], puntos['y'][extremo], puntos['tipo'][extremo]
+
+    # Prominencia de cada máximo dentro de la sucesión de extremos
+    picos = np.flatnonzero(tipo == MAXIMO)
+    valles = np.flatnonzero(tipo == MINIMO)
+    rango = y.max() - y.min()
+    umbral = max(prominencia_min, prominencia_rel * rango)
+    # Con el amperímetro saturado la curva es plana en su valor máximo
+    saturacion = y.max() - 0.01 * rango if np.count_nonzero(y == y.max()) > 2 else np.inf
+    significativo = np.zeros(len(picos), dtype=bool)
+    hondo = np.zeros(len(valles), dtype=bool)
+    with warnings.catch_warnings():
+        # Un máximo en un extremo de la sucesión tiene prominencia 0, y se descarta
+        warnings.simplefilter('ignore')
+        if len(picos):
+            significativo = peak_prominences(ye, picos)[0] >= umbral
+        # Mínimos: los de profundidad suficiente, sobre la curva invertida
+        if len(valles):
+            hondo = peak_prominences(-ye, valles)[0] >= umbral
+    significativo &= ye[picos] < saturacion
+    return xe[picos[significativo]], xe[valles[hondo]]
+
+
+def energia_excitacion(maximos, paso=PASO):
+    """Separaciones entre máximos consecutivos y energía E (eV) con sus incertidumbres.
+
+    Devuelve (separaciones, E, sigma_E, sigma_estadistica, sigma_resolucion);
+    con menos de dos máximos E y las sigmas son NaN.
+    """
+    separaciones = np.diff(maximos)
+    n = len(separaciones)
+    if n == 0:
+        return separaciones, np.nan, np.nan, np.nan, np.nan
+    energia = separaciones.mean()
+    sigma_resolucion = np.sqrt(2) * paso / np.sqrt(12) / n
+    sigma_estadistica = separaciones.std(ddof=1) / np.sqrt(n) if n > 1 else 0.
+    return (separaciones, energia, np.hypot(sigma_estadistica, sigma_resolucion),
+            sigma_estadistica, sigma_resolucion)
+
+
+def _leer_curva(tarea, almacen=None):
+    # U1, IA y (U2, U3, UH) de la medida, del almacén si la tarea está en él
+    if 'posicion' in tarea:
+        x, y = almacen.curva(tarea['posicion'])
+        return x, y, [float(almacen.indice[nombre][tarea['posicion']]) for nombre in ('U2', 'U3', 'UH')]
+    tabla = leer_tabla(tarea['ruta'])
+    return tabla[:, 0], tabla[:, 1], tabla[0, 2:].tolist()
+
+
+def analizar_medida(tarea, almacen=None):
+    """Fila de resultados de una medida; los errores se guardan en la fila.
+
+    Las tareas con 'posicion' se leen de almacen (AlmacenMedidas), las demás de su .txt.
+    """
+    fila = {'carpeta': tarea['carpeta'], 'archivo': os.path.basename(tarea['ruta'])}
+    try:
+        x, y, constantes = _leer_curva(tarea, almacen)
+        fila.update(zip(('U2', 'U3', 'UH'), constantes))
+        fila['n_puntos'] = len(x)
+        maximos, minimos = maximos_curva(x, y, tarea['paso'], tarea['prominencia_min'], tarea['prominencia_rel'])
+        separaciones, energia, sigma, sigma_estadistica, sigma_resolucion = energia_excitacion(maximos, tarea['paso'])
+        fila.update({
+            'n_maximos': len(maximos),
+            'maximos_V': ' '.join(f'{v:.3f}' for v in maximos),
+            'minimos_V': ' '.join(f'{v:.3f}' for v in minimos),
+            'separaciones_V': ' '.join(f'{v:.3f}' for v in separaciones),
+            'E_eV': energia, 'sigma_E_eV': sigma,
+            'sigma_E_estadistica_eV': sigma_estadistica, 'sigma_E_resolucion_eV': sigma_resolucion,
+        })
+    except Exception as e:
+        # Una medida mala no debe parar el análisis completo
+        fila['error'] = f"{type(e).__name__}: {e}"
+    return fila
+
+
+def _analizar_bloque(tareas):
+    rutas = {tarea['almacen'] for tarea in tareas if 'almacen' in tarea}
+    almacen = AlmacenMedidas(rutas.pop()) if rutas else None
+    return [analizar_medida(tarea, almacen) for tarea in tareas]
+
+
+def tareas_medidas(carpeta_datos, repetidas=False, almacen=None):
+    """Una tarea por medida de las subcarpetas de carpeta_datos, en orden alfabético.
+
+    Las medidas con el mismo contenido que una anterior (Todos repite las
+    demás carpetas) se saltan salvo con repetidas=True. Con almacen
+    (AlmacenMedidas de estas medidas) las tareas apuntan a sus curvas y las
+    repetidas son las que comparten curva, que ingerir ya ha detectado; sin
+    almacen se detectan con la misma huella del contenido (huella_archivo).
+    """
+    if almacen is not None:
+        orden = np.lexsort((almacen.indice['archivo'], almacen.indice['carpeta']))
+        # Una curva vacía empieza donde la siguiente: la curva es (inicio, n_puntos)
+        curvas = np.column_stack((almacen.indice['inicio'], almacen.indice['n_puntos']))
+        _, primeras = np.unique(curvas[orden], axis=0, return_index=True)
+        unicas = np.zeros(len(orden), dtype=bool)
+        unicas[primeras] = True
+        return [{'carpeta': str(almacen.indice['carpeta'][i]), 'almacen': almacen.ruta, 'posicion': int(i),
+                 'ruta': os.path.join(carpeta_datos, almacen.indice['carpeta'][i], almacen.indice['archivo'][i])}
+                for i, unica in zip(orden, unicas) if unica or repetidas]
+    rutas = [(carpeta, ruta) for carpeta in carpetas_medidas(carpeta_datos)
+             for ruta in rutas_medidas(os.path.join(carpeta_datos, carpeta))]
+    if repetidas:
+        return [{'carpeta': carpeta, 'ruta': ruta} for carpeta, ruta in rutas]
+    tareas, vistas = [], set()
+    for carpeta, ruta in rutas:
+        huella = huella_archivo(ruta)
+        if huella not in vistas:
+            vistas.add(huella)
+            tareas.append({'carpeta': carpeta, 'ruta': ruta})
+    return tareas
+
+
+def analizar_todo(carpeta_datos, paso=PASO, prominencia_min=PROMINENCIA_MIN,
+                  prominencia_rel=PROMINENCIA_REL, procesos=None, repetidas=False, almacen=None):
+    """Analiza todas las medidas en paralelo y devuelve sus filas en orden.
+
+    almacen es el AlmacenMedidas de las medidas o su ruta; por defecto se usa
+    el de carpeta_datos si está al día (almacen_actualizado). Con
+    almacen=False se leen siempre los .txt.
+    """
+    if almacen is None or isinstance(almacen, str):
+        almacen = almacen_actualizado(carpeta_datos, almacen)
+    tareas = tareas_medidas(carpeta_datos, repetidas, almacen or None)
+    for tarea in tareas:
+        tarea.update(paso=paso, prominencia_min=prominencia_min, prominencia_rel=prominencia_rel)
+    if procesos == 1 or len(tareas) <= 1:
+        return _analizar_bloque(tareas)
+
+    procesos = procesos or os.cpu_count() or 1
+    tamano = max(1, -(-len(tareas) // (4 * procesos)))
+    bloques = [tareas[i:i + tamano] for i in range(0, len(tareas), tamano)]
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        return [fila for filas in executor.map(_analizar_bloque, bloques) for fila in filas]
+
+
+def combinar(filas):
+    """Media ponderada de E (1/σ²) sobre las medidas con al menos dos máximos: (E, sigma_E, n)."""
+    energias = np.array([fila.get('E_eV', np.nan) for fila in filas], dtype=float)
+    sigmas = np.array([fila.get('sigma_E_eV', np.nan) for fila in filas], dtype=float)
+    validas = np.isfinite(energias) & np.isfinite(sigmas) & (sigmas > 0)
+    if not validas.any():
+        return np.nan, np.nan, 0
+    pesos = 1 / sigmas[validas]**2
+    return np.sum(pesos * energias[validas]) / pesos.sum(), 1 / np.sqrt(pesos.sum()), int(validas.sum())
+
+
+def escribir_tabla(filas, salida):
+    """Guarda las filas como .csv con las columnas de COLUMNAS_TABLA."""
+    with open(salida, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUMNAS_TABLA)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Energía de excitación del neón a partir de todas las medidas de P4.')
+    parser.add_argument('carpeta_datos', help='Carpeta con las subcarpetas de medidas (P4/Datos)')
+    parser.add_argument('--salida', default='franck_hertz.csv', help='Tabla de resultados (.csv)')
+    parser.add_argument('--paso', type=float, default=PASO, help='Ancho (V) de los intervalos de promedio')
+    parser.add_argument('--prominencia-min', type=float, default=PROMINENCIA_MIN,
+                        help='Prominencia mínima de un máximo (nA)')
+    parser.add_argument('--prominencia-rel', type=float, default=PROMINENCIA_REL,
+                        help='Prominencia mínima relativa al rango de corriente de la medida')
+    parser.add_argument('--procesos', type=int, default=None, help='Número de procesos (por defecto, uno por núcleo)')
+    parser.add_argument('--repetidas', action='store_true',
+                        help='Analizar también las medidas repetidas en varias carpetas')
+    parser.add_argument('--almacen', default=None,
+                        help='Almacén de las medidas (por defecto, medidas.npz en carpeta_datos si está al día)')
+    parser.add_argument('--sin-almacen', action='store_true', help='Leer siempre los .txt, aunque haya almacén')
+    args = parser.parse_args(argv)
+
+    almacen = False if args.sin_almacen else almacen_actualizado(args.carpeta_datos, args.almacen)
+    if args.almacen and not almacen and not args.sin_almacen:
+        print(f"{args.almacen} no está al día con {args.carpeta_datos}; se leen los .txt")
+    filas = analizar_todo(args.carpeta_datos, args.paso, args.prominencia_min, args.prominencia_rel,
+                          args.procesos, args.repetidas, almacen or False)
+    escribir_tabla(filas, args.salida)
+
+    errores = sum('error' in fila for fila in filas)
+    energia, sigma, n = combinar(filas)
+    origen = almacen.ruta if almacen else 'los .txt'
+    print(f"{len(filas)} medidas analizadas ({errores} con error) leídas de {origen}, resultados en {args.salida}")
+    print(f"E = {energia:.2f} ± {sigma:.2f} eV (media ponderada de {n} medidas con al menos dos máximos)")
+    return 0 if errores == 0 else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,156 @@
+# Gráficas de cada opción con el mismo formato que el menú, pero guardándolas
+# en un archivo en lugar de mostrarlas con plt.show().
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.patches import Ellipse
+import matplotlib.transforms as transforms
+
+from .opciones import func_ax, func_axb, func_cuadratica, construir_spline
+
+
+def _guardar(fig, nombre_graf, escritor):
+    # Con un EscritorGraficas la figura se guarda en segundo plano
+    if escritor is None:
+        plt.savefig(nombre_graf)
+        plt.close(fig)
+    else:
+        escritor.guardar(fig, nombre_graf)
+
+
+def _formato_ejes(ax, unidad_ejex, unidad_ejey):
+    plt.xlabel(unidad_ejex,fontsize=25)
+    plt.ylabel(unidad_ejey,fontsize=25)
+    plt.legend(loc='best',fontsize=25)
+    plt.grid()
+
+    # Este comando permite modificar el grosor de los ejes:
+    for axis in ['top','bottom','left','right']:
+        ax.spines[axis].set_linewidth(4)
+
+    # Con estas líneas podemos dar formato a los "ticks" de los ejes:
+    plt.tick_params(axis="x", labelsize=25, labelrotation=0, labelcolor="black")
+    plt.tick_params(axis="y", labelsize=25, labelrotation=0, labelcolor="black")
+
+
+def grafica_ajuste(data, y_pred, nombre_graf, unidad_ejex='', unidad_ejey='', escritor=None):
+    """Datos con barras de error y curva ajustada (opciones 1, 2 y 3)."""
+    fig=plt.figure(figsize=[18,12])
+    ax=fig.gca()
+    plt.errorbar(data.x, data.y, xerr=data.dx, yerr=data.dy, fmt='b.', label='Datos', linewidth=3)
+    plt.plot(data.x, y_pred, 'g-', label='Ajuste',linewidth=4.0)
+    _formato_ejes(ax, unidad_ejex, unidad_ejey)
+    _guardar(fig, nombre_graf, escritor)
+
+
+def grafica_minimos_cuadrados(data, y_ajuste, etiqueta, nombre_graf, unidad_ejex='', unidad_ejey='', escritor=None):
+    """Datos experimentales y recta ponderada (opciones 5 y 6)."""
+    fig = plt.figure()
+    plt.errorbar(data.x, data.y, xerr=data.dx, yerr=data.dy, fmt='o', label='Datos experimentales', color='blue', ecolor='gray', capsize=4)
+    plt.plot(data.x, y_ajuste, color='red', label=etiqueta)
+    plt.xlabel(unidad_ejex,fontsize=25)
+    plt.ylabel(unidad_ejey,fontsize=25)
+    plt.legend(loc='best',fontsize=25)
+    plt.grid(True)
+    _guardar(fig, nombre_graf, escritor)
+
+
+def plot_uncertainty_ellipse(x, y, cov, ax, n_std=2.0):
+    ### Dibuja una elipse de incertidumbre alrededor del punto.
+
+    pearson = cov[0, 1]/np.sqrt(cov[0, 0] * cov[1, 1])
+    ell_radius_x = np.sqrt(1 + pearson)
+    ell_radius_y = np.sqrt(1 - pearson)
+
+    ellipse = Ellipse((0, 0), width=ell_radius_x * 2 * n_std, height=ell_radius_y * 2 * n_std,facecolor='red', alpha=0.2, edgecolor='none')
+
+    transf = transforms.Affine2D() \
+        .rotate_deg(45) \
+        .scale(np.sqrt(cov[0, 0]) * n_std,
+            np.sqrt(cov[1, 1]) * n_std) \
+        .translate(x, y)
+
+    ellipse.set_transform(transf + ax.transData)
+    ax.add_patch(ellipse)
+
+
+def grafica_interseccion(data, resultado, nombre_graf, unidad_ejex='', unidad_ejey='', escritor=None):
+    """Los dos conjuntos, sus rectas y la intersección con su elipse de error (opción 4)."""
+    n = resultado['n_primer_conjunto']
+    set1 = data.iloc[:n]
+    set2 = data.iloc[n:]
+    a1, b1 = resultado['a1'], resultado['b1']
+    a2, b2 = resultado['a2'], resultado['b2']
+    x_int, y_int = resultado['x_int'], resultado['y_int']
+    cov = np.array([[resultado['sigma_x_int']**2, resultado['cov_xy_int']],
+                    [resultado['cov_xy_int'], resultado['sigma_y_int']**2]])
+
+    fig = plt.figure(figsize=(10, 6))
+
+    # Conjuntos de datos con barras de error
+    plt.errorbar(set1['x'], set1['y'], xerr=set1['dx'], yerr=set1['dy'], fmt='o', color='blue', label='Conjunto 1', alpha=0.7)
+    plt.errorbar(set2['x'], set2['y'], xerr=set2['dx'], yerr=set2['dy'], fmt='s', color='green', label='Conjunto 2', alpha=0.7)
+
+    # Rectas ajustadas
+    x_vals = np.array([min(set1['x'].min(), set2['x'].min()), max(set1['x'].max(), set2['x'].max())])
+
+    plt.plot(x_vals, a1*x_vals + b1, 'b-', label=f'Recta 1: $y = {a1:.2f}x + {b1:.2f}$')
+    plt.plot(x_vals, a2*x_vals + b2, 'g-', label=f'Recta 2: $y = {a2:.2f}x + {b2:.2f}$')
+
+    # Punto de intersección con elipse de error
+    plot_uncertainty_ellipse(x_int, y_int, cov, plt.gca())
+    plt.scatter(x_int, y_int, color='red', s=100, zorder=5, label=f'Intersección: ({x_int:.2f}, {y_int:.2f})')
+
+    plt.xlabel(unidad_ejex)
+    plt.ylabel(unidad_ejey)
+    plt.title('Ajuste lineal e intersección con incertidumbres')
+    plt.legend()
+    plt.grid(True)
+    _guardar(fig, nombre_graf, escritor)
+
+
+def grafica_spline(data, nombre_graf, escritor=None):
+    """Datos y spline cúbico evaluado en dos puntos por píxel de ancho (opción 7)."""
+    from .diezmado import puntos_visibles
+
+    cs = construir_spline(data)
+    fig = plt.figure(figsize=(8, 4))
+    ax = fig.gca()
+    x_fino = np.linspace(cs.x[0], cs.x[-1], puntos_visibles(ax))
+    plt.plot(data.x, data.y, "o", label="Datos")
+    plt.plot(x_fino, cs(x_fino), "-", label="Spline Datos")
+    plt.legend(loc='best', fontsize=25)
+    plt.grid(True)
+    _guardar(fig, nombre_graf, escritor)
+
+
+def grafica_opcion(opcion, data, resultado, nombre_graf, unidad_ejex='', unidad_ejey='', escritor=None):
+    """Dibuja y guarda la gráfica correspondiente a la opción a partir de su resultado.
+
+    Si se pasa un EscritorGraficas (programas_utiles.render) el guardado se hace en segundo plano.
+    """
+    if opcion == 1:
+        grafica_ajuste(data, func_ax(data.x, resultado['a']), nombre_graf, unidad_ejex, unidad_ejey, escritor)
+    elif opcion == 2:
+        grafica_ajuste(data, func_axb(data.x, resultado['a'], resultado['b']), nombre_graf, unidad_ejex, unidad_ejey, escritor)
+    elif opcion == 3:
+        y_pred = func_cuadratica(data.x, resultado['a'], resultado['b'], resultado['c'])
+        grafica_ajuste(data, y_pred, nombre_graf, unidad_ejex, unidad_ejey, escritor)
+    elif opcion == 4:
+        grafica_interseccion(data, resultado, nombre_graf, unidad_ejex, unidad_ejey, escritor)
+    elif opcion == 5:
+        y_ajuste = resultado['a'] * data.x + resultado['b']
+        grafica_minimos_cuadrados(data, y_ajuste, 'Ajuste lineal ponderado', nombre_graf, unidad_ejex, unidad_ejey, escritor)
+    elif opcion == 6:
+        y_ajuste = resultado['a'] * data.x
+        grafica_minimos_cuadrados(data, y_ajuste, f"Ajuste y = {resultado['a']:.3f}x", nombre_graf, unidad_ejex, unidad_ejey, escritor)
+    elif opcion == 7:
+        grafica_spline(data, nombre_graf, escritor=escritor)
+    elif opcion == 8:
+        from .no_lineal import compilar_modelo
+
+        modelo = compilar_modelo(resultado['expresion'])
+        y_pred = modelo.f(data.x, *[resultado[nombre] for nombre in modelo.parametros])
+        grafica_ajuste(data, y_pred, nombre_graf, unidad_ejex, unidad_ejey, escritor)
+    else:
+        raise ValueError(f"Opción no válida: {opcion}")
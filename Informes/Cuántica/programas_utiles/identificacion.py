@@ -0,0 +1,224 @@
+# Identificación automática de las líneas medidas con una lista de referencia
+# por elemento (P5/Referencias/<Elemento>.csv, columnas lambda_nm y,
+# opcionalmente, intensidad, superior, inferior y cualquier otra etiqueta).
+#
+# Uso (desde Informes/Cuántica), con la tabla de programas_utiles.picos:
+#   python -m programas_utiles.identificacion P5/picos.csv --referencias P5/Referencias --salida P5/lineas.csv
+#
+# Cada lista se guarda ordenada por longitud de onda, y los candidatos de
+# todos los picos a la vez salen de dos searchsorted (λ ± tolerancia): el
+# coste es O(P log N), así que sirve igual con las 15 líneas del helio que con
+# las 10⁵ de una base de datos atómica completa.
+#
+# Puntuación de cada candidato (pico p, línea k):
+#   w = exp(-½ (Δ/σ)²) · I_k^PESO_INTENSIDAD
+# con Δ = λ_p - λ_k y σ² = σ_p² + σ_calibracion² (σ_p es el error del centro
+# si los picos se ajustaron con --perfil). Sin intensidad, I_k = 1. La
+# probabilidad de cada candidato es w / Σw de los del pico; si la del mejor no
+# llega a UMBRAL_AMBIGUO la asignación se marca como ambigua. Los picos sin
+# ninguna línea a menos de la tolerancia quedan sin identificar.
+
+import argparse
+import csv
+import os
+
+import numpy as np
+
+# Distancia máxima (nm) entre un pico y una línea candidata
+TOLERANCIA = 1.0
+# Error de calibración del espectrómetro, como fracción de la tolerancia
+FRACCION_CALIBRACION = 1 / 3
+# Exponente de la intensidad relativa en la puntuación (0: no cuenta)
+PESO_INTENSIDAD = 0.5
+# Probabilidad mínima del mejor candidato para no considerar ambigua la asignación
+UMBRAL_AMBIGUO = 0.9
+
+COLUMNAS_TABLA = ('linea_nm', 'diferencia_nm', 'probabilidad', 'n_candidatos', 'ambiguo', 'superior',
+                  'inferior', 'alternativa_nm', 'alternativa_probabilidad')
+
+
+class IndiceLineas:
+    """Lista de líneas de referencia ordenada por longitud de onda.
+
+    lambdas (nm) y, opcionalmente, intensidades y otras columnas (etiquetas)
+    del mismo largo; todas se guardan en el orden de lambdas.
+    """
+
+    def __init__(self, lambdas, intensidades=None, **etiquetas):
+        lambdas = np.asarray(lambdas, dtype=float)
+        orden = np.argsort(lambdas, kind='stable')
+        self.lambdas = lambdas[orden]
+        self.intensidades = (np.ones(len(lambdas)) if intensidades is None
+                             else np.asarray(intensidades, dtype=float)[orden])
+        self.etiquetas = {nombre: np.asarray(valores, dtype=object)[orden] for nombre, valores in etiquetas.items()}
+
+    def __len__(self):
+        return len(self.lambdas)
+
+    def candidatos(self, lambdas, tolerancia=TOLERANCIA):
+        """Pares (pico, línea) con |λ_pico - λ_línea| <= tolerancia.
+
+        Devuelve (pico, linea, n_candidatos): posiciones en lambdas y en el
+        índice de cada par, con los pares de cada pico seguidos, y el número
+        de candidatos de cada pico.
+        """
+        lambdas = np.asarray(lambdas, dtype=float)
+        inicio = np.searchsorted(self.lambdas, lambdas - tolerancia, 'left')
+        fin = np.searchsorted(self.lambdas, lambdas + tolerancia, 'right')
+        n = fin - inicio
+        salto = np.cumsum(n) - n
+        pico = np.repeat(np.arange(len(lambdas)), n)
+        linea = np.repeat(inicio - salto, n) + np.arange(n.sum())
+        return pico, linea, n
+
+    def identificar(self, lambdas, sigmas=None, tolerancia=TOLERANCIA, sigma_calibracion=None,
+                    peso_intensidad=PESO_INTENSIDAD, umbral_ambiguo=UMBRAL_AMBIGUO):
+        """Mejor línea de referencia para cada pico.
+
+        sigmas son los errores de los centros (opcional); sigma_calibracion
+        es por defecto FRACCION_CALIBRACION·tolerancia. Devuelve un
+        diccionario de arrays con una posición por pico: linea (posición en
+        el índice, -1 sin identificar), diferencia, probabilidad,
+        n_candidatos, ambiguo y alternativa (el segundo candidato, -1 si no
+        hay) con alternativa_probabilidad.
+        """
+        lambdas = np.asarray(lambdas, dtype=float)
+        n_picos = len(lambdas)
+        if sigma_calibracion is None:
+            sigma_calibracion = FRACCION_CALIBRACION * tolerancia
+        sigmas = np.zeros(n_picos) if sigmas is None else np.nan_to_num(np.asarray(sigmas, dtype=float))
+        pico, linea, n = self.candidatos(lambdas, tolerancia)
+
+        diferencia = lambdas[pico] - self.lambdas[linea]
+        sigma2 = sigmas[pico]**2 + sigma_calibracion**2
+        intensidad = np.nan_to_num(self.intensidades[linea], nan=1.)
+        peso = np.exp(-0.5 * diferencia**2 / sigma2) * np.maximum(intensidad, 0)**peso_intensidad
+        total = np.bincount(pico, peso, n_picos)
+        probabilidad = np.divide(peso, total[pico], out=np.zeros_like(peso), where=total[pico] > 0)
+
+        # Pares de cada pico de mayor a menor probabilidad: el primero es el mejor
+        orden = np.lexsort((-probabilidad, pico))
+        primero = np.cumsum(n) - n
+        con = n > 0
+        resultado = {
+            'linea': np.full(n_picos, -1), 'diferencia': np.full(n_picos, np.nan),
+            'probabilidad': np.zeros(n_picos), 'n_candidatos': n,
+            'alternativa': np.full(n_picos, -1), 'alternativa_probabilidad': np.zeros(n_picos),
+        }
+        mejor = orden[primero[con]]
+        resultado['linea'][con] = linea[mejor]
+        resultado['diferencia'][con] = diferencia[mejor]
+        resultado['probabilidad'][con] = probabilidad[mejor]
+        dos = n > 1
+        segundo = orden[primero[dos] + 1]
+        resultado['alternativa'][dos] = linea[segundo]
+        resultado['alternativa_probabilidad'][dos] = probabilidad[segundo]
+        resultado['ambiguo'] = con & (resultado['probabilidad'] < umbral_ambiguo)
+        return resultado
+
+
+def leer_referencias(ruta):
+    """IndiceLineas de un .csv con columna lambda_nm (e intensidad y etiquetas opcionales)."""
+    with open(ruta, encoding='utf-8', newline='') as f:
+        filas = list(csv.DictReader(f))
+    if not filas:
+        return IndiceLineas(np.empty(0))
+    if 'lambda_nm' not in filas[0]:
+        raise ValueError(f"{ruta}: falta la columna lambda_nm")
+    lambdas = [float(fila['lambda_nm']) for fila in filas]
+    intensidades = None
+    if 'intensidad' in filas[0]:
+        intensidades = [float(fila['intensidad']) if fila['intensidad'].strip() else np.nan for fila in filas]
+    etiquetas = {nombre: [fila[nombre] for fila in filas]
+                 for nombre in filas[0] if nombre not in ('lambda_nm', 'intensidad')}
+    return IndiceLineas(lambdas, intensidades, **etiquetas)
+
+
+def cargar_referencias(carpeta):
+    """Diccionario elemento -> IndiceLineas con los .csv de la carpeta (el nombre es el elemento)."""
+    return {os.path.splitext(nombre)[0]: leer_referencias(os.path.join(carpeta, nombre))
+            for nombre in sorted(os.listdir(carpeta)) if nombre.endswith('.csv')}
+
+
+def identificar_tabla(filas, referencias, tolerancia=TOLERANCIA, sigma_calibracion=None,
+                      peso_intensidad=PESO_INTENSIDAD, umbral_ambiguo=UMBRAL_AMBIGUO):
+    """Añade a cada fila de la tabla de picos su identificación (columnas de COLUMNAS_TABLA).
+
+    Cada pico se compara con las líneas de su elemento; se usa centro_nm si
+    los picos se ajustaron y si no lambda_nm. Devuelve las filas nuevas.
+    """
+    salida = [dict(fila) for fila in filas]
+    por_elemento = {}
+    for i, fila in enumerate(salida):
+        if fila.get('error') or not fila.get('lambda_nm'):
+            continue
+        por_elemento.setdefault(fila['elemento'], []).append(i)
+
+    for elemento, posiciones in por_elemento.items():
+        indice = referencias.get(elemento)
+        if indice is None:
+            for i in posiciones:
+                salida[i]['n_candidatos'] = 0
+            continue
+        lambdas = np.array([float(salida[i].get('centro_nm') or salida[i]['lambda_nm']) for i in posiciones])
+        sigmas = np.array([float(salida[i].get('sigma_centro_nm') or 0) for i in posiciones])
+        resultado = indice.identificar(lambdas, sigmas, tolerancia, sigma_calibracion, peso_intensidad,
+                                       umbral_ambiguo)
+        for k, i in enumerate(posiciones):
+            fila = salida[i]
+            fila['n_candidatos'] = int(resultado['n_candidatos'][k])
+            linea = resultado['linea'][k]
+            if linea < 0:
+                continue
+            fila.update(linea_nm=indice.lambdas[linea], diferencia_nm=resultado['diferencia'][k],
+                        probabilidad=resultado['probabilidad'][k], ambiguo=bool(resultado['ambiguo'][k]))
+            for nombre in ('superior', 'inferior'):
+                if nombre in indice.etiquetas:
+                    fila[nombre] = indice.etiquetas[nombre][linea]
+            alternativa = resultado['alternativa'][k]
+            if alternativa >= 0:
+                fila['alternativa_nm'] = indice.lambdas[alternativa]
+                fila['alternativa_probabilidad'] = resultado['alternativa_probabilidad'][k]
+    return salida
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Identifica los picos medidos con listas de líneas de referencia.')
+    parser.add_argument('tabla', help='Tabla de picos (.csv de programas_utiles.picos)')
+    parser.add_argument('--referencias', required=True, help='Carpeta con un .csv de líneas por elemento')
+    parser.add_argument('--salida', default='lineas.csv', help='Tabla de picos identificados (.csv)')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA, help='Distancia máxima pico-línea (nm)')
+    parser.add_argument('--sigma-calibracion', type=float, default=None,
+                        help='Error de calibración (nm); por defecto un tercio de la tolerancia')
+    parser.add_argument('--peso-intensidad', type=float, default=PESO_INTENSIDAD,
+                        help='Exponente de la intensidad de referencia en la puntuación')
+    parser.add_argument('--umbral-ambiguo', type=float, default=UMBRAL_AMBIGUO,
+                        help='Probabilidad mínima del mejor candidato para no marcarlo ambiguo')
+    args = parser.parse_args(argv)
+
+    with open(args.tabla, encoding='utf-8', newline='') as f:
+        lector = csv.DictReader(f)
+        columnas = [c for c in lector.fieldnames if c not in COLUMNAS_TABLA]
+        filas = list(lector)
+    filas = identificar_tabla(filas, cargar_referencias(args.referencias), args.tolerancia, args.sigma_calibracion,
+                              args.peso_intensidad, args.umbral_ambiguo)
+    # La columna error al final, después de la identificación
+    columnas = [c for c in columnas if c != 'error'] + list(COLUMNAS_TABLA) + ['error']
+    with open(args.salida, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=columnas)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+    picos = [fila for fila in filas if not fila.get('error') and fila.get('lambda_nm')]
+    sin = [fila for fila in picos if 'linea_nm' not in fila]
+    ambiguos = [fila for fila in picos if fila.get('ambiguo')]
+    print(f"{len(picos) - len(sin)} de {len(picos)} picos identificados ({len(ambiguos)} ambiguos), "
+          f"resultados en {args.salida}")
+    for fila in sin:
+        print(f"  Sin identificar: {fila['elemento']}/{fila['archivo']} "
+              f"{float(fila.get('centro_nm') or fila['lambda_nm']):.2f} nm")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
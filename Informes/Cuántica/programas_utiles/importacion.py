@@ -0,0 +1,106 @@
+# Informe del tiempo de importación, como python -X importtime pero resumido:
+# cada escenario se ejecuta en un intérprete nuevo con -X importtime, se mide
+# el tiempo total de arranque y se suman los tiempos de los paquetes de primer
+# nivel (numpy, pandas, scipy, matplotlib, ...) que ha cargado.
+#
+# Sirve para comprobar que el paquete solo carga las librerías que necesita
+# cada opción, comparando con lo que importaban al empezar las copias antiguas
+# de ProgramasUtiles.py.
+#
+# Uso (desde Informes/Cuántica):
+#   python -m programas_utiles.importacion
+#   python -m programas_utiles.importacion menu_original opcion5 --detalle 15
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+CARPETA = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Escenario -> código que se ejecuta en el intérprete nuevo
+ESCENARIOS = {
+    # Las importaciones del principio de las copias de ProgramasUtiles.py
+    'menu_original': ('import numpy as np, pandas as pd, matplotlib.pyplot as plt, statistics\n'
+                      'from matplotlib.patches import Ellipse\n'
+                      'import matplotlib.transforms as transforms\n'
+                      'from scipy.optimize import curve_fit\n'
+                      'from scipy.interpolate import CubicSpline\n'
+                      'from scipy import odr'),
+    # Hasta que aparece el menú
+    'menu': 'from programas_utiles.menu import ejecutar_menu',
+    # Ajuste en forma cerrada (opción 5) de unos datos ya en memoria
+    'opcion5': ('import programas_utiles as pu\n'
+                'pu.OPCIONES[5]({"x": [1., 2., 3.], "y": [2., 4.1, 5.9], "dy": [.1, .1, .1]})'),
+    # Ajuste con curve_fit (opción 1 antigua) y con ODR (opción 4)
+    'curve_fit': 'import programas_utiles as pu\npu.ajustar(lambda x, a: a*x, [1., 2., 3.], [2., 4.1, 5.9], [.1, .1, .1])',
+    'odr': ('from programas_utiles.opciones import weighted_linear_fit\n'
+            'weighted_linear_fit({"x": [1., 2., 3.], "y": [2., 4.1, 5.9], "dx": [.1, .1, .1], "dy": [.1, .1, .1]})'),
+    'lectura': 'import programas_utiles as pu\npu.cargar_datos',
+    'graficas': 'import programas_utiles as pu\npu.grafica_opcion',
+}
+
+# Paquetes pesados de los que se informa si se han cargado o no
+PESADOS = ('numpy', 'pandas', 'scipy', 'matplotlib', 'sympy')
+
+_LINEA = re.compile(r'import time:\s+(\d+)\s*\|\s+(\d+)\s*\|(\s*)(\S+)')
+
+
+def medir_importaciones(codigo, carpeta=CARPETA):
+    """Ejecuta el código con -X importtime en un proceso nuevo.
+
+    Devuelve un diccionario con el tiempo total del proceso (s) y la lista de
+    módulos importados como (nombre, propio_us, acumulado_us, nivel).
+    """
+    t0 = time.perf_counter()
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', codigo],
+                             cwd=carpeta, capture_output=True, text=True)
+    t_total = time.perf_counter() - t0
+    if proceso.returncode != 0:
+        ultima = proceso.stderr.strip().splitlines()[-1] if proceso.stderr.strip() else ''
+        raise RuntimeError(f"El escenario ha fallado: {ultima}")
+
+    modulos = []
+    for linea in proceso.stderr.splitlines():
+        coincidencia = _LINEA.match(linea)
+        if coincidencia:
+            propio, acumulado, sangria, nombre = coincidencia.groups()
+            # -X importtime sangra dos espacios por nivel de anidamiento
+            modulos.append((nombre, int(propio), int(acumulado), (len(sangria) - 1) // 2))
+    return {'t_total': t_total, 'modulos': modulos}
+
+
+def resumir(medida, n_detalle=10):
+    """Tiempo total, tiempo de importación, paquetes pesados cargados y los n módulos de primer nivel más lentos."""
+    primer_nivel = [m for m in medida['modulos'] if m[3] == 0]
+    cargados = {m[0].split('.')[0] for m in medida['modulos']}
+    return {
+        't_total': medida['t_total'],
+        't_importacion': sum(m[2] for m in primer_nivel) / 1e6,
+        'pesados': [p for p in PESADOS if p in cargados],
+        'mas_lentos': [(m[0], m[2] / 1e6) for m in sorted(primer_nivel, key=lambda m: -m[2])[:n_detalle]],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Tiempo de importación de cada escenario (como -X importtime).')
+    parser.add_argument('escenarios', nargs='*', default=list(ESCENARIOS), help=f'De entre: {", ".join(ESCENARIOS)}')
+    parser.add_argument('--detalle', type=int, default=5, help='Módulos de primer nivel más lentos que se muestran')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Se toma la mejor de varias ejecuciones')
+    args = parser.parse_args(argv)
+
+    print(f"{'escenario':<14} {'total (s)':>10} {'imports (s)':>12}  librerías cargadas")
+    for escenario in args.escenarios:
+        resumenes = [resumir(medir_importaciones(ESCENARIOS[escenario]), args.detalle)
+                     for _ in range(args.repeticiones)]
+        resumen = min(resumenes, key=lambda r: r['t_total'])
+        print(f"{escenario:<14} {resumen['t_total']:>10.3f} {resumen['t_importacion']:>12.3f}  "
+              f"{', '.join(resumen['pesados']) or '-'}")
+        for nombre, t in resumen['mas_lentos']:
+            print(f"{'':<16}{t:>9.3f}  {nombre}")
+
+
+if __name__ == '__main__':
+    main()
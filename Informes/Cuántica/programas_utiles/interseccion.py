@@ -0,0 +1,164 @@
+# Opción 4 para muchas curvas a la vez: cada curva son dos tramos rectos
+# (ordenados en x) y se busca el punto de corte entre ellos, se ajusta una recta
+# a cada tramo y se calcula su intersección con su matriz de covarianza.
+#
+# El punto de separación de los dos conjuntos se detecta solo, probando todos
+# los cortes posibles de todas las curvas a la vez: con sumas acumuladas de
+# w, wx, wy, wx², wxy, wy² el chi² de la recta de cada lado sale en forma
+# cerrada para cada corte, y se elige el que minimiza el chi² total.
+#
+# Las curvas se pasan como arrays 2-D (n_curvas, n_puntos); si tienen distinto
+# número de puntos se rellenan al final y se da la máscara de puntos válidos
+# (ver minimos_cuadrados.apilar).
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .minimos_cuadrados import minimos_cuadrados_lote
+
+
+def _como_2d(*arrays):
+    return [np.atleast_2d(np.asarray(a, dtype=float)) for a in arrays]
+
+
+def detectar_corte(x, y, dy, mascara=None, minimo=2):
+    """Número de puntos del primer conjunto de cada curva (el corte de menor chi² total).
+
+    minimo es el número mínimo de puntos en cada tramo. Devuelve (corte, chi2)
+    con un valor por curva.
+    """
+    x, y, dy = _como_2d(x, y, dy)
+    if mascara is None:
+        mascara = ~(np.isnan(x) | np.isnan(y) | np.isnan(dy))
+    mascara = np.atleast_2d(np.asarray(mascara, dtype=bool))
+    n_validos = mascara.sum(axis=1)
+
+    # Centrar x e y en cada curva no cambia el chi² y evita perder precisión
+    # al restar sumas acumuladas grandes
+    w = np.where(mascara, 1 / np.where(mascara, dy, 1.)**2, 0.)
+    xc = np.where(mascara, x, 0.)
+    yc = np.where(mascara, y, 0.)
+    xc = np.where(mascara, xc - xc.sum(axis=1, keepdims=True) / n_validos[:, None], 0.)
+    yc = np.where(mascara, yc - yc.sum(axis=1, keepdims=True) / n_validos[:, None], 0.)
+
+    # Sumas acumuladas: la columna k tiene las sumas de los k+1 primeros puntos
+    sumas = [np.cumsum(v, axis=1) for v in (w, w*xc, w*yc, w*xc**2, w*xc*yc, w*yc**2)]
+    cuenta = np.cumsum(mascara, axis=1)
+
+    def chi2_recta(S, Sx, Sy, Sxx, Sxy, Syy):
+        # Mínimo de sum(w (y - a x - b)²) para la recta de mínimos cuadrados
+        Delta = S * Sxx - Sx**2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return Syy - (Sxx * Sy**2 - 2 * Sx * Sy * Sxy + S * Sxy**2) / Delta
+
+    izquierda = [s[:, :-1] for s in sumas]
+    derecha = [s[:, -1:] - s[:, :-1] for s in sumas]
+    chi2 = chi2_recta(*izquierda) + chi2_recta(*derecha)
+
+    # Cortes con menos de 'minimo' puntos válidos a algún lado no cuentan
+    n_izquierda = cuenta[:, :-1]
+    validos = (n_izquierda >= minimo) & (n_validos[:, None] - n_izquierda >= minimo)
+    chi2 = np.where(validos & np.isfinite(chi2), chi2, np.inf)
+    if not np.isfinite(chi2.min(axis=1)).all():
+        raise ValueError(f"Hay curvas sin cortes válidos (hacen falta al menos {minimo} puntos en cada tramo)")
+
+    k = np.argmin(chi2, axis=1)
+    # El corte k (índice de columna) deja k+1 posiciones a la izquierda;
+    # se devuelve como número de puntos válidos, igual que la opción 4
+    filas = np.arange(len(k))
+    return n_izquierda[filas, k], chi2[filas, k]
+
+
+def _indices_corte(mascara, corte):
+    # Máscaras del primer y segundo conjunto a partir del número de puntos válidos del primero
+    posicion = np.cumsum(mascara, axis=1)
+    primero = mascara & (posicion <= corte[:, None])
+    return primero, mascara & ~primero
+
+
+def intersecciones_lote(x, y, dx, dy, mascara=None, corte=None, minimo=2, iteraciones=3):
+    """Ajusta dos rectas a cada curva y calcula su intersección y covarianza.
+
+    Si no se da corte (número de puntos del primer conjunto, uno por curva o
+    uno común) se detecta con detectar_corte. Las rectas se ajustan con la
+    varianza efectiva dy² + (a·dx)², recalculada 'iteraciones' veces, que
+    tiene en cuenta las incertidumbres en x como el ajuste ODR del menú.
+
+    Devuelve un diccionario de arrays (uno por curva) con corte, a1, sigma_a1,
+    b1, sigma_b1, a2, ..., x_int, sigma_x_int, y_int, sigma_y_int y cov_xy_int.
+    """
+    x, y, dx, dy = _como_2d(x, y, dx, dy)
+    if mascara is None:
+        mascara = ~(np.isnan(x) | np.isnan(y) | np.isnan(dx) | np.isnan(dy))
+    mascara = np.atleast_2d(np.asarray(mascara, dtype=bool))
+    dx = np.where(mascara, dx, 0.)
+
+    if corte is None:
+        corte, _ = detectar_corte(x, y, dy, mascara, minimo)
+    corte = np.broadcast_to(np.asarray(corte, dtype=int), (x.shape[0],))
+    primero, segundo = _indices_corte(mascara, corte)
+
+    sigma1 = sigma2 = dy
+    for _ in range(iteraciones + 1):
+        r1 = minimos_cuadrados_lote(x, y, sigma1, primero)
+        r2 = minimos_cuadrados_lote(x, y, sigma2, segundo)
+        sigma1 = np.sqrt(dy**2 + (r1['a'][:, None] * dx)**2)
+        sigma2 = np.sqrt(dy**2 + (r2['a'][:, None] * dx)**2)
+
+    a1, b1, a2, b2 = r1['a'], r1['b'], r2['a'], r2['b']
+    denom = a1 - a2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_int = (b2 - b1) / denom
+    y_int = a1 * x_int + b1
+
+    # Propagación de errores (primer orden), derivadas respecto a (a1, b1, a2, b2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        da1 = (b1 - b2) / denom**2
+        db1 = -1 / denom
+    grad_x = np.stack([da1, db1, -da1, -db1], axis=1)
+    grad_y = a1[:, None] * grad_x + np.stack([x_int, np.ones_like(x_int), 0*x_int, 0*x_int], axis=1)
+    jac = np.stack([grad_x, grad_y], axis=1)    # (n_curvas, 2, 4)
+
+    cov = np.zeros((len(a1), 4, 4))
+    cov[:, 0, 0], cov[:, 1, 1], cov[:, 0, 1] = r1['sigma_a']**2, r1['sigma_b']**2, r1['cov_ab']
+    cov[:, 2, 2], cov[:, 3, 3], cov[:, 2, 3] = r2['sigma_a']**2, r2['sigma_b']**2, r2['cov_ab']
+    cov[:, 1, 0], cov[:, 3, 2] = cov[:, 0, 1], cov[:, 2, 3]
+    cov_int = jac @ cov @ jac.transpose(0, 2, 1)
+
+    return {
+        'corte': corte,
+        'a1': a1, 'sigma_a1': r1['sigma_a'], 'b1': b1, 'sigma_b1': r1['sigma_b'],
+        'a2': a2, 'sigma_a2': r2['sigma_a'], 'b2': b2, 'sigma_b2': r2['sigma_b'],
+        'chi2_1': r1['chi2'], 'chi2_2': r2['chi2'],
+        'x_int': x_int, 'sigma_x_int': np.sqrt(cov_int[:, 0, 0]),
+        'y_int': y_int, 'sigma_y_int': np.sqrt(cov_int[:, 1, 1]),
+        'cov_xy_int': cov_int[:, 0, 1],
+    }
+
+
+def _bloque(args):
+    return intersecciones_lote(*args)
+
+
+def intersecciones_paralelo(x, y, dx, dy, mascara=None, corte=None, minimo=2, iteraciones=3,
+                            procesos=None, tamano_bloque=10000):
+    """Como intersecciones_lote, repartiendo bloques de curvas entre procesos."""
+    x, y, dx, dy = _como_2d(x, y, dx, dy)
+    if mascara is None:
+        mascara = ~(np.isnan(x) | np.isnan(y) | np.isnan(dx) | np.isnan(dy))
+    n = x.shape[0]
+    if corte is not None:
+        corte = np.broadcast_to(np.asarray(corte, dtype=int), (n,))
+    if procesos == 1 or n <= tamano_bloque:
+        return intersecciones_lote(x, y, dx, dy, mascara, corte, minimo, iteraciones)
+
+    tareas = [
+        (x[i:i + tamano_bloque], y[i:i + tamano_bloque], dx[i:i + tamano_bloque], dy[i:i + tamano_bloque],
+         mascara[i:i + tamano_bloque], None if corte is None else corte[i:i + tamano_bloque], minimo, iteraciones)
+        for i in range(0, n, tamano_bloque)
+    ]
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count()) as executor:
+        resultados = list(executor.map(_bloque, tareas))
+    return {clave: np.concatenate([r[clave] for r in resultados]) for clave in resultados[0]}
@@ -0,0 +1,117 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+# Columnas que usan las opciones 1 a 6, la opción 7 solo necesita x e y
+COLUMNAS = ['x', 'y', 'dx', 'dy']
+COLUMNAS_SPLINE = ['x', 'y']
+
+# Carpeta de los archivos .npy con los datos ya leídos. Se puede cambiar con la
+# variable de entorno PROGRAMAS_UTILES_CACHE.
+CARPETA_CACHE = os.environ.get(
+    'PROGRAMAS_UTILES_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'programas_utiles', 'datos'))
+
+# Máximo de archivos en la caché; al pasarlo se borran los usados hace más tiempo
+MAX_ARCHIVOS_CACHE = 256
+
+
+def leer_csv(file_name, delimitador=',', decimal='.', columnas=COLUMNAS):
+    """Lee un archivo de datos .csv con la misma estructura que espera el menú."""
+    # usecols hace que las primeras columnas sean siempre x, y, ... aunque el
+    # archivo tenga más columnas de las que se piden
+    return pd.read_csv(file_name, delimiter=delimitador, header=0, names=columnas,
+                       usecols=range(len(columnas)), decimal=decimal)
+
+
+def _nombres_cache(file_name, delimitador, decimal, columnas):
+    # El prefijo depende de la ruta y de cómo se lee, y el resto de la versión
+    # del archivo; así se reconocen las versiones viejas de una misma lectura
+    ruta = os.path.abspath(file_name)
+    info = os.stat(ruta)
+    lectura = repr((ruta, delimitador, decimal, list(columnas)))
+    version = repr((info.st_mtime_ns, info.st_size))
+    prefijo = hashlib.sha1(lectura.encode('utf-8')).hexdigest()[:16]
+    return prefijo, f"{prefijo}_{hashlib.sha1(version.encode('utf-8')).hexdigest()[:16]}.npy"
+
+
+def _limpiar_cache(carpeta, prefijo, actual, max_archivos):
+    # Borra las versiones viejas del mismo archivo y, si hay demasiados, los
+    # menos usados recientemente (el tiempo de modificación marca el último uso)
+    # Varios procesos pueden estar limpiando a la vez, por eso se ignoran los
+    # archivos que ya ha borrado otro (o que no se pueden borrar: la caché no
+    # debe hacer fallar la lectura)
+    sidecars = []
+    for nombre in os.listdir(carpeta):
+        if not nombre.endswith('.npy'):
+            continue
+        ruta = os.path.join(carpeta, nombre)
+        try:
+            if nombre.startswith(prefijo) and nombre != actual:
+                os.remove(ruta)
+            else:
+                sidecars.append((os.stat(ruta).st_mtime, ruta))
+        except OSError:
+            pass
+    sidecars.sort()
+    for _, ruta in sidecars[:max(0, len(sidecars) - max_archivos)]:
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+
+
+def _tabla(valores, columnas):
+    # DataFrame de solo lectura sobre los valores, sin copiarlos
+    return pd.DataFrame(valores, columns=columnas, copy=False)
+
+
+def cargar_datos(file_name, delimitador=',', decimal='.', columnas=COLUMNAS,
+                 carpeta_cache=None, max_archivos=MAX_ARCHIVOS_CACHE):
+    """Como leer_csv, pero guarda las columnas en un .npy y las siguientes veces lo abre como memmap.
+
+    La caché se identifica por (ruta, fecha de modificación, tamaño, delimitador,
+    decimal, columnas), así que si el archivo cambia se vuelve a leer. Tanto
+    si estaba en la caché como si no, las columnas son float64 y de solo
+    lectura. Con carpeta_cache=False no se usa la caché (y se devuelve lo que
+    da leer_csv); si las columnas no son numéricas tampoco.
+    """
+    if carpeta_cache is False:
+        return leer_csv(file_name, delimitador, decimal, columnas)
+    carpeta = carpeta_cache or CARPETA_CACHE
+    prefijo, nombre = _nombres_cache(file_name, delimitador, decimal, columnas)
+    ruta_npy = os.path.join(carpeta, nombre)
+
+    try:
+        valores = np.load(ruta_npy, mmap_mode='r')
+        os.utime(ruta_npy)   # Marca el uso para el orden LRU
+        return _tabla(valores, columnas)
+    except FileNotFoundError:
+        pass
+
+    data = leer_csv(file_name, delimitador, decimal, columnas)
+    try:
+        valores = data.to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        # Columnas no numéricas: no se pueden guardar como .npy de floats
+        return data
+    valores.setflags(write=False)
+    # Se escribe a un temporal y se renombra, para que otro proceso nunca
+    # abra un .npy a medio escribir
+    temporal = f"{ruta_npy}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(carpeta, exist_ok=True)
+        with open(temporal, 'wb') as f:
+            np.save(f, valores)
+        os.replace(temporal, ruta_npy)
+    except OSError:
+        # Sin caché (carpeta sin permisos, disco lleno, ...) los datos valen igual
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        return _tabla(valores, columnas)
+    _limpiar_cache(carpeta, prefijo, nombre, max_archivos)
+    return _tabla(valores, columnas)
@@ -0,0 +1,101 @@
+# Ajuste por mínimos cuadrados ponderados de modelos lineales en sus parámetros
+# (y = a*x, y = a*x + b, y = a*x² + b*x + c, ...) sin iterar: se resuelve el
+# problema con las ecuaciones normales (o una factorización QR) de la matriz
+# de diseño ponderada.
+# Da el mismo popt y pcov que curve_fit(..., absolute_sigma=True) para estos
+# modelos; curve_fit solo se usa cuando el modelo no es lineal.
+
+import numpy as np
+
+
+def matriz_ampliada(x, y, sigma, potencias):
+    """Matriz [A | b] ponderada: columnas x**k / sigma y la última y / sigma.
+
+    x se divide antes por max|x| para que las columnas tengan tamaños
+    parecidos; devuelve también ese factor de escala.
+    """
+    x = np.asarray(x, dtype=float)
+    w = 1 / np.asarray(sigma, dtype=float)
+    escala_x = np.max(np.abs(x)) if len(x) else 1.
+    if escala_x == 0:
+        escala_x = 1.
+    xs = x / escala_x
+
+    # Todo en un único bloque de memoria, sin arrays intermedios por columna
+    M = np.empty((len(x), len(potencias) + 1))
+    for j, k in enumerate(potencias):
+        if k == 0:
+            M[:, j] = w
+        else:
+            np.multiply(xs**k if k != 1 else xs, w, out=M[:, j])
+    np.multiply(np.asarray(y, dtype=float), w, out=M[:, -1])
+    return M, escala_x
+
+
+def ajuste_polinomico(x, y, sigma, potencias, metodo='normales'):
+    """Ajuste ponderado de y = sum(p_j * x**potencias[j]).
+
+    Devuelve (popt, pcov) con la semántica de absolute_sigma=True. Con
+    metodo='normales' se resuelven las ecuaciones normales (una sola
+    multiplicación de matrices, lo más rápido para pocos parámetros); con
+    metodo='qr' se factoriza la matriz de diseño (más estable si el
+    problema está mal condicionado).
+    """
+    M, escala_x = matriz_ampliada(x, y, sigma, potencias)
+    n_par = len(potencias)
+
+    if metodo == 'normales':
+        # M^T M contiene A^T A y A^T b a la vez
+        G = M.T @ M
+        ATA = G[:n_par, :n_par]
+        popt = np.linalg.solve(ATA, G[:n_par, n_par])
+        pcov = np.linalg.inv(ATA)
+    elif metodo == 'qr':
+        # Factorizar [A | b] da R y Q^T b a la vez sin tener que formar Q
+        R_ampliada = np.linalg.qr(M, mode='r')
+        R = R_ampliada[:n_par, :n_par]
+        popt = np.linalg.solve(R, R_ampliada[:n_par, n_par])
+        R_inv = np.linalg.inv(R)
+        pcov = R_inv @ R_inv.T
+    else:
+        raise ValueError(f"Método no válido: {metodo} (usa 'normales' o 'qr')")
+
+    # Deshacer el cambio de escala de x: p_j * (x/s)**k = (p_j / s**k) * x**k
+    factor = escala_x ** np.asarray(potencias, dtype=float)
+    popt = popt / factor
+    pcov = pcov / np.outer(factor, factor)
+    return popt, pcov
+
+
+def ajustar(func, x, y, sigma, potencias=None, metodo='normales', **kwargs):
+    """Ajusta func a los datos: analíticamente si se dan sus potencias, con curve_fit si no."""
+    if potencias is not None:
+        return ajuste_polinomico(x, y, sigma, potencias, metodo)
+    from scipy.optimize import curve_fit
+
+    kwargs.setdefault('maxfev', 10000)
+    return curve_fit(func, x, y, sigma=sigma, absolute_sigma=True, **kwargs)
+
+
+def ajuste_polinomico_lote(x, y, sigma, potencias):
+    """Como ajuste_polinomico (ecuaciones normales) para muchos conjuntos a la vez.
+
+    x, y y sigma tienen forma (n_conjuntos, n_puntos); devuelve popt de forma
+    (n_conjuntos, n_par) y pcov de forma (n_conjuntos, n_par, n_par).
+    """
+    x = np.asarray(x, dtype=float)
+    w = 1 / np.asarray(sigma, dtype=float)
+    escala_x = np.max(np.abs(x)) if x.size else 1.
+    if escala_x == 0:
+        escala_x = 1.
+    xs = x / escala_x
+
+    A = np.stack([w * xs**k for k in potencias], axis=-1)
+    b = np.asarray(y, dtype=float) * w
+    ATA = np.einsum('nmi,nmj->nij', A, A)
+    ATb = np.einsum('nmi,nm->ni', A, b)
+    popt = np.linalg.solve(ATA, ATb[..., None])[..., 0]
+    pcov = np.linalg.inv(ATA)
+
+    factor = escala_x ** np.asarray(potencias, dtype=float)
+    return popt / factor, pcov / np.outer(factor, factor)
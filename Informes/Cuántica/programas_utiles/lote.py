@@ -0,0 +1,248 @@
+# Modo por lotes del menú de ProgramasUtiles.py: ejecuta una opción (1 a 8)
+# sobre una lista o un patrón de archivos .csv sin hacer ninguna pregunta y
+# repartiendo los archivos entre varios procesos. Se escribe un resultado por
+# archivo (una línea JSON por archivo) en el archivo de salida.
+#
+# Ejemplo (desde Informes/Cuántica):
+#   python -m programas_utiles.lote 5 "P1/*.csv" --salida resultados.jsonl
+#   python -m programas_utiles.lote 2 P3/Datos.csv --delimitador '\t' --graficas graficas/
+#   python -m programas_utiles.lote 8 P5/Datos/datos.csv --delimitador '\t' --decimal , --expresion 'a*((x**2)/(x**2-4))'
+
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')   # Sin ventanas: las gráficas solo se guardan en archivo
+
+from .lectura import cargar_datos, COLUMNAS, COLUMNAS_SPLINE
+from .opciones import OPCIONES
+
+
+def expandir_archivos(patrones):
+    """Devuelve los archivos que casan con cada patrón, sin repetir y en orden."""
+    archivos = []
+    for patron in patrones:
+        encontrados = sorted(glob.glob(patron))
+        if not encontrados and os.path.isfile(patron):
+            encontrados = [patron]
+        for archivo in encontrados:
+            if archivo not in archivos:
+                archivos.append(archivo)
+    return archivos
+
+
+def _leer(tarea):
+    columnas = COLUMNAS_SPLINE if tarea['opcion'] == 7 else COLUMNAS
+    return cargar_datos(tarea['archivo'], tarea['delimitador'], tarea['decimal'], columnas,
+                        carpeta_cache=None if tarea['cache'] else False)
+
+
+def _calcular(tarea, data, base):
+    # Resultado de la opción y, si se piden réplicas, su remuestreo
+    opcion = tarea['opcion']
+    if opcion == 4:
+        # Sin --corte el primer conjunto se detecta solo en cada archivo
+        resultado = OPCIONES[4](data, tarea['corte'])
+    elif opcion == 8:
+        if not tarea['expresion']:
+            raise ValueError("La opción 8 necesita --expresion (modelo a ajustar, p. ej. 'a*exp(-k*x)')")
+        resultado = OPCIONES[8](data, tarea['expresion'], tarea['p0'])
+    elif opcion == 7:
+        carpeta = tarea['graficas'] or os.path.dirname(tarea['archivo'])
+        tabla = tarea['tabla_tramos']
+        resultado = OPCIONES[7](data, os.path.join(carpeta, f'{base}_spline_tramos.txt'),
+                                os.path.join(carpeta, f'{base}_spline_tramos.{tabla}') if tabla else None)
+    else:
+        resultado = OPCIONES[opcion](data)
+
+    if tarea['replicas'] and opcion not in (7, 8):
+        from .remuestreo import remuestrear
+
+        # Cada archivo ya va en su propio proceso, las réplicas no se reparten más
+        resultado['remuestreo'] = remuestrear(opcion, data, tarea['replicas'], tarea['modo_remuestreo'],
+                                              tarea['semilla'], resultado.get('n_primer_conjunto'), procesos=1)
+    return resultado
+
+
+def _clave(tarea):
+    # Todo lo que cambia el resultado además de los datos (ver memoria.py)
+    from .memoria import clave_ajuste
+
+    ajustes = {clave: tarea[clave] for clave in ('delimitador', 'decimal', 'corte', 'expresion', 'p0')}
+    if tarea['replicas']:
+        ajustes.update({clave: tarea[clave] for clave in ('replicas', 'modo_remuestreo', 'semilla')})
+    return clave_ajuste(tarea['archivo'], tarea['opcion'], **ajustes)
+
+
+def procesar_archivo(tarea, escritor=None):
+    """Ejecuta una opción sobre un archivo y devuelve su registro de resultados.
+
+    Con la caché activada, si el mismo archivo (por contenido) ya se ajustó
+    con la misma opción y ajustes se reutiliza el resultado guardado sin leer
+    el archivo ni ajustar (salvo la opción 7, cuyo resultado es el archivo de
+    tramos, que siempre se calcula).
+    """
+    opcion = tarea['opcion']
+    archivo = tarea['archivo']
+    registro = {'archivo': archivo, 'opcion': opcion}
+    try:
+        base = os.path.splitext(os.path.basename(archivo))[0]
+        memorizar = tarea['cache'] and opcion != 7
+        resultado = data = None
+
+        t0 = time.perf_counter()
+        if memorizar:
+            from .memoria import leer_resultado, guardar_resultado
+
+            clave = _clave(tarea)
+            resultado = leer_resultado(clave)
+        registro['memorizado'] = resultado is not None
+        if resultado is None:
+            data = _leer(tarea)
+            resultado = _calcular(tarea, data, base)
+            if memorizar:
+                guardar_resultado(clave, resultado)
+        registro.update(resultado)
+        registro['t_calculo'] = time.perf_counter() - t0
+
+        if tarea['graficas']:
+            from .graficas import grafica_opcion
+
+            if data is None:
+                data = _leer(tarea)
+            nombre_graf = os.path.join(tarea['graficas'], f'{base}_opcion{opcion}.{tarea["formato"]}')
+            t0 = time.perf_counter()
+            grafica_opcion(opcion, data, resultado, nombre_graf, tarea['unidad_ejex'], tarea['unidad_ejey'], escritor)
+            registro['t_construccion'] = time.perf_counter() - t0
+            registro['grafica'] = nombre_graf
+    except Exception as e:
+        # Un archivo malo no debe parar el lote completo
+        registro['error'] = f"{type(e).__name__}: {e}"
+    return registro
+
+
+def procesar_bloque(tareas):
+    """Procesa varios archivos seguidos en un mismo proceso.
+
+    Las gráficas se guardan en un hilo aparte (EscritorGraficas), de modo que
+    el ajuste del archivo siguiente se calcula mientras se escribe la anterior.
+    """
+    if not any(tarea['graficas'] for tarea in tareas):
+        return [procesar_archivo(tarea) for tarea in tareas]
+
+    from .render import EscritorGraficas
+
+    with EscritorGraficas() as escritor:
+        registros = [procesar_archivo(tarea, escritor) for tarea in tareas]
+
+    # Al salir del with ya están escritas todas, se añaden sus tiempos
+    for registro in registros:
+        nombre_graf = registro.get('grafica')
+        if nombre_graf in escritor.errores:
+            registro['error'] = escritor.errores[nombre_graf]
+        elif nombre_graf in escritor.tiempos:
+            registro['t_dibujo'], registro['t_guardado'] = escritor.tiempos[nombre_graf]
+    return registros
+
+
+def ejecutar_lote(opcion, archivos, delimitador=',', decimal='.', corte=None, graficas=None,
+                  formato='png', unidad_ejex='', unidad_ejey='', procesos=None, cache=True,
+                  replicas=0, modo_remuestreo='montecarlo', semilla=0, expresion=None, p0=None,
+                  tabla_tramos=None):
+    """Ejecuta la opción sobre todos los archivos en paralelo y devuelve los registros en orden."""
+    if opcion not in OPCIONES:
+        raise ValueError(f"Opción no válida: {opcion} (debe estar entre 1 y 8)")
+    if graficas:
+        os.makedirs(graficas, exist_ok=True)
+
+    tareas = [
+        {
+            'opcion': opcion, 'archivo': archivo, 'delimitador': delimitador,
+            'decimal': decimal, 'corte': corte, 'graficas': graficas, 'formato': formato,
+            'unidad_ejex': unidad_ejex, 'unidad_ejey': unidad_ejey, 'cache': cache,
+            'replicas': replicas, 'modo_remuestreo': modo_remuestreo, 'semilla': semilla,
+            'expresion': expresion, 'p0': p0, 'tabla_tramos': tabla_tramos,
+        }
+        for archivo in archivos
+    ]
+    if procesos == 1 or len(tareas) <= 1:
+        return procesar_bloque(tareas)
+
+    procesos = procesos or os.cpu_count() or 1
+    # Bloques de archivos consecutivos, varios por proceso para repartir bien la
+    # carga sin pagar la comunicación entre procesos por cada archivo
+    tamano = max(1, -(-len(tareas) // (4 * procesos)))
+    bloques = [tareas[i:i + tamano] for i in range(0, len(tareas), tamano)]
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        # map conserva el orden de los archivos de entrada
+        return [registro for registros in executor.map(procesar_bloque, bloques) for registro in registros]
+
+
+def escribir_registros(registros, salida):
+    """Guarda un registro JSON por línea."""
+    with open(salida, 'w', encoding='utf-8') as f:
+        for registro in registros:
+            f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+
+def _leer_delimitador(texto):
+    # Permite escribir '\t' en la línea de comandos para el tabulador
+    return texto.encode('utf-8').decode('unicode_escape')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ejecuta una opción de ProgramasUtiles sobre muchos archivos sin preguntas.')
+    parser.add_argument('opcion', type=int, choices=sorted(OPCIONES), help='Número de la opción del menú (1-8)')
+    parser.add_argument('archivos', nargs='+', help='Archivos .csv o patrones tipo "Datos/*.csv"')
+    parser.add_argument('--delimitador', default=',', help="Delimitador de columnas (',' por defecto, '\\t' para tabulador)")
+    parser.add_argument('--decimal', default='.', help="Separador decimal ('.' por defecto)")
+    parser.add_argument('--corte', type=int, default=None, help='Opción 4: número de puntos en el primer conjunto (por defecto se detecta solo)')
+    parser.add_argument('--expresion', default=None, help="Opción 8: modelo a ajustar en función de x, p. ej. 'a*((x**2)/(x**2-4))'")
+    parser.add_argument('--p0', type=float, nargs='+', default=None,
+                        help='Opción 8: valores iniciales de los parámetros (en orden alfabético de sus nombres)')
+    parser.add_argument('--tabla-tramos', choices=['npz', 'csv'], default=None,
+                        help='Opción 7: guardar también la tabla de coeficientes de los tramos en .npz o .csv')
+    parser.add_argument('--graficas', default=None, help='Carpeta donde guardar las gráficas (si no se indica no se dibujan)')
+    parser.add_argument('--formato', default='png', help='Formato de las gráficas (png, pdf, ...)')
+    parser.add_argument('--unidad-ejex', default='', help='Etiqueta del eje x')
+    parser.add_argument('--unidad-ejey', default='', help='Etiqueta del eje y')
+    parser.add_argument('--procesos', type=int, default=None, help='Número de procesos (por defecto, uno por núcleo)')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='Leer y ajustar siempre, sin usar la caché de datos leídos ni la de resultados')
+    parser.add_argument('--replicas', type=int, default=0,
+                        help='Número de réplicas para estimar las incertidumbres por remuestreo (opciones 1-6)')
+    parser.add_argument('--modo-remuestreo', choices=['montecarlo', 'bootstrap'], default='montecarlo',
+                        help='montecarlo: perturba x e y con dx, dy; bootstrap: remuestrea las filas')
+    parser.add_argument('--semilla', type=int, default=0, help='Semilla del generador aleatorio del remuestreo')
+    parser.add_argument('--salida', default='resultados.jsonl', help='Archivo de resultados (una línea JSON por archivo)')
+    args = parser.parse_args(argv)
+
+    archivos = expandir_archivos(args.archivos)
+    if not archivos:
+        parser.error('No se ha encontrado ningún archivo')
+
+    registros = ejecutar_lote(args.opcion, archivos, _leer_delimitador(args.delimitador), args.decimal,
+                              args.corte, args.graficas, args.formato, args.unidad_ejex, args.unidad_ejey,
+                              args.procesos, args.cache, args.replicas, args.modo_remuestreo, args.semilla,
+                              args.expresion, args.p0, args.tabla_tramos)
+    escribir_registros(registros, args.salida)
+
+    errores = sum('error' in registro for registro in registros)
+    memorizados = sum(bool(registro.get('memorizado')) for registro in registros)
+    print(f"{len(registros)} archivos procesados ({errores} con error, {memorizados} con el resultado "
+          f"ya guardado), resultados en {args.salida}")
+    if args.graficas:
+        # Tiempos sumados de todas las gráficas, por etapa
+        tiempos = {clave: sum(registro.get(clave, 0.) for registro in registros)
+                   for clave in ('t_calculo', 't_construccion', 't_dibujo', 't_guardado')}
+        print("Tiempo total (s): cálculo {t_calculo:.3f}, construcción de figuras {t_construccion:.3f}, "
+              "dibujo {t_dibujo:.3f}, guardado {t_guardado:.3f}".format(**tiempos))
+    return 0 if errores == 0 else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
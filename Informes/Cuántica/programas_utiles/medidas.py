@@ -0,0 +1,124 @@
+# Lectura de las medidas de P4 (curvas I-V del Franck-Hertz). Cada archivo
+# tiene tres líneas de cabecera y luego cinco columnas separadas por
+# tabuladores con coma decimal:
+#   U1/V  IA/nA  U2/V  U3/V  UH/V
+# U1 e IA son la curva; U2, U3 y UH son los ajustes del aparato, constantes en
+# toda la medida.
+#
+# En vez de partir y convertir cada línea en Python, se lee el archivo como
+# bytes y se convierte todo a la vez con numpy: se localizan los números
+# (tramos de bytes entre espacios en blanco) y se recorren todos en paralelo,
+# una cifra por vuelta (los números tienen pocas cifras), acumulando el valor
+# en un array float64 reservado de antemano. La coma y el punto decimal valen
+# igual, así que no hace falta traducir las comas. Cada número avanza solo
+# mientras no ha terminado, y el buffer lleva blancos de relleno al final.
+
+import os
+
+import numpy as np
+
+LINEAS_CABECERA = 3
+N_COLUMNAS = 5
+COLUMNAS = ('U1', 'IA', 'U2', 'U3', 'UH')
+
+_COMA_A_PUNTO = bytes.maketrans(b',', b'.')
+_POTENCIAS_10 = 10.0 ** np.arange(23)
+
+
+def convertir_decimales(texto):
+    """Array float64 con los números de un texto separados por espacios en blanco.
+
+    Acepta coma o punto decimal y signo (+ o -) delante. Con exponentes, letras
+    o números de más de 15 cifras se convierte número a número, más lento. Un
+    número mal formado (signo en medio, dos separadores decimales, sin
+    cifras u otros símbolos) da ValueError.
+    """
+    b = np.frombuffer(texto + b' ', np.uint8)
+    blanco = b <= 32
+    bordes = np.flatnonzero(blanco[:-1] != blanco[1:]) + 1
+    if not blanco[0]:
+        bordes = np.concatenate([[0], bordes])
+    inicio = bordes[0::2]   # Primer byte de cada número
+    largos = bordes[1::2] - inicio
+    # Letras (exponentes, nan, ...) o más cifras de las que un float64 guarda exactas
+    if np.any(b > 57) or np.any(largos > 16):
+        return np.array(texto.translate(_COMA_A_PUNTO).split(), dtype=float)
+    if len(inicio) == 0:
+        return np.zeros(0)
+    # Relleno con blancos: el número más largo se termina de leer sin salirse del buffer
+    b = np.concatenate([b, np.full(largos.max(), 32, dtype=np.uint8)])
+
+    pos = inicio.copy()
+    valor = np.zeros(len(pos))
+    n_decimales = np.zeros(len(pos), dtype=np.intp)
+    n_cifras = np.zeros(len(pos), dtype=np.intp)
+    n_separadores = np.zeros(len(pos), dtype=np.intp)
+    activo = np.ones(len(pos), dtype=bool)
+    tras_coma = np.zeros(len(pos), dtype=bool)
+    negativo = np.zeros(len(pos), dtype=bool)
+    mal = np.zeros(len(pos), dtype=bool)
+    while True:
+        c = np.take(b, pos)
+        activo &= c > 32        # Un blanco termina el número
+        if not activo.any():
+            break
+        cifra = c - np.uint8(48)
+        es_cifra = (cifra < 10) & activo
+        es_separador = ((c == 44) | (c == 46)) & activo
+        es_signo = ((c == 43) | (c == 45)) & activo
+        valor *= np.where(es_cifra, 10., 1.)
+        valor += cifra * es_cifra
+        n_decimales += es_cifra & tras_coma
+        n_cifras += es_cifra
+        n_separadores += es_separador
+        tras_coma |= es_separador
+        negativo |= (c == 45) & activo
+        # El signo solo puede ir delante; cualquier otro símbolo no vale
+        mal |= (es_signo & (pos != inicio)) | (activo & ~(es_cifra | es_separador | es_signo))
+        pos += activo
+    mal |= (n_separadores > 1) | (n_cifras == 0)
+    if mal.any():
+        i = np.flatnonzero(mal)[0]
+        token = texto[inicio[i]:inicio[i] + largos[i]].decode('latin-1')
+        raise ValueError(f"Número mal formado: {token!r}")
+    valor /= _POTENCIAS_10[n_decimales]
+    np.negative(valor, out=valor, where=negativo)
+    return valor
+
+
+def leer_tabla(ruta, lineas_cabecera=LINEAS_CABECERA):
+    """Array (n, 5) con las columnas U1, IA, U2, U3, UH de un archivo de medidas."""
+    with open(ruta, 'rb') as f:
+        contenido = f.read()
+    inicio = 0
+    for _ in range(lineas_cabecera):
+        inicio = contenido.index(b'\n', inicio) + 1
+    valores = convertir_decimales(contenido[inicio:])
+    if len(valores) % N_COLUMNAS:
+        raise ValueError(f"{ruta}: {len(valores)} valores no forman filas de {N_COLUMNAS} columnas")
+    return valores.reshape(-1, N_COLUMNAS)
+
+
+def leer_medida(ruta, lineas_cabecera=LINEAS_CABECERA):
+    """Curva (n, 2) con U1 e IA y columnas constantes (n, 3) con U2, U3 y UH.
+
+    Las dos son vistas del mismo array, sin copiar los datos.
+    """
+    tabla = leer_tabla(ruta, lineas_cabecera)
+    return tabla[:, :2], tabla[:, 2:]
+
+
+def leer_medidas(rutas, lineas_cabecera=LINEAS_CABECERA):
+    """leer_medida de varios archivos: lista de curvas y lista de columnas constantes."""
+    curvas, constantes = [], []
+    for ruta in rutas:
+        curva, fijas = leer_medida(ruta, lineas_cabecera)
+        curvas.append(curva)
+        constantes.append(fijas)
+    return curvas, constantes
+
+
+def rutas_medidas(carpeta):
+    """Rutas de los .txt de una carpeta, en orden alfabético."""
+    return [os.path.join(carpeta, nombre) for nombre in sorted(os.listdir(carpeta))
+            if nombre.endswith('.txt')]
@@ -0,0 +1,113 @@
+# Resultados de ajustes guardados entre ejecuciones. Al repetir un informe se
+# vuelven a ajustar los mismos .csv con el mismo modelo; aquí cada resultado
+# se guarda en un .json cuyo nombre es un hash de:
+#   - los bytes del archivo de datos (no la ruta ni la fecha: si se copia o se
+#     vuelve a guardar sin cambios sigue valiendo),
+#   - el modelo (opción 1-8 y, en la 8, la expresión y los valores iniciales),
+#   - cómo se leen los datos y los ajustes del cálculo (corte, réplicas, ...).
+# Si se encuentra, no hace falta ni leer el .csv ni ajustar.
+#
+# La carpeta tiene un tamaño máximo; al pasarlo se borran los resultados
+# usados hace más tiempo (el tiempo de modificación marca el último uso).
+# Si no se puede escribir en ella (sin permisos, disco lleno, ...) los ajustes
+# se hacen igual, solo que sin guardarse.
+
+import hashlib
+import json
+import os
+
+# Cambiar al modificar los cálculos, para no devolver resultados viejos
+VERSION = 1
+
+# Carpeta de los resultados. Se puede cambiar con la variable de entorno
+# PROGRAMAS_UTILES_CACHE_AJUSTES.
+CARPETA_RESULTADOS = os.environ.get(
+    'PROGRAMAS_UTILES_CACHE_AJUSTES',
+    os.path.join(os.path.expanduser('~'), '.cache', 'programas_utiles', 'ajustes'))
+
+# Tamaño máximo de la carpeta de resultados en bytes
+MAX_BYTES_RESULTADOS = 64 * 2**20
+
+
+def huella_archivo(file_name, tamano_bloque=2**20):
+    """Hash SHA-256 del contenido del archivo, leído por bloques."""
+    h = hashlib.sha256()
+    with open(file_name, 'rb') as f:
+        for bloque in iter(lambda: f.read(tamano_bloque), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def clave_ajuste(file_name, opcion, **ajustes):
+    """Clave del resultado de aplicar la opción al archivo con esos ajustes.
+
+    ajustes son los demás datos de los que depende el resultado (delimitador,
+    decimal, corte, expresion, p0, réplicas, ...); tienen que poder pasarse a JSON.
+    """
+    identidad = {'version': VERSION, 'datos': huella_archivo(file_name), 'opcion': opcion, **ajustes}
+    return hashlib.sha256(json.dumps(identidad, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def leer_resultado(clave, carpeta=None):
+    """Devuelve el resultado guardado con esa clave, o None si no está."""
+    ruta = os.path.join(carpeta or CARPETA_RESULTADOS, f'{clave}.json')
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            resultado = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    try:
+        os.utime(ruta)   # Marca el uso para el orden LRU
+    except OSError:
+        pass
+    return resultado
+
+
+def _limpiar(carpeta, max_bytes):
+    # Borra los resultados menos usados hasta que la carpeta quepa en max_bytes;
+    # otro proceso puede estar borrando a la vez, por eso se ignoran los que ya no están
+    archivos = []
+    try:
+        nombres = os.listdir(carpeta)
+    except OSError:
+        return
+    for nombre in nombres:
+        if nombre.endswith('.json'):
+            try:
+                info = os.stat(os.path.join(carpeta, nombre))
+            except OSError:
+                continue
+            archivos.append((info.st_mtime, info.st_size, nombre))
+    total = sum(tamano for _, tamano, _ in archivos)
+    for _, tamano, nombre in sorted(archivos):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(carpeta, nombre))
+        except OSError:
+            continue
+        total -= tamano
+
+
+def guardar_resultado(clave, resultado, carpeta=None, max_bytes=MAX_BYTES_RESULTADOS):
+    """Guarda el resultado (un diccionario que se pueda pasar a JSON) con esa clave.
+
+    Devuelve False si no se ha podido escribir en la carpeta.
+    """
+    carpeta = carpeta or CARPETA_RESULTADOS
+    ruta = os.path.join(carpeta, f'{clave}.json')
+    # Temporal y renombrado, para que otro proceso nunca lea un .json a medias
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(carpeta, exist_ok=True)
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False)
+        os.replace(temporal, ruta)
+    except OSError:
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        return False
+    _limpiar(carpeta, max_bytes)
+    return True
@@ -0,0 +1,125 @@
+# Menú interactivo de ProgramasUtiles.py, el mismo para todas las prácticas.
+# Cada ProgramasUtiles.py solo fija su archivo de datos, delimitador, decimal y
+# unidades de los ejes y llama a ejecutar_menu; los cálculos son los de
+# opciones.py y las gráficas las de graficas.py.
+#
+# Aquí no se importa nada pesado al arrancar: pandas se carga al leer los datos,
+# scipy solo en las opciones que lo usan (curve_fit, ODR, CubicSpline) y
+# matplotlib al dibujar, así que el menú aparece enseguida.
+
+OPCIONES_MENU = {
+    '1': 'Ajuste lineal tipo y = ax con incertidumbre',
+    '2': 'Ajuste lineal tipo y = ax + b con incertidumbre',
+    '3': 'Ajuste lineal tipo y = ax² + bx + c con incertidumbre',
+    '4': 'Ajuste de dos conjuntos de datos y determinación de intersección',
+    '5': 'Ajuste por minimos cuadrados y = ax + b',
+    '6': 'Ajuste por minimos cuadrados y = ax',
+    '7': 'Realizar un spline cubico a unos datos dados',
+    '8': 'Realizar un ajuste no lineal a unos datos dados',
+}
+
+
+def menu():
+    print('---------------------------------------------------')
+    print('------------------ MENÚ DE PROGRAMAS --------------')
+    print('---------------------------------------------------')
+    print('Seleccione una opción (o 0 para salir):')
+    for numero, descripcion in OPCIONES_MENU.items():
+        print(f'{numero}. {descripcion}')
+    print('0. Salir')
+    print('---------------------------------------------------')
+    return input('Ingrese el número de la opción deseada: ')
+
+
+class Pantalla:
+    """Escritor para graficas.grafica_opcion que guarda la figura (si tiene nombre) y la muestra."""
+
+    def guardar(self, fig, nombre_graf):
+        import matplotlib.pyplot as plt
+
+        if nombre_graf:
+            fig.savefig(nombre_graf)
+        plt.show()
+        plt.close(fig)
+
+
+def _unidad(unidad, opcion):
+    # Las unidades pueden ser una sola cadena o una por opción {opción: cadena}
+    if isinstance(unidad, dict):
+        return unidad.get(opcion, '')
+    return unidad
+
+
+def imprimir_resultado(resultado):
+    """Escribe cada resultado, con su incertidumbre al lado si la tiene."""
+    for clave, valor in resultado.items():
+        if clave.startswith('sigma_') and clave[len('sigma_'):] in resultado:
+            continue
+        sigma = resultado.get(f'sigma_{clave}')
+        if sigma is not None:
+            print(f'   {clave}: {valor} ± {sigma}')
+        else:
+            print(f'{clave}: {valor}')
+
+
+def ejecutar_opcion(opcion, file_name, delimitador=',', decimal='.', nombre_graf='',
+                    unidad_ejex='', unidad_ejey='', expresion=None):
+    """Lee los datos, calcula la opción (1-8), escribe los resultados y muestra la gráfica.
+
+    Con expresion, las opciones 1 a 3 ajustan ese modelo (opción 8) en lugar
+    de su recta o parábola.
+    """
+    from .lectura import cargar_datos, COLUMNAS, COLUMNAS_SPLINE
+    from .opciones import OPCIONES
+
+    print('---------------------------------------------------')
+    print(f'Escogió la opción {opcion}, {OPCIONES_MENU[str(opcion)].lower()}: ')
+    print('---------------------------------------------------')
+    columnas = COLUMNAS_SPLINE if opcion == 7 else COLUMNAS
+    print(f"El archivo de datos debe tener la siguiente estructura:\n{delimitador.join(columnas)}")
+
+    data = cargar_datos(file_name, delimitador, decimal, columnas)
+    print(data)
+
+    if opcion == 4:
+        n = input("Número de puntos en el primer conjunto (Enter para detectarlo): ").strip()
+        resultado = OPCIONES[4](data, int(n) if n else None)
+    elif opcion == 7:
+        resultado = OPCIONES[7](data, 'spline_tramos.txt')
+    elif opcion == 8 or (expresion and opcion in (1, 2, 3)):
+        if not expresion:
+            expresion = input("Modelo a ajustar (p. ej. a*exp(-k*x) + c): ").strip()
+        resultado = OPCIONES[8](data, expresion)
+        opcion = 8
+    else:
+        resultado = OPCIONES[opcion](data)
+    imprimir_resultado(resultado)
+
+    from .graficas import grafica_opcion
+
+    grafica_opcion(opcion, data, resultado, nombre_graf, _unidad(unidad_ejex, opcion),
+                   _unidad(unidad_ejey, opcion), escritor=Pantalla())
+    return resultado
+
+
+def ejecutar_menu(file_name, delimitador=',', decimal='.', nombre_graf='', unidad_ejex='', unidad_ejey='',
+                  expresiones=None):
+    """Bucle del menú: pregunta una opción, la ejecuta y vuelve a preguntar hasta que se elige 0.
+
+    unidad_ejex y unidad_ejey pueden ser una cadena o un diccionario
+    {opción: cadena}; expresiones es un diccionario {opción: modelo} para
+    ajustar un modelo propio en las opciones 1 a 3 o dar el de la opción 8.
+    """
+    expresiones = expresiones or {}
+    opcion = menu()
+    while opcion != '0':
+        if opcion in OPCIONES_MENU:
+            try:
+                ejecutar_opcion(int(opcion), file_name, delimitador, decimal, nombre_graf,
+                                unidad_ejex, unidad_ejey, expresiones.get(int(opcion)))
+            except Exception as e:
+                print(f"Error: {str(e)}")
+            input("Presione Enter para continuar...")
+        else:
+            print("Opción no válida. Por favor, seleccione una opción del menú.")
+        opcion = menu()
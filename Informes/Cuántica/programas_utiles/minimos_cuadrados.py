@@ -0,0 +1,108 @@
+# Mínimos cuadrados ponderados de las opciones 5 (y = ax + b) y 6 (y = ax) para
+# muchos conjuntos de datos a la vez. Los conjuntos se apilan en arrays 2-D de
+# forma (n_conjuntos, n_puntos); si no tienen todos el mismo número de puntos se
+# rellenan y se indica con una máscara qué puntos son válidos. Todas las sumas
+# (S, Sx, Sy, Sxx, Sxy) se hacen por filas en una sola pasada de NumPy.
+
+import numpy as np
+
+
+def apilar(conjuntos):
+    """Apila una lista de arrays 1-D de distinta longitud en un array 2-D relleno y su máscara."""
+    longitudes = np.array([len(c) for c in conjuntos], dtype=int)
+    mascara = np.arange(longitudes.max(initial=0)) < longitudes[:, None]
+    apilado = np.zeros(mascara.shape)
+    apilado[mascara] = np.concatenate([np.asarray(c, dtype=float) for c in conjuntos] or [np.empty(0)])
+    return apilado, mascara
+
+
+def _preparar(x, y, ey, mascara):
+    x = np.atleast_2d(np.asarray(x, dtype=float))
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    ey = np.atleast_2d(np.asarray(ey, dtype=float))
+    if mascara is None:
+        # Los huecos rellenados con NaN también cuentan como puntos no válidos
+        mascara = ~(np.isnan(x) | np.isnan(y) | np.isnan(ey))
+    else:
+        mascara = np.atleast_2d(np.asarray(mascara, dtype=bool))
+    # Los puntos enmascarados se sustituyen por valores inofensivos y peso nulo
+    x = np.where(mascara, x, 0.)
+    y = np.where(mascara, y, 0.)
+    w = np.where(mascara, 1 / np.where(mascara, ey, 1.)**2, 0.)
+    return x, y, w, mascara
+
+
+def _pearson(x, y, mascara):
+    # Correlación lineal entre x e y (no ponderada) de cada fila
+    n = mascara.sum(axis=1)
+    mx = x.sum(axis=1) / n
+    my = y.sum(axis=1) / n
+    dx = np.where(mascara, x - mx[:, None], 0.)
+    dy = np.where(mascara, y - my[:, None], 0.)
+    return (dx * dy).sum(axis=1) / np.sqrt((dx**2).sum(axis=1) * (dy**2).sum(axis=1))
+
+
+def minimos_cuadrados_lote(x, y, ey, mascara=None):
+    """Ajuste ponderado y = a * x + b (opción 5) de cada fila de x, y, ey.
+
+    Devuelve un diccionario de arrays de longitud n_conjuntos con a, sigma_a,
+    b, sigma_b, cov_ab, chi2, chi2_red, pearson y n (puntos válidos por conjunto).
+    """
+    x, y, w, mascara = _preparar(x, y, ey, mascara)
+
+    # Parámetros intermedios
+    S = w.sum(axis=1)
+    Sx = (w * x).sum(axis=1)
+    Sy = (w * y).sum(axis=1)
+    Sxx = (w * x**2).sum(axis=1)
+    Sxy = (w * x * y).sum(axis=1)
+    Delta = S * Sxx - Sx**2
+
+    # Coeficientes del ajuste y = a*x + b
+    a = (S * Sxy - Sx * Sy) / Delta
+    b = (Sxx * Sy - Sx * Sxy) / Delta
+
+    # Incertidumbres de los parámetros
+    sigma_a = np.sqrt(S / Delta)
+    sigma_b = np.sqrt(Sxx / Delta)
+    cov_ab = -Sx / Delta
+
+    # Chi-cuadrado reducido (bondad del ajuste)
+    n = mascara.sum(axis=1)
+    chi2 = (w * (y - (a[:, None] * x + b[:, None]))**2).sum(axis=1)
+    chi2_red = chi2 / (n - 2)
+
+    return {
+        'a': a, 'sigma_a': sigma_a,
+        'b': b, 'sigma_b': sigma_b, 'cov_ab': cov_ab,
+        'chi2': chi2, 'chi2_red': chi2_red,
+        'pearson': _pearson(x, y, mascara),
+        'n': n,
+    }
+
+
+def minimos_cuadrados_origen_lote(x, y, ey, mascara=None):
+    """Ajuste ponderado y = a * x (opción 6) de cada fila de x, y, ey.
+
+    Devuelve un diccionario de arrays con a, sigma_a, chi2, chi2_red, pearson y n.
+    """
+    x, y, w, mascara = _preparar(x, y, ey, mascara)
+
+    # En el modelo y = ax solo necesitamos Sxx y Sxy
+    Sxx = (w * x**2).sum(axis=1)
+    Sxy = (w * x * y).sum(axis=1)
+
+    a = Sxy / Sxx
+    sigma_a = 1 / np.sqrt(Sxx)
+
+    # Grados de libertad: N - 1 (solo estimamos 1 parámetro, 'a')
+    n = mascara.sum(axis=1)
+    chi2 = (w * (y - a[:, None] * x)**2).sum(axis=1)
+    chi2_red = chi2 / (n - 1)
+
+    return {
+        'a': a, 'sigma_a': sigma_a,
+        'chi2': chi2, 'chi2_red': chi2_red,
+        'pearson': _pearson(x, y, mascara),
+        'n': n,
+    }
@@ -0,0 +1,123 @@
+# Opción 8: ajuste no lineal a un modelo dado como texto, por ejemplo
+# 'a*((x**2)/(x**2-4))' (serie de Balmer) o 'A*exp(-k*x) + c'. La expresión
+# se compila una sola vez con sympy a funciones de NumPy vectorizadas, tanto
+# el modelo como su jacobiano respecto a los parámetros, que se pasa a
+# curve_fit para que no tenga que aproximarlo con diferencias finitas.
+
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Nombres que no se llaman como función: variable, parámetros o constantes
+_IDENTIFICADOR = re.compile(r'\b[A-Za-z_]\w*\b(?!\s*\()')
+# Constantes que se dejan con su valor de sympy; cualquier otro nombre es un
+# símbolo aunque sympy lo conozca (E, I, S, N, Q, O, ...: E de energía, I de corriente)
+CONSTANTES = ('pi',)
+
+
+class Modelo:
+    """Modelo compilado: f(x, *p), jac(x, *p) -> (n_puntos, n_par) y nombres de los parámetros."""
+
+    def __init__(self, expresion, variable, parametros, evaluar):
+        self.expresion = expresion
+        self.variable = variable
+        self.parametros = parametros
+        self._evaluar = evaluar
+        self._ultimo = (None, None, None)
+
+    def _valores(self, x, p):
+        # El modelo y sus derivadas se evalúan juntos (comparten subexpresiones)
+        # y se guarda el último resultado: curve_fit pide f y jac en el mismo
+        # punto uno detrás de otro, así la segunda llamada no recalcula nada.
+        # x se compara por contenido con una copia (el array de quien llama
+        # puede cambiar en su sitio y no se debe mantener vivo)
+        p = tuple(p)
+        x_ultimo, p_ultimo, valores = self._ultimo
+        if (x_ultimo is None or p_ultimo != p or x_ultimo.shape != x.shape
+                or not np.array_equal(x_ultimo, x)):
+            valores = self._evaluar(x, *p)
+            self._ultimo = (x.copy(), p, valores)
+        return valores
+
+    def f(self, x, *p):
+        x = np.asarray(x, dtype=float)
+        # Las expresiones constantes devuelven un escalar, se extienden a x
+        return np.broadcast_to(self._valores(x, p)[0], x.shape).astype(float)
+
+    def jac(self, x, *p):
+        x = np.asarray(x, dtype=float)
+        columnas = self._valores(x, p)[1:]
+        J = np.empty((x.size, len(self.parametros)))
+        for j, columna in enumerate(columnas):
+            J[:, j] = np.broadcast_to(columna, x.shape).ravel()
+        return J
+
+    def __repr__(self):
+        return f"Modelo({self.expresion!r}, parametros={self.parametros})"
+
+
+@lru_cache(maxsize=64)
+def compilar_modelo(expresion, variable='x', parametros=None):
+    """Compila la expresión (una sola vez por expresión) a un Modelo.
+
+    Si no se indican los parámetros (tupla de nombres) se toman todos los
+    símbolos de la expresión distintos de la variable, en orden alfabético.
+    Todo nombre que no se llama como función es un símbolo, salvo los de
+    CONSTANTES.
+    """
+    import sympy
+    from sympy.parsing.sympy_parser import parse_expr
+
+    simbolo_x = sympy.Symbol(variable)
+    nombres = {nombre: sympy.Symbol(nombre) for nombre in _IDENTIFICADOR.findall(expresion)
+               if nombre not in CONSTANTES}
+    expr = parse_expr(expresion, local_dict=nombres | {variable: simbolo_x})
+    if parametros is None:
+        parametros = tuple(sorted((s.name for s in expr.free_symbols if s != simbolo_x)))
+    simbolos = [sympy.Symbol(nombre) for nombre in parametros]
+    if not simbolos:
+        raise ValueError(f"La expresión '{expresion}' no tiene parámetros que ajustar")
+    sobrantes = expr.free_symbols - set(simbolos) - {simbolo_x}
+    if sobrantes:
+        raise ValueError(f"Símbolos desconocidos en la expresión: {sorted(s.name for s in sobrantes)}")
+
+    # Modelo y derivadas en una sola función; cse=True calcula una única vez
+    # las subexpresiones comunes (por ejemplo exp(-k*x) en A*exp(-k*x) + c)
+    derivadas = [sympy.diff(expr, s) for s in simbolos]
+    evaluar = sympy.lambdify([simbolo_x, *simbolos], [expr, *derivadas], modules='numpy', cse=True)
+    return Modelo(expresion, variable, list(parametros), evaluar)
+
+
+def ajuste_no_lineal(data, expresion, p0=None, jacobiano=True, **kwargs):
+    """Opción 8: ajuste no lineal de y = expresion(x; parámetros) con incertidumbre dy.
+
+    Devuelve los parámetros con sus incertidumbres (absolute_sigma=True), la
+    matriz de covarianza pcov, chi², chi² reducido y el número de evaluaciones del modelo (nfev) y del
+    jacobiano (njev). Con jacobiano=False curve_fit usa diferencias finitas.
+    """
+    from scipy.optimize import curve_fit
+
+    modelo = compilar_modelo(expresion)
+    x = np.asarray(data['x'], dtype=float)
+    y = np.asarray(data['y'], dtype=float)
+    dy = np.asarray(data['dy'], dtype=float)
+    if p0 is None:
+        p0 = np.ones(len(modelo.parametros))
+    kwargs.setdefault('maxfev', 10000)
+
+    popt, pcov, infodict, _, _ = curve_fit(
+        modelo.f, x, y, p0=p0, sigma=dy, absolute_sigma=True,
+        jac=modelo.jac if jacobiano else None, full_output=True, **kwargs)
+
+    chi2 = np.sum(((y - modelo.f(x, *popt)) / dy)**2)
+    resultado = {'expresion': expresion}
+    for nombre, valor, error in zip(modelo.parametros, popt, np.sqrt(np.diag(pcov))):
+        resultado[nombre] = float(valor)
+        resultado[f'sigma_{nombre}'] = float(error)
+    resultado['pcov'] = pcov.tolist()
+    resultado['chi2'] = float(chi2)
+    resultado['chi2_red'] = float(chi2 / (len(x) - len(popt)))
+    resultado['nfev'] = int(infodict['nfev'])
+    resultado['njev'] = int(infodict.get('njev', 0) or 0)
+    return resultado
@@ -0,0 +1,188 @@
+# Cálculos de las opciones 1 a 8 del menú de ProgramasUtiles.py, sin input()
+# ni plt.show(). Cada función recibe los datos ya leídos y devuelve un
+# diccionario con los resultados, que es lo que se guarda por archivo en lote.
+
+import numpy as np
+
+from .estadisticos import estadisticos
+from .lineal import ajustar
+from .minimos_cuadrados import minimos_cuadrados_lote, minimos_cuadrados_origen_lote
+from .no_lineal import ajuste_no_lineal
+from .tramos import escribir_tramos, guardar_coeficientes
+
+
+def _ajuste_lineal(func, potencias, data, nombres):
+    # Parte común de las opciones 1, 2 y 3. Los tres modelos son lineales en sus
+    # parámetros, así que se resuelven con una factorización en vez de curve_fit
+    popt, pcov = ajustar(func, data.x, data.y, data.dy, potencias)
+
+    y_pred = func(data.x, *popt)
+
+    r = data.y - y_pred
+    chisq = sum((r / data.dy) ** 2)
+
+    resultado = {}
+    errores = np.sqrt(pcov.diagonal())
+    for nombre, valor, error in zip(nombres, popt, errores):
+        resultado[nombre] = float(valor)
+        resultado[f'sigma_{nombre}'] = float(error)
+    resultado['pcov'] = pcov.tolist()
+    resultado['chi2'] = float(chisq)
+    resultado.update(estadisticos(data.x, data.y))
+    return resultado
+
+
+def func_ax(x, a):
+    return a*x
+
+
+def func_axb(x, a, b):
+    return a*x + b
+
+
+def func_cuadratica(x, a, b, c):
+    return (a*(x**2) + (b*x) + c)
+
+
+def ajuste_ax(data):
+    """Opción 1: ajuste lineal tipo y = a * x con incertidumbre."""
+    return _ajuste_lineal(func_ax, (1,), data, ['a'])
+
+
+def ajuste_axb(data):
+    """Opción 2: ajuste lineal tipo y = a * x + b con incertidumbre."""
+    return _ajuste_lineal(func_axb, (1, 0), data, ['a', 'b'])
+
+
+def ajuste_cuadratico(data):
+    """Opción 3: ajuste tipo y = a * x² + b * x + c con incertidumbre."""
+    return _ajuste_lineal(func_cuadratica, (2, 1, 0), data, ['a', 'b', 'c'])
+
+
+def weighted_linear_fit(data):
+    ### Ajuste lineal con incertidumbres en x e y usando ODR.
+    from scipy import odr
+
+    model = odr.Model(lambda p, x: p[0]*x + p[1])
+    mydata = odr.RealData(data['x'], data['y'], sx=data['dx'], sy=data['dy'])
+    odr_fit = odr.ODR(mydata, model, beta0=[1., 0.])
+    return odr_fit.run()
+
+
+def calculate_intersection(fit1, fit2):
+    ### Calcula intersección y su matriz de covarianza.
+
+    # Parámetros y covarianzas
+    a1, b1 = fit1.beta
+    a2, b2 = fit2.beta
+    cov1 = fit1.cov_beta
+    cov2 = fit2.cov_beta
+
+    # Cálculo analítico de la intersección
+    denom = a1 - a2
+    if abs(denom) < 1e-10:
+        raise ValueError("Las rectas son paralelas (no hay intersección)")
+
+    x_int = (b2 - b1) / denom
+    y_int = a1 * x_int + b1
+
+    # Propagación de errores (primer orden), derivadas respecto a (a1, b1, a2, b2)
+    da1 = (b1 - b2)/(denom**2)
+    db1 = -1/denom
+    da2 = -da1
+    db2 = -db1
+
+    grad_x = np.array([da1, db1, da2, db2])
+    # y_int = a1 * x_int + b1, así que su gradiente sale de la regla de la cadena
+    grad_y = a1 * grad_x + np.array([x_int, 1., 0., 0.])
+    jac = np.vstack([grad_x, grad_y])
+    total_cov = np.block([[cov1, np.zeros((2,2))],[np.zeros((2,2)), cov2]])
+
+    cov_intersection = jac @ total_cov @ jac.T
+    return (x_int, y_int), cov_intersection
+
+
+def interseccion_rectas(data, n=None):
+    """Opción 4: ajusta los n primeros puntos y el resto por separado y calcula la intersección.
+
+    Sin n, el número de puntos del primer conjunto se detecta solo (el corte
+    que minimiza el chi² total de las dos rectas, ver interseccion.detectar_corte).
+    """
+    if n is None:
+        from .interseccion import detectar_corte
+
+        corte, _ = detectar_corte(data['x'].to_numpy(float), data['y'].to_numpy(float), data['dy'].to_numpy(float))
+        n = int(corte[0])
+    set1 = data.iloc[:n]
+    set2 = data.iloc[n:]
+
+    fit1 = weighted_linear_fit(set1)
+    fit2 = weighted_linear_fit(set2)
+
+    (x_int, y_int), cov = calculate_intersection(fit1, fit2)
+    x_err, y_err = np.sqrt(np.diag(cov))
+    return {
+        'n_primer_conjunto': int(n),
+        'a1': float(fit1.beta[0]), 'sigma_a1': float(fit1.sd_beta[0]),
+        'b1': float(fit1.beta[1]), 'sigma_b1': float(fit1.sd_beta[1]),
+        'a2': float(fit2.beta[0]), 'sigma_a2': float(fit2.sd_beta[0]),
+        'b2': float(fit2.beta[1]), 'sigma_b2': float(fit2.sd_beta[1]),
+        'x_int': float(x_int), 'sigma_x_int': float(x_err),
+        'y_int': float(y_int), 'sigma_y_int': float(y_err),
+        'cov_xy_int': float(cov[0, 1]),
+    }
+
+
+def _una_fila(resultado):
+    # Los ajustes en lote devuelven arrays de un elemento para un único conjunto
+    return {clave: float(valor[0]) for clave, valor in resultado.items() if clave != 'n'}
+
+
+def minimos_cuadrados_axb(data):
+    """Opción 5: ajuste por mínimos cuadrados ponderado y = a * x + b."""
+    return _una_fila(minimos_cuadrados_lote(data["x"], data["y"], data["dy"]))
+
+
+def minimos_cuadrados_ax(data):
+    """Opción 6: ajuste por mínimos cuadrados ponderado y = a * x."""
+    return _una_fila(minimos_cuadrados_origen_lote(data["x"], data["y"], data["dy"]))
+
+
+def construir_spline(data):
+    from scipy.interpolate import CubicSpline
+
+    eje_x = np.asarray(data['x'], dtype=float)
+    eje_y = np.asarray(data['y'], dtype=float)
+    return CubicSpline(eje_x, eje_y, bc_type="natural")
+
+
+def spline_cubico(data, ruta_tramos='spline_tramos.txt', ruta_coeficientes=None):
+    """Opción 7: spline cúbico natural a los datos, guardando los tramos en ruta_tramos.
+
+    Con ruta_coeficientes (.npz o .csv) se guarda además la tabla de coeficientes.
+    """
+    cs = construir_spline(data)
+    if ruta_tramos:
+        escribir_tramos(cs, ruta_tramos)
+    if ruta_coeficientes:
+        guardar_coeficientes(cs, ruta_coeficientes)
+    return {
+        'n_nodos': int(len(cs.x)),
+        'x_min': float(cs.x[0]),
+        'x_max': float(cs.x[-1]),
+        'tramos': str(ruta_tramos) if ruta_tramos else None,
+        'coeficientes': str(ruta_coeficientes) if ruta_coeficientes else None,
+    }
+
+
+# Número de opción del menú -> función que la calcula
+OPCIONES = {
+    1: ajuste_ax,
+    2: ajuste_axb,
+    3: ajuste_cuadratico,
+    4: interseccion_rectas,
+    5: minimos_cuadrados_axb,
+    6: minimos_cuadrados_ax,
+    7: spline_cubico,
+    8: ajuste_no_lineal,
+}
@@ -0,0 +1,261 @@
+# Ajuste de perfiles de línea a los picos de un espectro, para dar su posición
+# con más precisión que la separación entre puntos del espectrómetro (~0.9 nm).
+# Cada pico se ajusta con un perfil gaussiano, lorentziano o pseudo-Voigt
+#   gauss:   h·exp(-4 ln2 (x - c)²/f²)
+#   lorentz: h / (1 + 4 (x - c)²/f²)
+#   pvoigt:  η·lorentz + (1 - η)·gauss     (0 <= η <= 1)
+# con altura h, centro c y anchura a media altura f, sobre un fondo constante.
+#
+# Los picos cuyas ventanas (centro ± VENTANA·anchura) se solapan forman un
+# grupo y se ajustan juntos con un único fondo. Todos los grupos del espectro
+# van en un solo problema de mínimos cuadrados: los residuos de un grupo solo
+# dependen de sus parámetros, así que el jacobiano (analítico) es una matriz
+# dispersa por bloques y least_squares la resuelve con lsmr sin formar nunca
+# la matriz densa.
+#
+# Incertidumbres: covarianza (JᵀJ)⁻¹·s² de cada bloque, con s² la varianza de
+# los residuos de su grupo (el espectrómetro no da el error de cada punto).
+# El área sale de h y f, y su error de propagar esa covarianza.
+
+import numpy as np
+
+PERFILES = ('gauss', 'lorentz', 'pvoigt')
+# Semiancho de la ventana de cada pico, en unidades de su anchura
+VENTANA = 2.0
+# Semiancho mínimo de la ventana, en puntos del espectro
+PUNTOS_MIN = 3
+# Grados de libertad mínimos de cada grupo (puntos menos parámetros); si la
+# ventana no los da se amplía punto a punto
+LIBERTAD_MIN = 2
+
+_4LN2 = 4 * np.log(2)
+# Área de un perfil de altura 1 y anchura a media altura 1
+_AREA_GAUSS = np.sqrt(np.pi / _4LN2)
+_AREA_LORENTZ = np.pi / 2
+
+
+def agrupar_picos(longitud, centros, anchuras, ventana=VENTANA, parametros_pico=None):
+    """Agrupa los picos cuyas ventanas se solapan.
+
+    centros debe estar ordenado. Devuelve (grupo de cada pico, inicio, fin):
+    los puntos del grupo g son longitud[inicio[g]:fin[g]], y los de grupos
+    distintos no se solapan. Con parametros_pico (parámetros de cada perfil)
+    cada grupo se amplía hasta tener LIBERTAD_MIN puntos más que parámetros
+    (los de sus picos y el fondo), si hay sitio entre los grupos vecinos.
+    """
+    paso = np.median(np.diff(longitud)) if len(longitud) > 1 else 1.
+    semiancho = np.maximum(ventana * anchuras, PUNTOS_MIN * paso)
+    izquierda, derecha = centros - semiancho, centros + semiancho
+    # Empieza un grupo cuando la ventana del pico no alcanza a ninguna anterior
+    nuevo = np.r_[True, izquierda[1:] > np.maximum.accumulate(derecha)[:-1]]
+    grupo = np.cumsum(nuevo) - 1
+    primeros = np.flatnonzero(nuevo)
+    inicio = np.searchsorted(longitud, np.minimum.reduceat(izquierda, primeros), 'left')
+    fin = np.searchsorted(longitud, np.maximum.reduceat(derecha, primeros), 'right')
+    if parametros_pico is not None:
+        necesarios = np.bincount(grupo) * parametros_pico + 1 + LIBERTAD_MIN
+        inicio, fin = _ampliar_grupos(inicio, fin, necesarios, len(longitud))
+    return grupo, inicio, fin
+
+
+def _ampliar_grupos(inicio, fin, necesarios, n_puntos):
+    # Amplía [inicio, fin) de cada grupo hasta 'necesarios' puntos, a partes
+    # iguales por los dos lados, sin pasar de los extremos ni pisar a los vecinos
+    inicio, fin = inicio.copy(), fin.copy()
+    for g in range(len(inicio)):
+        falta = necesarios[g] - (fin[g] - inicio[g])
+        if falta <= 0:
+            continue
+        limite_izquierdo = fin[g - 1] if g > 0 else 0
+        limite_derecho = inicio[g + 1] if g + 1 < len(inicio) else n_puntos
+        izquierda = min(-(-falta // 2), inicio[g] - limite_izquierdo)
+        derecha = min(falta - izquierda, limite_derecho - fin[g])
+        # Lo que no cabe por la derecha se intenta por la izquierda
+        izquierda = min(falta - derecha, inicio[g] - limite_izquierdo)
+        inicio[g] -= izquierda
+        fin[g] += derecha
+    return inicio, fin
+
+
+class _Modelo:
+    # Modelo de todos los grupos a la vez. Parámetros: (h, c, f[, η]) de cada
+    # pico seguidos y después el fondo de cada grupo
+    def __init__(self, x, perfil, grupo, inicio, fin):
+        self.perfil = perfil
+        self.n_param = 4 if perfil == 'pvoigt' else 3
+        self.n_picos = len(grupo)
+        largos = fin - inicio
+        # Puntos de todos los grupos seguidos (posición en el vector de residuos)
+        salto = np.cumsum(np.r_[0, largos[:-1]])
+        self.indices = np.repeat(inicio - salto, largos) + np.arange(largos.sum())
+        self.x = x[self.indices]
+        self.grupo_punto = np.repeat(np.arange(len(largos)), largos)
+        # Pares (punto, pico) de cada pico con los puntos de su grupo
+        n_pares = largos[grupo]
+        primero = salto[grupo]
+        self.pico = np.repeat(np.arange(self.n_picos), n_pares)
+        self.punto = (np.repeat(primero - np.cumsum(np.r_[0, n_pares[:-1]]), n_pares)
+                      + np.arange(n_pares.sum()))
+        self.n_grupos = len(largos)
+
+    def _formas(self, p):
+        # Valor de cada par y sus derivadas respecto a h, c, f, η
+        n = self.n_picos * self.n_param
+        picos = p[:n].reshape(self.n_picos, self.n_param)
+        h, c, f = (picos[self.pico, k] for k in range(3))
+        if self.perfil == 'pvoigt':
+            eta = picos[self.pico, 3]
+        else:
+            eta = np.full(len(self.pico), 1. if self.perfil == 'lorentz' else 0.)
+        d = self.x[self.punto] - c
+        u2 = (d / f)**2
+        G = np.exp(-_4LN2 * u2)
+        L = 1 / (1 + 4 * u2)
+        forma = eta * L + (1 - eta) * G
+        # d/dc y d/df de G y L (de altura 1)
+        dG_dc, dL_dc = 2 * _4LN2 * d / f**2 * G, 8 * d / f**2 * L**2
+        derivadas = [forma,
+                     h * (eta * dL_dc + (1 - eta) * dG_dc),
+                     h * d / f * (eta * dL_dc + (1 - eta) * dG_dc)]
+        if self.perfil == 'pvoigt':
+            derivadas.append(h * (L - G))
+        return h * forma, derivadas, p[n:]
+
+    def residuos(self, p, y):
+        valores, _, fondo = self._formas(p)
+        return np.bincount(self.punto, valores, len(self.x)) + fondo[self.grupo_punto] - y
+
+    def jacobiano(self, p, y=None):
+        from scipy.sparse import csr_matrix
+
+        _, derivadas, _ = self._formas(p)
+        filas = [np.tile(self.punto, self.n_param), np.arange(len(self.x))]
+        columnas = [(self.pico[None, :] * self.n_param + np.arange(self.n_param)[:, None]).ravel(),
+                    self.n_picos * self.n_param + self.grupo_punto]
+        valores = [np.concatenate(derivadas), np.ones(len(self.x))]
+        return csr_matrix((np.concatenate(valores), (np.concatenate(filas), np.concatenate(columnas))),
+                          shape=(len(self.x), self.n_picos * self.n_param + self.n_grupos))
+
+
+def area_perfil(altura, fwhm, eta):
+    """Área de un perfil pseudo-Voigt (η = 0 gaussiano, η = 1 lorentziano)."""
+    return altura * fwhm * (eta * _AREA_LORENTZ + (1 - eta) * _AREA_GAUSS)
+
+
+def ajustar_perfiles(longitud, valor, centros, anchuras, alturas, perfil='gauss', ventana=VENTANA):
+    """Ajusta un perfil a cada pico, todos en un solo problema de mínimos cuadrados.
+
+    centros, anchuras y alturas son los valores iniciales (por ejemplo, de
+    picos_espectro). Devuelve un diccionario de arrays, con una posición por
+    pico en el orden de centros: centro, fwhm, altura, area y eta con sus
+    sigma_*, fondo (el de su grupo), grupo, libertad (grados de libertad
+    de su grupo), convergido (si el ajuste de su grupo ha convergido) y la
+    curva ajustada en 'modelo' (x, y) sobre las ventanas de los grupos. Si
+    libertad <= 0 o el grupo no ha convergido, sus sigma_* son NaN.
+    """
+    from scipy.optimize import least_squares
+
+    if perfil not in PERFILES:
+        raise ValueError(f"Perfil desconocido: {perfil} ({', '.join(PERFILES)})")
+    longitud = np.asarray(longitud, dtype=float)
+    valor = np.asarray(valor, dtype=float)
+    orden = np.argsort(centros)
+    centros = np.asarray(centros, dtype=float)[orden]
+    paso = np.median(np.diff(longitud)) if len(longitud) > 1 else 1.
+    anchuras = np.maximum(np.asarray(anchuras, dtype=float)[orden], paso)
+    alturas = np.asarray(alturas, dtype=float)[orden]
+    n_picos = len(centros)
+    if n_picos == 0:
+        vacio = np.empty(0)
+        return {clave: vacio for clave in ('centro', 'sigma_centro', 'fwhm', 'sigma_fwhm', 'altura',
+                                          'sigma_altura', 'area', 'sigma_area', 'eta', 'sigma_eta',
+                                          'fondo', 'grupo', 'libertad', 'convergido')} | {'modelo': (vacio, vacio)}
+
+    grupo, inicio, fin = agrupar_picos(longitud, centros, anchuras, ventana,
+                                       4 if perfil == 'pvoigt' else 3)
+    modelo = _Modelo(longitud, perfil, grupo, inicio, fin)
+    y = valor[modelo.indices]
+
+    # Valores iniciales y límites: h >= 0, c dentro de su ventana, f entre un
+    # quinto de paso y la ventana entera, 0 <= η <= 1
+    fondo0 = np.minimum.reduceat(y, np.r_[0, np.cumsum(fin - inicio)[:-1]])
+    iniciales = [np.maximum(alturas - fondo0[grupo], 1e-12), centros, anchuras]
+    inferiores = [np.zeros(n_picos), longitud[inicio[grupo]], np.full(n_picos, paso / 5)]
+    superiores = [np.full(n_picos, np.inf), longitud[fin[grupo] - 1],
+                  longitud[fin[grupo] - 1] - longitud[inicio[grupo]] + paso]
+    if perfil == 'pvoigt':
+        iniciales.append(np.full(n_picos, 0.5))
+        inferiores.append(np.zeros(n_picos))
+        superiores.append(np.ones(n_picos))
+    p0 = np.concatenate([np.column_stack(iniciales).ravel(), fondo0])
+    inferior = np.concatenate([np.column_stack(inferiores).ravel(), np.full(len(fondo0), -np.inf)])
+    superior = np.concatenate([np.column_stack(superiores).ravel(), np.full(len(fondo0), np.inf)])
+    p0 = np.clip(p0, inferior, superior)
+
+    # Cada grupo es un problema independiente y pequeño (unos pocos picos):
+    # se ajusta por separado con el jacobiano denso y el solver exacto
+    n = n_picos * modelo.n_param
+    p = p0.copy()
+    ajustado = np.empty(len(y))
+    convergido = np.zeros(modelo.n_grupos, dtype=bool)
+    bloques = []
+    for g in range(modelo.n_grupos):
+        picos_g = np.flatnonzero(grupo == g)
+        columnas = np.r_[(picos_g[:, None] * modelo.n_param + np.arange(modelo.n_param)).ravel(), n + g]
+        puntos = modelo.grupo_punto == g
+        modelo_g = _Modelo(longitud, perfil, np.zeros(len(picos_g), dtype=np.intp), inicio[g:g + 1], fin[g:g + 1])
+        solucion = least_squares(modelo_g.residuos, p0[columnas], jac=lambda q, y_g: modelo_g.jacobiano(q).toarray(),
+                                 bounds=(inferior[columnas], superior[columnas]), args=(y[puntos],),
+                                 method='trf', tr_solver='exact', x_scale='jac')
+        p[columnas] = solucion.x
+        ajustado[puntos] = solucion.fun + y[puntos]
+        # status 0: se ha llegado al máximo de evaluaciones sin converger
+        convergido[g] = solucion.status > 0
+        bloques.append((picos_g, solucion.jac, np.sum(solucion.fun**2)))
+
+    # Covarianza por bloques: cada grupo con sus picos y su fondo
+    covarianza = np.full((n_picos, modelo.n_param), np.nan)
+    cov_h_f = np.full(n_picos, np.nan)      # Covarianzas que hacen falta para el área
+    cov_h_eta = np.zeros(n_picos)
+    cov_f_eta = np.zeros(n_picos)
+    # Puntos menos parámetros (los de sus picos y el fondo) de cada grupo
+    libertad = (fin - inicio) - (np.bincount(grupo, minlength=modelo.n_grupos) * modelo.n_param + 1)
+    for g, (picos_g, bloque, residuos_2) in enumerate(bloques):
+        # Sin grados de libertad (un grupo encajado entre vecinos o en un
+        # extremo del espectro) no se puede estimar s², y sin converger los
+        # parámetros no están en el mínimo: sigmas NaN
+        if libertad[g] <= 0 or not convergido[g]:
+            continue
+        C = np.linalg.pinv(bloque.T @ bloque) * residuos_2 / libertad[g]
+        varianzas = np.diag(C)[:-1].reshape(len(picos_g), modelo.n_param)
+        # pinv de un bloque casi singular puede dar varianzas negativas diminutas
+        covarianza[picos_g] = np.maximum(varianzas, 0)
+        base = np.arange(len(picos_g)) * modelo.n_param
+        cov_h_f[picos_g] = C[base, base + 2]
+        if perfil == 'pvoigt':
+            cov_h_eta[picos_g] = C[base, base + 3]
+            cov_f_eta[picos_g] = C[base + 2, base + 3]
+
+    picos = p[:n].reshape(n_picos, modelo.n_param)
+    h, c, f = picos[:, 0], picos[:, 1], picos[:, 2]
+    eta = picos[:, 3] if perfil == 'pvoigt' else np.full(n_picos, 1. if perfil == 'lorentz' else 0.)
+    var_eta = covarianza[:, 3] if perfil == 'pvoigt' else np.zeros(n_picos)
+    # Propagación al área A = h·f·k(η)
+    k = eta * _AREA_LORENTZ + (1 - eta) * _AREA_GAUSS
+    dA_dh, dA_df, dA_deta = f * k, h * k, h * f * (_AREA_LORENTZ - _AREA_GAUSS)
+    var_area = (dA_dh**2 * covarianza[:, 0] + dA_df**2 * covarianza[:, 2] + dA_deta**2 * var_eta
+                + 2 * (dA_dh * dA_df * cov_h_f + dA_dh * dA_deta * cov_h_eta + dA_df * dA_deta * cov_f_eta))
+
+    # De vuelta al orden en que se dieron los picos
+    vuelta = np.argsort(orden)
+    resultado = {
+        'centro': c, 'sigma_centro': np.sqrt(covarianza[:, 1]),
+        'fwhm': f, 'sigma_fwhm': np.sqrt(covarianza[:, 2]),
+        'altura': h, 'sigma_altura': np.sqrt(covarianza[:, 0]),
+        'area': h * f * k, 'sigma_area': np.sqrt(np.maximum(var_area, 0)),
+        'eta': eta, 'sigma_eta': np.sqrt(var_eta),
+        'fondo': p[n:][grupo], 'grupo': grupo, 'libertad': libertad[grupo], 'convergido': convergido[grupo],
+    }
+    resultado = {clave: valores[vuelta] for clave, valores in resultado.items()}
+    resultado['modelo'] = (modelo.x, ajustado)
+    return resultado
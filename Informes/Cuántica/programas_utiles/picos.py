@@ -0,0 +1,238 @@
+# Búsqueda de picos en todos los espectros de P5 en una sola orden: se recorren
+# las carpetas de cada lámpara (Helio, Hidrogeno, Krypton, Mercurio, ...), en
+# cada espectro se buscan los picos como en encuentraPicos (P5/Datos/datos.py)
+# y todos van a una sola tabla con una fila por pico (y una fila sin pico para
+# los espectros en los que no se encuentra ninguno). Los espectros se reparten
+# entre todos los núcleos.
+#
+# Uso (desde Informes/Cuántica):
+#   python -m programas_utiles.picos P5/Datos --salida P5/picos.csv
+#   python -m programas_utiles.picos P5/Datos --carpetas Helio Mercurio --graficas P5/picos/
+#
+# Con --perfil gauss, lorentz o pvoigt cada pico se ajusta además con ese
+# perfil (perfiles.py) y la tabla lleva su centro, anchura y área con sus
+# incertidumbres, más finos que la separación entre puntos del espectro.
+#
+# Con --salida acabada en .parquet la tabla se guarda en Parquet (hace falta
+# pandas con pyarrow). Las gráficas solo se hacen si se pide --graficas; cada
+# proceso las guarda en un hilo aparte (EscritorGraficas) mientras sigue con
+# el espectro siguiente.
+
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .espectros import carpetas_lamparas, leer_espectro, rutas_espectros
+
+# Criterios de encuentraPicos, relativos al máximo de cada espectro
+PROMINENCIA_REL = 0.05
+ALTURA_REL = 0.1
+# Separación mínima entre picos, en puntos
+DISTANCIA = 5
+
+COLUMNAS_TABLA = ('elemento', 'archivo', 'pico', 'lambda_nm', 'altura', 'prominencia', 'anchura_nm',
+                  'tiempo_exposicion', 'perfil', 'centro_nm', 'sigma_centro_nm', 'fwhm_nm', 'sigma_fwhm_nm',
+                  'area', 'sigma_area', 'eta', 'grupo', 'libertad', 'convergido',
+                  'error')
+
+# Columnas de la tabla -> resultado de ajustar_perfiles
+_COLUMNAS_PERFIL = {'centro_nm': 'centro', 'sigma_centro_nm': 'sigma_centro', 'fwhm_nm': 'fwhm',
+                    'sigma_fwhm_nm': 'sigma_fwhm', 'area': 'area', 'sigma_area': 'sigma_area',
+                    'eta': 'eta', 'grupo': 'grupo', 'libertad': 'libertad',
+                    'convergido': 'convergido'}
+
+
+def picos_espectro(longitud, valor, prominencia_rel=PROMINENCIA_REL, altura_rel=ALTURA_REL,
+                   distancia=DISTANCIA):
+    """Picos de un espectro: diccionario de arrays lambda, altura, prominencia, anchura e indice.
+
+    La anchura es la anchura a media prominencia (FWHM para un pico sobre
+    fondo plano), pasada de puntos a nm con la escala de longitudes de onda.
+    """
+    from scipy.signal import find_peaks
+
+    maximo = valor.max() if len(valor) else 0.
+    # width=0 hace que find_peaks calcule también las anchuras de todos los picos
+    indices, props = find_peaks(valor, prominence=prominencia_rel * maximo, height=altura_rel * maximo,
+                                distance=distancia, width=0)
+    posiciones = np.arange(len(longitud))
+    izquierda = np.interp(props['left_ips'], posiciones, longitud)
+    derecha = np.interp(props['right_ips'], posiciones, longitud)
+    return {
+        'indice': indices,
+        'lambda': longitud[indices],
+        'altura': props['peak_heights'],
+        'prominencia': props['prominences'],
+        'anchura': derecha - izquierda,
+    }
+
+
+def grafica_picos(espectro, picos, titulo='', ajuste=None):
+    """Figura del espectro con sus picos marcados (sin guardar ni mostrar).
+
+    Con ajuste (resultado de ajustar_perfiles) se dibujan también los
+    perfiles ajustados sobre las ventanas de los grupos.
+    """
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(10, 5))
+    ax = fig.gca()
+    ax.plot(espectro.longitud, espectro.valor, label="Espectro")
+    ax.plot(picos['lambda'], picos['altura'], "rx", label="Picos")
+    if ajuste is not None:
+        x, y = ajuste['modelo']
+        # Un hueco (NaN) entre grupos para no unir sus ventanas con una recta
+        saltos = np.diff(x)
+        corte = np.flatnonzero(saltos > 1.5 * np.median(saltos)) + 1 if len(x) > 1 else []
+        ax.plot(np.insert(x, corte, np.nan), np.insert(y, corte, np.nan), "k--", linewidth=1, label="Ajuste")
+    ax.set_xlabel("λ (nm)")
+    ax.set_ylabel("Cuentas")
+    ax.set_title(titulo)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def _nombre_grafica(tarea):
+    nombre = os.path.splitext(os.path.basename(tarea['ruta']))[0]
+    return os.path.join(tarea['graficas'], f"{tarea['elemento']}_{nombre}.{tarea['formato']}")
+
+
+def analizar_espectro(tarea, escritor=None):
+    """Filas de la tabla (una por pico) de un espectro.
+
+    Un espectro sin picos da una fila sin pico, y los errores se guardan en una fila.
+    """
+    base = {'elemento': tarea['elemento'], 'archivo': os.path.basename(tarea['ruta'])}
+    try:
+        espectro = leer_espectro(tarea['ruta'])
+        picos = picos_espectro(espectro.longitud, espectro.valor, tarea['prominencia_rel'],
+                               tarea['altura_rel'], tarea['distancia'])
+        exposicion = espectro.cabecera.tiempo_exposicion
+        filas = [dict(base, pico=k + 1, lambda_nm=picos['lambda'][k], altura=picos['altura'][k],
+                      prominencia=picos['prominencia'][k], anchura_nm=picos['anchura'][k],
+                      tiempo_exposicion=exposicion)
+                 for k in range(len(picos['indice']))]
+        ajuste = None
+        if tarea['perfil']:
+            from .perfiles import ajustar_perfiles
+
+            ajuste = ajustar_perfiles(espectro.longitud, espectro.valor, picos['lambda'], picos['anchura'],
+                                      picos['altura'], tarea['perfil'])
+            for k, fila in enumerate(filas):
+                fila['perfil'] = tarea['perfil']
+                fila.update({columna: ajuste[clave][k] for columna, clave in _COLUMNAS_PERFIL.items()})
+        if not filas:
+            filas = [dict(base, tiempo_exposicion=exposicion)]
+        if tarea['graficas']:
+            escritor.guardar(grafica_picos(espectro, picos, f"{tarea['elemento']} / {base['archivo']}", ajuste),
+                             _nombre_grafica(tarea))
+    except Exception as e:
+        # Un espectro malo no debe parar el análisis completo
+        return [dict(base, error=f"{type(e).__name__}: {e}")]
+    return filas
+
+
+def _analizar_bloque(tareas):
+    if not any(tarea['graficas'] for tarea in tareas):
+        return [analizar_espectro(tarea) for tarea in tareas]
+
+    import matplotlib
+    from .render import EscritorGraficas
+
+    matplotlib.use('Agg')   # Sin ventanas: las gráficas solo se guardan en archivo
+    with EscritorGraficas() as escritor:
+        resultados = [analizar_espectro(tarea, escritor) for tarea in tareas]
+    # Al salir del with ya están escritas; un fallo al guardar va a las filas de su espectro
+    for tarea, filas in zip(tareas, resultados):
+        error = escritor.errores.get(_nombre_grafica(tarea))
+        if error:
+            filas.append({'elemento': tarea['elemento'], 'archivo': os.path.basename(tarea['ruta']),
+                          'error': error})
+    return resultados
+
+
+def tareas_espectros(carpeta_datos, carpetas=None):
+    """Una tarea por espectro (.csv) de cada carpeta de elemento, en orden alfabético.
+
+    Sin carpetas se usan todas las de lámparas (sin las de CARPETAS_EXCLUIDAS).
+    """
+    carpetas = carpetas or carpetas_lamparas(carpeta_datos)
+    return [{'elemento': carpeta, 'ruta': ruta}
+            for carpeta in carpetas
+            for ruta in rutas_espectros(os.path.join(carpeta_datos, carpeta))]
+
+
+def analizar_espectros(carpeta_datos, carpetas=None, prominencia_rel=PROMINENCIA_REL, altura_rel=ALTURA_REL,
+                       distancia=DISTANCIA, graficas=None, formato='png', procesos=None, perfil=None):
+    """Busca los picos de todos los espectros en paralelo y devuelve las filas en orden.
+
+    Con perfil ('gauss', 'lorentz' o 'pvoigt') los picos de cada espectro se
+    ajustan además con ese perfil.
+    """
+    if graficas:
+        os.makedirs(graficas, exist_ok=True)
+    tareas = tareas_espectros(carpeta_datos, carpetas)
+    for tarea in tareas:
+        tarea.update(prominencia_rel=prominencia_rel, altura_rel=altura_rel, distancia=distancia,
+                     graficas=graficas, formato=formato, perfil=perfil)
+    if procesos == 1 or len(tareas) <= 1:
+        return [fila for filas in _analizar_bloque(tareas) for fila in filas]
+
+    procesos = procesos or os.cpu_count() or 1
+    tamano = max(1, -(-len(tareas) // (4 * procesos)))
+    bloques = [tareas[i:i + tamano] for i in range(0, len(tareas), tamano)]
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        return [fila for resultados in executor.map(_analizar_bloque, bloques)
+                for filas in resultados for fila in filas]
+
+
+def escribir_tabla(filas, salida):
+    """Guarda las filas en .csv, o en Parquet si salida acaba en .parquet."""
+    if salida.endswith('.parquet'):
+        import pandas as pd
+
+        pd.DataFrame(filas, columns=list(COLUMNAS_TABLA)).to_parquet(salida, index=False)
+        return
+    with open(salida, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUMNAS_TABLA)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Picos de todos los espectros de P5 en una sola tabla.')
+    parser.add_argument('carpeta_datos', help='Carpeta con una subcarpeta de espectros por elemento (P5/Datos)')
+    parser.add_argument('--carpetas', nargs='*', default=None, help='Subcarpetas que se analizan (por defecto, todas)')
+    parser.add_argument('--salida', default='picos.csv', help='Tabla de picos (.csv o .parquet)')
+    parser.add_argument('--prominencia-rel', type=float, default=PROMINENCIA_REL,
+                        help='Prominencia mínima relativa al máximo del espectro')
+    parser.add_argument('--altura-rel', type=float, default=ALTURA_REL,
+                        help='Altura mínima relativa al máximo del espectro')
+    parser.add_argument('--distancia', type=int, default=DISTANCIA, help='Separación mínima entre picos (puntos)')
+    parser.add_argument('--perfil', choices=['gauss', 'lorentz', 'pvoigt'], default=None,
+                        help='Ajustar cada pico con este perfil (centro, anchura y área con incertidumbres)')
+    parser.add_argument('--graficas', default=None, help='Carpeta donde guardar las gráficas (si no se indica no se dibujan)')
+    parser.add_argument('--formato', default='png', help='Formato de las gráficas (png, pdf, ...)')
+    parser.add_argument('--procesos', type=int, default=None, help='Número de procesos (por defecto, uno por núcleo)')
+    args = parser.parse_args(argv)
+
+    filas = analizar_espectros(args.carpeta_datos, args.carpetas, args.prominencia_rel, args.altura_rel,
+                               args.distancia, args.graficas, args.formato, args.procesos, args.perfil)
+    escribir_tabla(filas, args.salida)
+
+    errores = [fila for fila in filas if 'error' in fila]
+    n_picos = sum('pico' in fila for fila in filas)
+    sin_picos = [fila for fila in filas if 'pico' not in fila and 'error' not in fila]
+    print(f"{n_picos} picos en {len({(f['elemento'], f['archivo']) for f in filas})} espectros "
+          f"({len(sin_picos)} sin picos, {len(errores)} errores), resultados en {args.salida}")
+    for fila in errores:
+        print(f"  {fila['elemento']}/{fila['archivo']}: {fila['error']}")
+    return 0 if not errores else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
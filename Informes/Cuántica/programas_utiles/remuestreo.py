@@ -0,0 +1,156 @@
+# Incertidumbres por remuestreo para las opciones de ajuste 1 a 6. Se generan
+# N réplicas de los datos, perturbando x e y con sus incertidumbres dx, dy
+# (Monte Carlo) o remuestreando las filas con reemplazo (bootstrap), y se
+# ajustan todas de golpe como un único problema con arrays (N, n_puntos).
+#
+# Las réplicas se generan por bloques de tamaño fijo, cada uno con su propia
+# semilla derivada de la semilla principal (SeedSequence.spawn). Así el
+# resultado es el mismo con uno o con varios procesos, y los bloques se pueden
+# repartir entre procesos cuando N es muy grande.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .lineal import ajuste_polinomico_lote
+from .minimos_cuadrados import minimos_cuadrados_lote, minimos_cuadrados_origen_lote
+
+# Réplicas por bloque: acota la memoria (bloque x n_puntos x n_parámetros floats)
+TAMANO_BLOQUE = 10000
+
+# Opción -> (nombres de los parámetros, potencias de x del modelo)
+MODELOS = {
+    1: (['a'], (1,)),
+    2: (['a', 'b'], (1, 0)),
+    3: (['a', 'b', 'c'], (2, 1, 0)),
+}
+
+PERCENTILES = (2.5, 16, 50, 84, 97.5)
+
+
+def generar_replicas(x, y, dx, dy, n, rng, modo='montecarlo', corte=None):
+    """Devuelve arrays (n, n_puntos) de x, y, dx, dy para n réplicas de los datos.
+
+    En modo bootstrap con corte (opción 4) las filas de cada conjunto se
+    remuestrean solo dentro de ese conjunto.
+    """
+    x, y, dx, dy = (np.asarray(v, dtype=float) for v in (x, y, dx, dy))
+    if modo == 'montecarlo':
+        X = x + dx * rng.standard_normal((n, len(x)))
+        Y = y + dy * rng.standard_normal((n, len(y)))
+        return X, Y, np.broadcast_to(dx, X.shape), np.broadcast_to(dy, Y.shape)
+    if modo == 'bootstrap':
+        # Filas con reemplazo
+        if corte is None:
+            indices = rng.integers(0, len(x), (n, len(x)))
+        else:
+            indices = np.hstack([rng.integers(0, corte, (n, corte)),
+                                 rng.integers(corte, len(x), (n, len(x) - corte))])
+        return x[indices], y[indices], dx[indices], dy[indices]
+    raise ValueError(f"Modo de remuestreo no válido: {modo} (usa 'montecarlo' o 'bootstrap')")
+
+
+def _pendientes_nominales(x, y, dx, dy, n):
+    # Pendientes del ajuste ODR de cada conjunto, para la varianza efectiva
+    import pandas as pd
+    from .opciones import weighted_linear_fit
+
+    data = pd.DataFrame({'x': x, 'y': y, 'dx': dx, 'dy': dy})
+    return weighted_linear_fit(data.iloc[:n]).beta[0], weighted_linear_fit(data.iloc[n:]).beta[0]
+
+
+def ajustar_replicas(opcion, X, Y, DX, DY, corte=None, pendientes=None):
+    """Ajusta todas las réplicas de una vez; devuelve (nombres, array (n, n_par))."""
+    if opcion in MODELOS:
+        nombres, potencias = MODELOS[opcion]
+        popt, _ = ajuste_polinomico_lote(X, Y, DY, potencias)
+        return nombres, popt
+    if opcion == 5:
+        r = minimos_cuadrados_lote(X, Y, DY)
+        return ['a', 'b'], np.column_stack([r['a'], r['b']])
+    if opcion == 6:
+        r = minimos_cuadrados_origen_lote(X, Y, DY)
+        return ['a'], r['a'][:, None]
+    if opcion == 4:
+        # ODR no se puede vectorizar; cada recta se ajusta con la varianza
+        # efectiva dy² + (a·dx)², usando la pendiente a del ajuste ODR nominal
+        a1_0, a2_0 = pendientes
+        r1 = minimos_cuadrados_lote(X[:, :corte], Y[:, :corte], np.sqrt(DY[:, :corte]**2 + (a1_0 * DX[:, :corte])**2))
+        r2 = minimos_cuadrados_lote(X[:, corte:], Y[:, corte:], np.sqrt(DY[:, corte:]**2 + (a2_0 * DX[:, corte:])**2))
+        x_int = (r2['b'] - r1['b']) / (r1['a'] - r2['a'])
+        y_int = r1['a'] * x_int + r1['b']
+        return (['a1', 'b1', 'a2', 'b2', 'x_int', 'y_int'],
+                np.column_stack([r1['a'], r1['b'], r2['a'], r2['b'], x_int, y_int]))
+    raise ValueError(f"La opción {opcion} no admite remuestreo (solo los ajustes 1 a 6)")
+
+
+def _bloque(args):
+    opcion, x, y, dx, dy, n, semilla, modo, corte, pendientes = args
+    rng = np.random.default_rng(semilla)
+    X, Y, DX, DY = generar_replicas(x, y, dx, dy, n, rng, modo, corte)
+    return ajustar_replicas(opcion, X, Y, DX, DY, corte, pendientes)
+
+
+def resumir(nombres, muestras):
+    """Media, desviación, percentiles y matriz de correlación de las muestras de cada parámetro."""
+    # Réplicas degeneradas (p. ej. un bootstrap con todas las x iguales) dan
+    # NaN o infinito; se descartan y se informa de cuántas quedan
+    validas = np.isfinite(muestras).all(axis=1)
+    resumen = {'n_replicas': int(len(muestras)), 'n_validas': int(validas.sum())}
+    muestras = muestras[validas]
+    if not len(muestras):
+        # Ninguna réplica válida: no hay distribución que resumir
+        for nombre in nombres:
+            resumen[nombre] = {'media': np.nan, 'sigma': np.nan,
+                               'percentiles': {str(p): np.nan for p in PERCENTILES}}
+        resumen['parametros'] = list(nombres)
+        resumen['correlacion'] = np.full((len(nombres), len(nombres)), np.nan).tolist()
+        return resumen
+    percentiles = np.percentile(muestras, PERCENTILES, axis=0)
+    for j, nombre in enumerate(nombres):
+        resumen[nombre] = {
+            'media': float(muestras[:, j].mean()),
+            'sigma': float(muestras[:, j].std(ddof=1)),
+            'percentiles': {str(p): float(v) for p, v in zip(PERCENTILES, percentiles[:, j])},
+        }
+    resumen['parametros'] = list(nombres)
+    resumen['correlacion'] = np.atleast_2d(np.corrcoef(muestras, rowvar=False)).tolist()
+    return resumen
+
+
+def remuestrear(opcion, data, n_replicas=10000, modo='montecarlo', semilla=0, corte=None,
+                procesos=1, devolver_muestras=False):
+    """Ajusta n_replicas réplicas de los datos y resume la distribución de los parámetros.
+
+    Con procesos > 1 (o None para uno por núcleo) los bloques de réplicas se
+    reparten entre procesos. Con devolver_muestras=True devuelve también el
+    array (n_replicas, n_par) con todos los parámetros.
+    """
+    if n_replicas < 1:
+        raise ValueError(f"El número de réplicas debe ser al menos 1 (se pidieron {n_replicas})")
+    x, y, dx, dy = (np.asarray(data[c], dtype=float) for c in ('x', 'y', 'dx', 'dy'))
+    pendientes = None
+    if opcion == 4:
+        if corte is None:
+            raise ValueError("La opción 4 necesita el número de puntos en el primer conjunto (corte)")
+        pendientes = _pendientes_nominales(x, y, dx, dy, corte)
+
+    tamanos = [min(TAMANO_BLOQUE, n_replicas - i) for i in range(0, n_replicas, TAMANO_BLOQUE)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    tareas = [(opcion, x, y, dx, dy, n, s, modo, corte, pendientes) for n, s in zip(tamanos, semillas)]
+
+    if procesos == 1 or len(tareas) == 1:
+        resultados = [_bloque(tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos or os.cpu_count()) as executor:
+            resultados = list(executor.map(_bloque, tareas))
+
+    nombres = resultados[0][0]
+    muestras = np.concatenate([r[1] for r in resultados])
+    resumen = resumir(nombres, muestras)
+    resumen['modo'] = modo
+    resumen['semilla'] = semilla
+    if devolver_muestras:
+        return resumen, muestras
+    return resumen
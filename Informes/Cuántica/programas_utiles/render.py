@@ -0,0 +1,97 @@
+# Guardado de gráficas en segundo plano. El hilo principal construye la figura
+# y la pasa a un EscritorGraficas, que la dibuja con Agg y la guarda en otro
+# hilo mientras el programa sigue con el siguiente ajuste. Se apunta cuánto
+# tarda cada etapa: el dibujo (rasterizado de Agg) y la codificación/escritura
+# del archivo (PNG, PDF, ...).
+#
+# Las figuras se sacan de pyplot (plt.close) antes de entregarlas, así el hilo
+# de escritura nunca toca el estado global de pyplot que usa el hilo principal.
+
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.image as mpimg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Formatos que se codifican directamente desde el buffer ya dibujado por Agg;
+# el resto (pdf, svg, eps, ...) los dibuja y escribe savefig en un solo paso
+FORMATOS_RASTER = {'png', 'jpg', 'jpeg', 'tif', 'tiff', 'webp'}
+
+
+def guardar_figura(fig, nombre_graf):
+    """Dibuja y guarda la figura; devuelve (segundos de dibujo, segundos de guardado)."""
+    formato = os.path.splitext(nombre_graf)[1].lower().lstrip('.') or 'png'
+    # Las figuras cerradas con plt.close pierden su lienzo, se les pone uno de Agg
+    canvas = FigureCanvasAgg(fig)
+    if formato in FORMATOS_RASTER:
+        t0 = time.perf_counter()
+        canvas.draw()
+        t1 = time.perf_counter()
+        # Se codifica el buffer ya dibujado, savefig lo volvería a dibujar
+        mpimg.imsave(nombre_graf, np.asarray(canvas.buffer_rgba()), format=formato, dpi=fig.dpi)
+        t2 = time.perf_counter()
+        return t1 - t0, t2 - t1
+    t0 = time.perf_counter()
+    fig.savefig(nombre_graf)
+    return 0., time.perf_counter() - t0
+
+
+class EscritorGraficas:
+    """Hilo que guarda las figuras que se le entregan con guardar().
+
+    Se usa como gestor de contexto; al salir espera a que se hayan escrito
+    todas las figuras pendientes. max_pendientes limita cuántas figuras
+    puede haber en cola (y por tanto en memoria) a la vez.
+    """
+
+    def __init__(self, max_pendientes=8):
+        self._cola = queue.Queue(maxsize=max_pendientes)
+        self._hilo = threading.Thread(target=self._trabajar, name='EscritorGraficas', daemon=True)
+        self.tiempos = {}     # nombre_graf -> (t_dibujo, t_guardado)
+        self.errores = {}     # nombre_graf -> mensaje de error
+        self.t_espera = 0.    # tiempo que el hilo principal ha esperado por cola llena
+        self._hilo.start()
+
+    def _trabajar(self):
+        while True:
+            elemento = self._cola.get()
+            if elemento is None:
+                break
+            fig, nombre_graf = elemento
+            try:
+                self.tiempos[nombre_graf] = guardar_figura(fig, nombre_graf)
+            except Exception as e:
+                self.errores[nombre_graf] = f"{type(e).__name__}: {e}"
+
+    def guardar(self, fig, nombre_graf):
+        """Entrega la figura al hilo de escritura y vuelve enseguida."""
+        plt.close(fig)
+        t0 = time.perf_counter()
+        self._cola.put((fig, nombre_graf))
+        self.t_espera += time.perf_counter() - t0
+
+    def cerrar(self):
+        """Espera a que se terminen de escribir todas las figuras."""
+        if self._hilo.is_alive():
+            self._cola.put(None)
+            self._hilo.join()
+
+    def resumen(self):
+        """Número de gráficas y tiempo total de cada etapa."""
+        return {
+            'n_graficas': len(self.tiempos),
+            't_dibujo': sum(t[0] for t in self.tiempos.values()),
+            't_guardado': sum(t[1] for t in self.tiempos.values()),
+            't_espera': self.t_espera,
+            'errores': len(self.errores),
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
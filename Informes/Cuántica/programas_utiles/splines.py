@@ -0,0 +1,232 @@
+# Evaluación rápida de polinomios por tramos (splines cúbicos de CubicSpline)
+# cuando se evalúan muchas veces: en muchos puntos, en los mismos puntos una y
+# otra vez, o varias curvas con los mismos nodos (las curvas I-V de P4).
+#
+# Para cada punto hay que saber en qué tramo cae. Si los nodos están
+# equiespaciados el tramo sale directamente, floor((ν - x_0) / h); si no, se
+# busca con searchsorted y el resultado se guarda para la siguiente llamada
+# con los mismos puntos (se compara con una copia guardada, así que cambiar el
+# array en su sitio no reutiliza tramos viejos). Después se evalúan todos los puntos (y todas
+# las curvas) a la vez con el esquema de Horner.
+#
+# También están aquí los máximos, mínimos e inflexiones de splines cúbicos:
+# las raíces de la derivada de todos los tramos se calculan a la vez con
+# operaciones de arrays, en vez de un bucle de Python por tramo.
+
+import numpy as np
+
+# Puntos que se evalúan de cada vez (acota el tamaño de los temporales)
+BLOQUE_PUNTOS = 2**14
+
+
+class EvaluadorTramos:
+    """Polinomios por tramos de grado k con nodos x (n+1) y coeficientes c (k+1, n) o (k+1, n, m).
+
+    Con c de tres dimensiones hay m curvas con los mismos nodos y se evalúan
+    todas en cada llamada; el resultado tiene entonces una última dimensión m.
+    Igual que CubicSpline, fuera de [x_0, x_n] se prolongan los tramos extremos.
+    """
+
+    def __init__(self, x, c, rtol_uniforme=1e-9):
+        self.x = np.ascontiguousarray(x, dtype=float)
+        self.c = np.ascontiguousarray(c, dtype=float)
+        if self.c.shape[1] != len(self.x) - 1:
+            raise ValueError(f"Hay {len(self.x)} nodos pero {self.c.shape[1]} tramos de coeficientes")
+        self.n_tramos = len(self.x) - 1
+        pasos = np.diff(self.x)
+        if np.any(pasos <= 0):
+            raise ValueError("Los nodos tienen que ser estrictamente crecientes")
+        self.paso = pasos.mean()
+        self.uniforme = bool(np.allclose(pasos, self.paso, rtol=rtol_uniforme, atol=0))
+        self._ultimo = (None, None)
+        self._coeficientes = {}
+
+    @classmethod
+    def desde_spline(cls, cs):
+        """Evaluador de un CubicSpline (o cualquier PPoly)."""
+        return cls(cs.x, cs.c)
+
+    @classmethod
+    def desde_splines(cls, splines):
+        """Evaluador conjunto de varios splines con los mismos nodos."""
+        x = splines[0].x
+        for cs in splines[1:]:
+            if not np.array_equal(cs.x, x):
+                raise ValueError("Todos los splines tienen que tener los mismos nodos")
+        return cls(x, np.stack([cs.c for cs in splines], axis=-1))
+
+    def indices(self, puntos):
+        """Índice del tramo de cada punto (0 .. n_tramos-1)."""
+        puntos = np.asarray(puntos, dtype=float)
+        if self.uniforme:
+            indices = np.floor((puntos - self.x[0]) / self.paso).astype(np.intp)
+            return np.clip(indices, 0, self.n_tramos - 1)
+        ultimo, indices = self._ultimo
+        # Mismos puntos que en la llamada anterior (por contenido, que el array
+        # puede haber cambiado en su sitio): se reutilizan los tramos
+        if ultimo is not None and ultimo.shape == puntos.shape and np.array_equal(ultimo, puntos):
+            return indices
+        indices = np.clip(np.searchsorted(self.x, puntos, side='right') - 1, 0, self.n_tramos - 1)
+        self._ultimo = (puntos.copy(), indices)
+        return indices
+
+    def _derivados(self, derivada):
+        # Coeficientes del polinomio derivado en cada tramo, c_j * (k-j)!/(k-j-derivada)!,
+        # calculados una vez por orden de derivada
+        if derivada not in self._coeficientes:
+            k = self.c.shape[0] - 1
+            self._coeficientes[derivada] = [
+                self.c[j] * np.prod(np.arange(k - j, k - j - derivada, -1), dtype=float)
+                for j in range(k + 1 - derivada)]
+        return self._coeficientes[derivada]
+
+    def __call__(self, puntos, derivada=0):
+        """Valor (o derivada de orden 'derivada') en los puntos."""
+        puntos = np.asarray(puntos, dtype=float)
+        i = self.indices(puntos).ravel()
+        planos = puntos.ravel()
+        forma = puntos.shape + self.c.shape[2:]
+        coeficientes = self._derivados(derivada)
+
+        resultado = np.empty((len(planos),) + self.c.shape[2:])
+        if not coeficientes:
+            resultado[...] = 0.
+            return resultado.reshape(forma)
+        # Por bloques de puntos, para que los temporales quepan en la caché
+        for inicio in range(0, len(planos), BLOQUE_PUNTOS):
+            fin = min(inicio + BLOQUE_PUNTOS, len(planos))
+            ib = i[inicio:fin]
+            dx = planos[inicio:fin] - self.x[ib]
+            if self.c.ndim == 3:
+                dx = dx[:, None]
+            salida = resultado[inicio:fin]
+            np.take(coeficientes[0], ib, axis=0, out=salida)
+            for c in coeficientes[1:]:
+                salida *= dx
+                salida += np.take(c, ib, axis=0)
+        return resultado.reshape(forma)
+
+    def derivada(self, orden=1):
+        """Función que evalúa la derivada de ese orden."""
+        return lambda puntos: self(puntos, orden)
+
+
+# Tipos de punto que devuelven las funciones de extremos
+MAXIMO, MINIMO, INFLEXION = 1, -1, 0
+
+
+def _raices_cuadratica(A, B, C):
+    # Raíces reales de A t² + B t + C en cada tramo, como dos arrays (NaN si no
+    # hay). Fórmula estable (sin restar números parecidos); si A = 0 la única
+    # raíz es la de B t + C.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        disc = B**2 - 4 * A * C
+        q = -0.5 * (B + np.copysign(np.sqrt(disc), B))
+        t1 = np.where(A != 0, q / A, np.where(B != 0, -C / B, np.nan))
+        t2 = np.where(A != 0, C / q, np.nan)
+        t1 = np.where((A != 0) & (disc < 0), np.nan, t1)
+        t2 = np.where(disc < 0, np.nan, t2)
+    return t1, t2
+
+
+def _extremos(x0, h, c, ultimo, grupo, rtol):
+    # Puntos críticos e inflexiones de los tramos x0 <= ν <= x0 + h con
+    # coeficientes c (4, n, m); ultimo marca los tramos que acaban una curva y
+    # grupo dice de qué curva es cada tramo (para juntar curvas con otros nodos).
+    # Un punto en un nodo es de los dos tramos que lo tocan: se cuenta solo en
+    # el de la derecha, salvo en el último nodo de la curva.
+    d3, d2, d1, d0 = c
+    forma = d3.shape
+    h = np.broadcast_to(h[:, None], forma)
+    ultimo = np.broadcast_to(ultimo[:, None], forma)
+    tramo = np.broadcast_to(np.arange(forma[0])[:, None], forma)
+    columna = np.broadcast_to(np.arange(forma[1])[None, :], forma)
+
+    t1, t2 = _raices_cuadratica(3 * d3, 2 * d2, d1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_inflexion = np.where(d3 != 0, -d2 / (3 * d3), np.nan)
+
+    partes = []
+    for t, de_inflexion in ((t1, False), (t2, False), (t_inflexion, True)):
+        tol = rtol * h
+        dentro = (t >= -tol) & ((t < h - tol) | (ultimo & (t <= h + tol)))
+        a, b, cc, dd = d3[dentro], d2[dentro], d1[dentro], d0[dentro]
+        t = np.clip(t[dentro], 0, h[dentro])
+        if de_inflexion:
+            # Con a != 0 la segunda derivada, 6a t + 2b, cambia de signo en t
+            tipo = np.full(t.shape, INFLEXION)
+        else:
+            segunda = 6 * a * t + 2 * b
+            plana = np.abs(segunda) <= 1e-9 * (np.abs(6 * a) * h[dentro] + np.abs(2 * b))
+            tipo = np.where(plana, INFLEXION, np.where(segunda < 0, MAXIMO, MINIMO))
+        partes.append((x0[tramo[dentro]] + t, ((a * t + b) * t + cc) * t + dd, tipo,
+                       tramo[dentro], columna[dentro], np.full(t.shape, de_inflexion)))
+
+    x, y, tipo, tramo, columna, de_inflexion = (np.concatenate(p) for p in zip(*partes))
+    curva = grupo[tramo] * forma[1] + columna
+    orden = np.lexsort((x, curva))
+    x, y, tipo, tramo, curva, de_inflexion = (
+        v[orden] for v in (x, y, tipo, tramo, curva, de_inflexion))
+    # Una raíz doble, o un punto crítico que también anula la segunda derivada,
+    # sale dos veces; de cada pareja se quita la inflexión (o la segunda raíz)
+    escala = rtol * max(1., np.abs(x0).max(initial=0.) + np.abs(h).max(initial=0.))
+    pareja = (curva[1:] == curva[:-1]) & (np.abs(np.diff(x)) <= escala)
+    quitar = np.zeros(len(x), dtype=bool)
+    quitar[:-1] |= pareja & de_inflexion[:-1]
+    quitar[1:] |= pareja & ~de_inflexion[:-1]
+    conservar = ~quitar
+    return {'x': x[conservar], 'y': y[conservar], 'tipo': tipo[conservar],
+            'tramo': tramo[conservar], 'curva': curva[conservar]}
+
+
+def extremos_tramos(x, c, rtol=1e-12):
+    """Máximos, mínimos e inflexiones de polinomios cúbicos por tramos.
+
+    x son los nodos (n+1) y c los coeficientes (4, n) o (4, n, m) como en
+    CubicSpline. Se resuelven a la vez las raíces de la derivada de todos los
+    tramos (3a t² + 2b t + c = 0 con t = ν - x_i; si a = 0, la de la recta),
+    se quedan las que caen en [x_i, x_{i+1}] y se clasifican con el signo de la
+    segunda derivada. Las inflexiones son los ceros de la segunda derivada
+    dentro del tramo (y los puntos críticos donde también se anula).
+
+    Devuelve un diccionario de arrays con un elemento por punto, ordenados por
+    curva y x: x, y, tipo (MAXIMO, MINIMO o INFLEXION), tramo y curva (índice
+    en la última dimensión de c, 0 si solo hay una).
+    """
+    x = np.asarray(x, dtype=float)
+    c = np.asarray(c, dtype=float)
+    if c.ndim == 2:
+        c = c[:, :, None]
+    ultimo = np.arange(len(x) - 1) == len(x) - 2
+    return _extremos(x[:-1], np.diff(x), c, ultimo, np.zeros(len(x) - 1, dtype=np.intp), rtol)
+
+
+def extremos_splines(splines, rtol=1e-12):
+    """extremos_tramos de muchos splines cúbicos, cada uno con sus propios nodos.
+
+    Se juntan los tramos de todas las curvas y se resuelven a la vez; 'curva'
+    es la posición del spline en la lista y 'tramo' el tramo dentro de él.
+    """
+    if len(splines) == 0:
+        return {'x': np.empty(0), 'y': np.empty(0), 'tipo': np.empty(0, dtype=int),
+                'tramo': np.empty(0, dtype=np.intp), 'curva': np.empty(0, dtype=np.intp)}
+    n_tramos = np.array([len(cs.x) - 1 for cs in splines], dtype=np.intp)
+    inicio = np.concatenate([[0], np.cumsum(n_tramos)[:-1]])
+    x0 = np.concatenate([cs.x[:-1] for cs in splines])
+    h = np.concatenate([np.diff(cs.x) for cs in splines])
+    c = np.concatenate([cs.c for cs in splines], axis=1)[:, :, None]
+    ultimo = np.zeros(len(x0), dtype=bool)
+    ultimo[inicio + n_tramos - 1] = True
+    puntos = _extremos(x0, h, c, ultimo, np.repeat(np.arange(len(splines)), n_tramos), rtol)
+    puntos['tramo'] = puntos['tramo'] - inicio[puntos['curva']]
+    return puntos
+
+
+def extremos_spline(cs):
+    """x de los máximos, mínimos e inflexiones de un spline cúbico, por separado."""
+    puntos = extremos_tramos(cs.x, cs.c)
+    return {
+        'maximos': puntos['x'][puntos['tipo'] == MAXIMO],
+        'minimos': puntos['x'][puntos['tipo'] == MINIMO],
+        'inflexiones': puntos['x'][puntos['tipo'] == INFLEXION],
+    }
@@ -0,0 +1,67 @@
+# Muchas curvas en una misma gráfica (las curvas I-V de P4) como un solo
+# LineCollection en vez de un plt.plot por curva: matplotlib crea un único
+# artista y lo dibuja en una sola llamada, y en un PDF puede ir rasterizado
+# como una imagen en lugar de cientos de trazos vectoriales.
+#
+# Antes de dibujar, cada curva se reduce a los puntos que se ven a lo ancho de
+# los ejes (diezmado.py), así que el tiempo de dibujo y el tamaño del archivo
+# no crecen con el número de puntos medidos. La leyenda se hace con líneas
+# vacías (sin datos), una por curva mientras no haya demasiadas.
+
+import numpy as np
+
+# Más curvas que esto y no se pone una entrada de leyenda por curva
+MAX_LEYENDA = 20
+
+
+def _segmentos(curvas):
+    # Lista de arrays (n_i, 2) a partir de una lista de curvas (n_i, 2), de
+    # pares (x, y) o de un array apilado (m, n, 2)
+    if isinstance(curvas, np.ndarray) and curvas.ndim == 3:
+        return list(curvas)
+    segmentos = []
+    for curva in curvas:
+        if isinstance(curva, tuple):
+            curva = np.column_stack(curva)
+        segmentos.append(np.asarray(curva, dtype=float)[:, :2])
+    return segmentos
+
+
+def dibujar_curvas(ax, curvas, etiquetas=None, colores=None, rasterizar=False,
+                   max_leyenda=MAX_LEYENDA, diezmar='minmax', **estilo):
+    """Añade todas las curvas a los ejes como un solo LineCollection y lo devuelve.
+
+    curvas es una lista de arrays (n_i, 2) con x e y (o de pares (x, y)), o un
+    array (m, n, 2). Por defecto cada curva toma el color siguiente del ciclo
+    de colores, como con plt.plot. Con rasterizar=True la colección se guarda
+    como imagen en formatos vectoriales (PDF pequeños con cientos de curvas).
+    Si hay etiquetas y no más de max_leyenda curvas, se añaden a la leyenda.
+    diezmar es el método con el que se reduce cada curva al ancho en píxeles
+    de los ejes ('minmax', 'lttb' o None para dibujar todos los puntos).
+    estilo se pasa a LineCollection (linewidth, alpha, ...).
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+
+    segmentos = _segmentos(curvas)
+    if diezmar:
+        from .diezmado import reducir_para
+
+        segmentos = [np.column_stack(reducir_para(ax, s[:, 0], s[:, 1], diezmar)) for s in segmentos]
+    if colores is None:
+        ciclo = plt.rcParams['axes.prop_cycle'].by_key().get('color', ['C0'])
+        colores = [ciclo[i % len(ciclo)] for i in range(len(segmentos))]
+    coleccion = LineCollection(segmentos, colors=colores, **estilo)
+    coleccion.set_rasterized(rasterizar)
+    ax.add_collection(coleccion)
+    ax.autoscale_view()
+
+    if etiquetas is not None and len(segmentos) <= max_leyenda:
+        colores = coleccion.get_colors()
+        ancho = coleccion.get_linewidths()
+        # Líneas vacías: no dibujan nada ni cambian los límites, solo dan la entrada de la leyenda
+        for i, etiqueta in enumerate(etiquetas):
+            ax.add_line(Line2D([], [], color=colores[i % len(colores)], linewidth=ancho[i % len(ancho)],
+                               label=etiqueta))
+    return coleccion
@@ -0,0 +1,63 @@
+# Pruebas del almacén de medidas de P4 y de su uso en franck_hertz.
+# Ejecutar desde Informes/Cuántica: python -m pytest tests
+
+import os
+
+import numpy as np
+
+from programas_utiles.almacen import almacen_actualizado, ingerir
+from programas_utiles.franck_hertz import analizar_todo, tareas_medidas
+from programas_utiles.medidas import leer_medidas, rutas_medidas
+
+
+def _medida(ruta, desplazamiento):
+    u1 = np.linspace(0, 60, 400)
+    ia = 5 + 2 * np.cos(2 * np.pi * u1 / 18) + u1 / 10 + desplazamiento
+    filas = ''.join(f'{x:.3f}\t{y:.4f}\t1,5\t8\t5\n'.replace('.', ',') for x, y in zip(u1, ia))
+    ruta.write_text('U1\tIA\tU2\tU3\tUH\nV\tnA\tV\tV\tV\n\n' + filas)
+
+
+def _datos(tmp_path):
+    for carpeta, archivos in (('Medidas_A', ('1.txt', '2.txt')), ('Todos', ('1.txt',))):
+        (tmp_path / carpeta).mkdir()
+        for k, archivo in enumerate(archivos):
+            _medida(tmp_path / carpeta / archivo, k)
+    return str(tmp_path)
+
+
+def test_almacen_al_dia(tmp_path):
+    carpeta_datos = _datos(tmp_path)
+    assert almacen_actualizado(carpeta_datos) is None
+    ingerir(carpeta_datos, os.path.join(carpeta_datos, 'medidas.npz'))
+    almacen = almacen_actualizado(carpeta_datos)
+    assert almacen is not None
+    curvas, constantes = almacen.medidas('Medidas_A')
+    curvas_txt, constantes_txt = leer_medidas(rutas_medidas(os.path.join(carpeta_datos, 'Medidas_A')))
+    for a, b in zip(curvas + constantes, curvas_txt + constantes_txt):
+        np.testing.assert_array_equal(a, b)
+
+    # Una medida más nueva que el almacén: hay que volver a leer los .txt
+    ruta = os.path.join(carpeta_datos, 'Todos', '1.txt')
+    os.utime(ruta, (os.path.getmtime(ruta) + 10,) * 2)
+    assert almacen_actualizado(carpeta_datos) is None
+
+
+def test_franck_hertz_desde_el_almacen(tmp_path):
+    carpeta_datos = _datos(tmp_path)
+    desde_txt = analizar_todo(carpeta_datos, procesos=1, almacen=False)
+    ingerir(carpeta_datos, os.path.join(carpeta_datos, 'medidas.npz'))
+    desde_almacen = analizar_todo(carpeta_datos, procesos=1)
+    # Todos/1.txt repite Medidas_A/1.txt y se salta en los dos casos
+    assert [(f['carpeta'], f['archivo']) for f in desde_almacen] == [('Medidas_A', '1.txt'), ('Medidas_A', '2.txt')]
+    assert desde_almacen == desde_txt
+
+
+def test_medida_vacia_no_repite_la_siguiente(tmp_path):
+    # Una medida sin puntos tiene el mismo inicio que la curva que la sigue
+    carpeta_datos = _datos(tmp_path)
+    (tmp_path / 'Medidas_A' / '0.txt').write_text('U1\tIA\tU2\tU3\tUH\nV\tnA\tV\tV\tV\n\n')
+    ruta_almacen = os.path.join(carpeta_datos, 'medidas.npz')
+    ingerir(carpeta_datos, ruta_almacen)
+    desde_almacen = tareas_medidas(carpeta_datos, almacen=almacen_actualizado(carpeta_datos))
+    assert [t['ruta'] for t in desde_almacen] == [t['ruta'] for t in tareas_medidas(carpeta_datos)]
+    assert len(desde_almacen) == 3
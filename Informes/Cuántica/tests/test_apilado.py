@@ -0,0 +1,34 @@
+# Pruebas del apilado de las adquisiciones de una lámpara (programas_utiles/apilado.py).
+# Ejecutar desde Informes/Cuántica: python -m pytest tests
+
+import numpy as np
+
+from programas_utiles.apilado import apilar, picos_apilado
+
+
+def _espectro(ruta, inicio, fin, escala, fondo, semilla):
+    # Una línea en 500 nm sobre fondo y ruido, con la escala de cada adquisición
+    longitud = np.arange(inicio, fin, 0.5)
+    rng = np.random.default_rng(semilla)
+    valor = escala * (fondo + np.exp(-0.5 * ((longitud - 500) / 1.5)**2) + 0.01 * rng.standard_normal(len(longitud)))
+    ruta.write_text('Begin Header\nExposureTime,100\nEnd Header\nnm,Value\n'
+                    + ''.join(f'{x},{y}\n' for x, y in zip(longitud, valor)))
+    return str(ruta)
+
+
+def test_sin_rango_comun(tmp_path):
+    # Rangos que no se solapan entre los tres y escalas distintas: se apila igual
+    rutas = [_espectro(tmp_path / 'a.csv', 400, 550, 1., 0.1, 0),
+             _espectro(tmp_path / 'b.csv', 450, 600, 50., 0.3, 1),
+             _espectro(tmp_path / 'c.csv', 560, 700, 2., 0.2, 2)]
+    resultado = apilar(iter(rutas))
+    assert resultado['n_espectros'] == 3
+    assert resultado['n'].max() == 2
+    picos = picos_apilado(resultado)
+    np.testing.assert_allclose(picos['lambda'], [500], atol=1)
+
+
+def test_picos_sin_datos():
+    resultado = {'lambda': np.arange(3.), 'media': np.full(3, np.nan), 'error_media': np.full(3, np.nan),
+                 'ruido': np.full(3, np.nan), 'n': np.zeros(3, dtype=int), 'n_espectros': 0}
+    assert len(picos_apilado(resultado)['lambda']) == 0
@@ -0,0 +1,38 @@
+# Pruebas de la caché de lectura de los datos del menú (programas_utiles/lectura.py).
+# Ejecutar desde Informes/Cuántica: python -m pytest tests
+
+import numpy as np
+import pytest
+
+from programas_utiles.lectura import cargar_datos
+
+
+def test_misma_tabla_con_y_sin_cache(tmp_path):
+    # Enteros en el archivo: la primera lectura (sin caché) no debe dejarlos como int64
+    ruta = tmp_path / 'datos.csv'
+    ruta.write_text('x,y,dx,dy\n1,2,0,1\n3,4,0,1\n')
+    cache = tmp_path / 'cache'
+    primera = cargar_datos(str(ruta), carpeta_cache=str(cache))
+    segunda = cargar_datos(str(ruta), carpeta_cache=str(cache))
+    for data in (primera, segunda):
+        assert (data.dtypes == np.float64).all()
+        assert not data.to_numpy().flags.writeable
+        np.testing.assert_array_equal(data.to_numpy(), [[1, 2, 0, 1], [3, 4, 0, 1]])
+    with pytest.raises(ValueError):
+        primera.to_numpy()[0, 0] = 5.
+
+
+def test_limpieza_sin_permisos(tmp_path, monkeypatch):
+    # Un .npy viejo que no se puede borrar no debe hacer fallar la lectura
+    cache = tmp_path / 'cache'
+    cache.mkdir()
+    (cache / 'viejo.npy').write_bytes(b'')
+    ruta = tmp_path / 'datos.csv'
+    ruta.write_text('x,y,dx,dy\n1,2,0,1\n')
+
+    def sin_permiso(ruta):
+        raise PermissionError(ruta)
+
+    monkeypatch.setattr('os.remove', sin_permiso)
+    data = cargar_datos(str(ruta), carpeta_cache=str(cache), max_archivos=0)
+    np.testing.assert_array_equal(data.to_numpy(), [[1, 2, 0, 1]])
@@ -0,0 +1,32 @@
+# Pruebas de la lectura en bloque de las medidas de P4 (programas_utiles/medidas.py).
+# Ejecutar desde Informes/Cuántica: python -m pytest tests
+
+import numpy as np
+import pytest
+
+from programas_utiles.medidas import convertir_decimales, leer_tabla
+
+
+def test_ultimo_campo_corto(tmp_path):
+    # El último número más corto que el más largo no debe leer fuera del buffer
+    ruta = tmp_path / 'medida.txt'
+    ruta.write_bytes(b'a\nb\nc\n12,5\t0,034\t8\t2\t6\r\n')
+    np.testing.assert_array_equal(leer_tabla(ruta), [[12.5, 0.034, 8, 2, 6]])
+    np.testing.assert_array_equal(convertir_decimales(b'10,5 3\n'), [10.5, 3])
+
+
+def test_signos_y_decimales():
+    np.testing.assert_array_equal(convertir_decimales(b'+5 -0,25 .5 -3'), [5, -0.25, 0.5, -3])
+
+
+@pytest.mark.parametrize('texto', [b'+ 5 ', b'1-2', b'1,2,3', b'-', b'1#2'])
+def test_numeros_mal_formados(texto):
+    with pytest.raises(ValueError):
+        convertir_decimales(texto)
+
+
+def test_exponentes():
+    # Con letras se convierte número a número: un número mal formado tampoco se ignora
+    np.testing.assert_array_equal(convertir_decimales(b'1,5e2 -2E-1 7'), [150, -0.2, 7])
+    with pytest.raises(ValueError):
+        convertir_decimales(b'1,5e2 abc 7')
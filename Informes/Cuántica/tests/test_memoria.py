@@ -0,0 +1,19 @@
+# Pruebas de los resultados guardados de programas_utiles/memoria.py.
+# Ejecutar desde Informes/Cuántica: python -m pytest tests
+
+from programas_utiles import memoria
+
+
+def test_guardar_y_leer(tmp_path):
+    assert memoria.guardar_resultado('clave', {'a': 1.5}, carpeta=str(tmp_path))
+    assert memoria.leer_resultado('clave', carpeta=str(tmp_path)) == {'a': 1.5}
+    assert memoria.leer_resultado('otra', carpeta=str(tmp_path)) is None
+
+
+def test_carpeta_sin_escritura(tmp_path):
+    # Un archivo donde debería ir la carpeta: no se puede guardar, pero no es un error
+    archivo = tmp_path / 'no_es_carpeta'
+    archivo.write_text('')
+    carpeta = str(archivo / 'ajustes')
+    assert memoria.guardar_resultado('clave', {'a': 1.5}, carpeta=carpeta) is False
+    assert memoria.leer_resultado('clave', carpeta=carpeta) is None
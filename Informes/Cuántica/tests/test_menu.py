@@ -0,0 +1,38 @@
+# Pruebas de la opción 4 del menú común de ProgramasUtiles.py (programas_utiles/menu.py).
+# Ejecutar desde Informes/Cuántica: python -m pytest tests
+
+import matplotlib
+import numpy as np
+import pytest
+
+from programas_utiles import lectura, menu
+
+
+class SinPantalla:
+    """Escritor que cierra la figura sin guardarla ni mostrarla."""
+
+    def guardar(self, fig, nombre_graf):
+        import matplotlib.pyplot as plt
+
+        plt.close(fig)
+
+
+@pytest.mark.parametrize('n', ['', '7'])
+def test_interseccion_desde_el_menu(tmp_path, monkeypatch, n):
+    # La opción 4 del menú usa opciones.calculate_intersection: punto y covarianza 2x2
+    matplotlib.use('Agg')
+    x = np.arange(12.)
+    y = np.where(x < 7, 2 * x + 1, 0.5 * x + 11)
+    ruta = tmp_path / 'datos.csv'
+    ruta.write_text('x,y,dx,dy\n' + ''.join(f'{a},{b},0.05,0.1\n' for a, b in zip(x, y)))
+    monkeypatch.setattr('builtins.input', lambda *args: n)
+    monkeypatch.setattr(menu, 'Pantalla', SinPantalla)
+    # La caché de columnas .npy va a tmp_path, no a ~/.cache
+    monkeypatch.setattr(lectura, 'CARPETA_CACHE', str(tmp_path / 'cache'))
+
+    resultado = menu.ejecutar_opcion(4, str(ruta))
+    assert resultado['n_primer_conjunto'] == 7
+    assert resultado['x_int'] == pytest.approx(20 / 3)
+    assert resultado['y_int'] == pytest.approx(43 / 3)
+    assert np.isfinite([resultado['sigma_x_int'], resultado['sigma_y_int'], resultado['cov_xy_int']]).all()
+    assert any((tmp_path / 'cache').iterdir())
@@ -0,0 +1,25 @@
+# Pruebas de la compilación de modelos de programas_utiles/no_lineal.py.
+# Ejecutar desde Informes/Cuántica: python -m pytest tests
+
+import numpy as np
+import pytest
+
+from programas_utiles.no_lineal import compilar_modelo
+
+
+@pytest.mark.parametrize('expresion, parametros', [
+    ('E*x + b', ['E', 'b']),
+    ('S*x + b', ['S', 'b']),
+    ('I*exp(-N*x) + Q', ['I', 'N', 'Q']),
+])
+def test_nombres_de_sympy_son_parametros(expresion, parametros):
+    # E, S, I, N, Q y O son objetos de sympy pero aquí deben ser parámetros
+    modelo = compilar_modelo(expresion)
+    assert modelo.parametros == parametros
+    assert np.isfinite(modelo.f(np.array([0.5, 1.]), *np.ones(len(parametros)))).all()
+
+
+def test_pi_sigue_siendo_constante():
+    modelo = compilar_modelo('a*sin(pi*x) + b')
+    assert modelo.parametros == ['a', 'b']
+    assert modelo.f(np.array([0.5]), 2., 1.) == pytest.approx(3.)
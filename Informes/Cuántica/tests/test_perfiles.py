@@ -0,0 +1,26 @@
+# Pruebas del ajuste de perfiles de los picos (programas_utiles/perfiles.py).
+# Ejecutar desde Informes/Cuántica: python -m pytest tests
+
+import numpy as np
+import pytest
+
+from programas_utiles.perfiles import ajustar_perfiles
+
+
+@pytest.mark.parametrize('perfil', ['gauss', 'lorentz', 'pvoigt'])
+def test_dos_grupos(perfil):
+    # Dos picos juntos (un grupo) y uno aislado, con ruido
+    x = np.arange(400, 500, 0.25)
+    centros, fwhm = np.array([430., 432.5, 470.]), 1.5
+    # Datos con el mismo perfil que se ajusta
+    eta = {'gauss': 0., 'lorentz': 1., 'pvoigt': 0.5}[perfil]
+    u2 = ((x[:, None] - centros) / fwhm)**2
+    formas = eta / (1 + 4 * u2) + (1 - eta) * np.exp(-4 * np.log(2) * u2)
+    y = 0.1 + formas @ np.array([1., 0.6, 0.8])
+    y += 0.005 * np.random.default_rng(0).standard_normal(len(x))
+    ajuste = ajustar_perfiles(x, y, centros + 0.2, np.full(3, 1.2), np.array([1.1, 0.7, 0.9]), perfil)
+    assert ajuste['convergido'].all()
+    np.testing.assert_array_equal(ajuste['grupo'], [0, 0, 1])
+    assert (ajuste['libertad'] > 0).all()
+    np.testing.assert_allclose(ajuste['centro'], centros, atol=0.05)
+    assert np.isfinite(ajuste['sigma_centro']).all()
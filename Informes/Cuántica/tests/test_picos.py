@@ -0,0 +1,31 @@
+# Pruebas de la tabla de picos de P5 (programas_utiles/picos.py).
+# Ejecutar desde Informes/Cuántica: python -m pytest tests
+
+import subprocess
+import sys
+
+from programas_utiles.picos import analizar_espectros, tareas_espectros
+
+
+def test_espectro_sin_picos(tmp_path):
+    # Un espectro plano da una fila sin pico, para que siga contando en la tabla
+    carpeta = tmp_path / 'Helio'
+    carpeta.mkdir()
+    datos = ''.join(f'{350 + 0.5 * k},1.0\n' for k in range(50))
+    (carpeta / 'plano.csv').write_text('Begin Header\nExposureTime,100\nEnd Header\nnm,Value\n' + datos)
+    filas = analizar_espectros(str(tmp_path), procesos=1, perfil='gauss')
+    assert filas == [{'elemento': 'Helio', 'archivo': 'plano.csv', 'tiempo_exposicion': 100.}]
+
+
+def test_tareas_sin_lambda(tmp_path):
+    # Lambda guarda las longitudes de onda de referencia, no espectros de una lámpara
+    for carpeta in ('Helio', 'Lambda'):
+        (tmp_path / carpeta).mkdir()
+        (tmp_path / carpeta / 'Helio.csv').write_text('nm,Value\n350,1\n')
+    assert tareas_espectros(str(tmp_path)) == [{'elemento': 'Helio', 'ruta': str(tmp_path / 'Helio' / 'Helio.csv')}]
+
+
+def test_importar_no_cambia_el_backend():
+    codigo = 'import programas_utiles.picos, sys; print("matplotlib" in sys.modules)'
+    salida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True)
+    assert salida.stdout.strip() == 'False'
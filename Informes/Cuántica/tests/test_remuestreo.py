@@ -0,0 +1,33 @@
+# Pruebas de las incertidumbres por remuestreo (programas_utiles/remuestreo.py).
+# Ejecutar desde Informes/Cuántica: python -m pytest tests
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from programas_utiles.remuestreo import remuestrear, resumir
+
+DATOS = pd.DataFrame({'x': [0., 1., 2., 3.], 'y': [1., 3., 5., 7.], 'dx': 0.01, 'dy': 0.1})
+
+
+@pytest.mark.parametrize('n_replicas', [0, -5])
+def test_sin_replicas(n_replicas):
+    with pytest.raises(ValueError, match='réplicas'):
+        remuestrear(2, DATOS, n_replicas)
+
+
+def test_pocas_replicas():
+    resumen = remuestrear(2, DATOS, 2)
+    assert resumen['n_replicas'] == 2
+    assert resumen['a']['media'] == pytest.approx(2, abs=0.5)
+
+
+def test_ninguna_replica_valida():
+    # Todas las réplicas degeneradas: estadísticos NaN en lugar de un error
+    resumen = resumir(['a', 'b'], np.array([[np.nan, 1.], [2., np.inf]]))
+    assert (resumen['n_replicas'], resumen['n_validas']) == (2, 0)
+    assert math.isnan(resumen['a']['media']) and math.isnan(resumen['b']['sigma'])
+    assert all(math.isnan(v) for v in resumen['a']['percentiles'].values())
+    assert np.isnan(resumen['correlacion']).all()